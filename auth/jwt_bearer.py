@@ -1,15 +1,52 @@
+import hashlib
 import os
+import time
 
 from dotenv import load_dotenv
 from fastapi import HTTPException, Request
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
-from jose import JWTError, jwt
+from utils.cache import TTLCache
 
 
 load_dotenv()
 SECRET_KEY = os.getenv("SECRET_KEY")
 ALGORITHM = os.getenv("ALGORITHM")
 
+JWT_CACHE_SIZE = int(os.getenv("JWT_CACHE_SIZE", "10000"))
+JWT_CACHE_MAX_TTL = float(os.getenv("JWT_CACHE_MAX_TTL", "3600"))  # 초, exp가 없는 토큰의 캐시 유지 시간
+
+# 토큰 다이제스트 -> 검증된 사용자 정보 (각 항목은 토큰의 exp 시각에 만료)
+token_cache = TTLCache(maxsize=JWT_CACHE_SIZE, ttl=JWT_CACHE_MAX_TTL)
+
+
+def verify_token(token: str) -> dict:
+    """토큰을 검증해 사용자 정보를 반환 (한 번 검증된 토큰은 exp까지 서명 검증 없이 캐시에서 반환)"""
+    # 원본 토큰 대신 다이제스트를 키로 사용해 메모리에 토큰 문자열을 남기지 않음
+    key = hashlib.sha256(token.encode()).digest()
+    cached = token_cache.get(key)
+    if cached is not None:
+        return dict(cached)
+
+    # 서명 검증 라이브러리(jose → cryptography)는 import 비용이 커서 처음 검증할 때 import
+    from jose import JWTError, jwt
+
+    try:
+        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+    except JWTError:
+        raise HTTPException(status_code=403, detail="토큰이 만료되었거나 올바르지 않습니다.")
+
+    user_id: str = payload.get("sub")
+    user_no: int = payload.get("user_no")
+    if not user_id or not user_no:
+        raise HTTPException(status_code=403, detail="올바르지 않은 토큰입니다.")
+
+    user = {"user_id": user_id, "user_no": user_no}
+    exp = payload.get("exp")
+    ttl = exp - time.time() if exp is not None else None
+    if ttl is None or ttl > 0:
+        token_cache.set(key, user, ttl)
+    return dict(user)
+
 
 class JWTBearer(HTTPBearer):
     def __init__(self, auto_error: bool = True):
@@ -24,15 +61,4 @@ class JWTBearer(HTTPBearer):
         if credentials.scheme != "Bearer":
             raise HTTPException(status_code=403, detail="올바르지 않은 인증 방식입니다.")
 
-        try:
-            payload = jwt.decode(credentials.credentials, SECRET_KEY, algorithms=[ALGORITHM])
-            user_id: str = payload.get("sub")
-            user_no: int = payload.get("user_no")
-
-            if not user_id or not user_no:
-                raise HTTPException(status_code=403, detail="올바르지 않은 토큰입니다.")
-
-            return {"user_id": user_id, "user_no": user_no}
-
-        except JWTError:
-            raise HTTPException(status_code=403, detail="토큰이 만료되었거나 올바르지 않습니다.")
+        return verify_token(credentials.credentials)
@@ -0,0 +1,100 @@
+import argparse
+import asyncio
+import time
+
+from benchmarks.common import AsyncBenchSession, BenchSession, bench_engine, print_table
+from database import Base
+from models import ActiveType, User, UserActiveLog
+from user.active_log_buffer import ActiveLogBuffer
+from user.user_query import create_active_log
+from user.user_schema import UserActiveCreate
+
+
+"""
+POST /user/active/log 저장 경로 벤치마크 (워커 1개 기준 events/sec)
+- direct: 이벤트마다 INSERT + COMMIT (기존 방식)
+- buffered: ActiveLogBuffer에 넣고 배치로 저장 (접수 속도와 저장 완료까지의 속도를 따로 측정)
+
+    python -m benchmarks.bench_active_log --events 20000 --concurrency 50
+"""
+
+
+async def run_direct(user_no: int, events: int, concurrency: int) -> float:
+    semaphore = asyncio.Semaphore(concurrency)
+    event = UserActiveCreate(active_type=ActiveType.VIEW_START.value)
+
+    async def one():
+        async with semaphore:
+            async with AsyncBenchSession() as db:
+                await create_active_log(db, user_no, event)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(events)))
+    return time.perf_counter() - start
+
+
+async def run_buffered(user_no: int, events: int, concurrency: int, batch_size: int):
+    buffer = ActiveLogBuffer(session_factory=AsyncBenchSession, batch_size=batch_size)
+    await buffer.start()
+    event = UserActiveCreate(active_type=ActiveType.VIEW_START.value)
+    per_worker = events // concurrency
+
+    async def producer():
+        for _ in range(per_worker):
+            await buffer.submit(user_no, event)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(producer() for _ in range(concurrency)))
+    accepted_at = time.perf_counter() - start
+    await buffer.stop()
+    flushed_at = time.perf_counter() - start
+    return accepted_at, flushed_at, buffer.stats()
+
+
+async def run(args):
+    Base.metadata.create_all(bench_engine)
+    db = BenchSession()
+    user = User(id="benchlog", password="bench", name="bench")
+    db.add(user)
+    db.commit()
+
+    try:
+        direct_events = min(args.events, args.direct_events)
+        direct_elapsed = await run_direct(user.no, direct_events, args.concurrency)
+        accepted_at, flushed_at, stats = await run_buffered(user.no, args.events, args.concurrency, args.batch_size)
+        buffered_events = stats["accepted"]
+
+        print_table(
+            f"active log ingestion (concurrency={args.concurrency}, batch_size={args.batch_size})",
+            ["mode", "events", "accept events/s", "stored events/s", "rejected", "batches"],
+            [
+                ["direct", direct_events, "-", f"{direct_events / direct_elapsed:.0f}", 0, direct_events],
+                [
+                    "buffered",
+                    buffered_events,
+                    f"{buffered_events / accepted_at:.0f}",
+                    f"{stats['flushed'] / flushed_at:.0f}",
+                    stats["rejected"],
+                    stats["batches"],
+                ],
+            ],
+        )
+    finally:
+        db.query(UserActiveLog).filter(UserActiveLog.user_no == user.no).delete()
+        db.query(User).filter(User.no == user.no).delete()
+        db.commit()
+        db.close()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--events", type=int, default=20000)
+    parser.add_argument("--direct-events", type=int, default=2000, help="direct 모드는 느리므로 별도 상한")
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--batch-size", type=int, default=500)
+    args = parser.parse_args()
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
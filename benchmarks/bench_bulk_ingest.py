@@ -0,0 +1,114 @@
+import argparse
+import asyncio
+import time
+
+from benchmarks.common import AsyncBenchSession, BenchSession, bench_engine, print_table
+from database import Base
+from models import Novel, NovelShorts
+from novel.novel_query import bulk_create_novel_shorts, bulk_upsert_novels, create_novel, create_novel_shorts
+from novel.novel_schema import NovelCreate, NovelShortsCreate
+from sqlalchemy import select
+
+
+"""
+크롤러 적재 벤치마크
+소설 N건 + 숏츠 N건을 단건 함수(create_novel/create_novel_shorts, 레코드마다 조회 + INSERT + COMMIT)와
+일괄 함수(bulk_upsert_novels/bulk_create_novel_shorts, 한 번에 조회/적재 후 한 번 커밋)로 적재해 초당 행 수를 비교한다.
+재수집(이미 있는 소설 전체 upsert)도 함께 측정하고, 일괄 적재한 숏츠가 요청 순서대로 번호를 받았는지 확인한다.
+
+    python -m benchmarks.bench_bulk_ingest --records 2000
+"""
+
+BENCH_PLATFORM = 99  # 벤치마크 데이터 구분용 source_platform_type
+
+
+def make_records(count: int, offset: int):
+    novels = [
+        NovelCreate(
+            source_platform_type=BENCH_PLATFORM,
+            source_id=offset + i,
+            source_type=1,
+            source_url=f"http://bench.local/{offset + i}",
+            title=f"bench {i}",
+            author="bench",
+            description="bench",
+            genres=[1, 2],
+            views=i,
+        )
+        for i in range(count)
+    ]
+    shorts = [NovelShortsCreate(novel_id=offset + i, content=f"bench shorts {offset + i}") for i in range(count)]
+    return novels, shorts
+
+
+async def ingest_single(novels, shorts) -> float:
+    async with AsyncBenchSession() as db:
+        start = time.perf_counter()
+        for novel_data in novels:
+            assert (await create_novel(db, novel_data)).success
+        for shorts_data in shorts:
+            assert (await create_novel_shorts(db, shorts_data)).success
+        return time.perf_counter() - start
+
+
+async def ingest_bulk(novels, shorts) -> float:
+    async with AsyncBenchSession() as db:
+        start = time.perf_counter()
+        assert (await bulk_upsert_novels(db, novels)).success
+        result = await bulk_create_novel_shorts(db, shorts, [None] * len(shorts))
+        elapsed = time.perf_counter() - start
+
+        # RETURNING 순서가 요청 순서와 맞는지 (여러 VALUES 묶음으로 나뉘어 실행되는 크기에서 확인)
+        shorts_nos = [record.shorts_no for record in result.results]
+        rows = await db.execute(select(NovelShorts.no, NovelShorts.content).where(NovelShorts.no.in_(shorts_nos)))
+        contents = dict(rows.all())
+        assert [contents[record.shorts_no] for record in result.results] == [item.content for item in shorts]
+        return elapsed
+
+
+async def reingest(novels) -> float:
+    async with AsyncBenchSession() as db:
+        start = time.perf_counter()
+        result = await bulk_upsert_novels(db, novels)
+        assert result.updated == len(novels)
+        return time.perf_counter() - start
+
+
+def cleanup():
+    db = BenchSession()
+    novel_nos = select(Novel.no).where(Novel.source_platform_type == BENCH_PLATFORM)
+    db.query(NovelShorts).filter(NovelShorts.novel_no.in_(novel_nos)).delete(synchronize_session=False)
+    db.query(Novel).filter(Novel.source_platform_type == BENCH_PLATFORM).delete(synchronize_session=False)
+    db.commit()
+    db.close()
+
+
+async def run(args):
+    Base.metadata.create_all(bench_engine)
+    cleanup()
+    try:
+        rows = []
+        single_novels, single_shorts = make_records(args.records, 9_000_000)
+        elapsed = await ingest_single(single_novels, single_shorts)
+        rows.append(["single (per-record commit)", f"{elapsed:.2f}", f"{2 * args.records / elapsed:,.0f}"])
+
+        bulk_novels, bulk_shorts = make_records(args.records, 9_500_000)
+        elapsed = await ingest_bulk(bulk_novels, bulk_shorts)
+        rows.append(["bulk (one commit)", f"{elapsed:.2f}", f"{2 * args.records / elapsed:,.0f}"])
+
+        elapsed = await reingest(bulk_novels)
+        rows.append(["bulk re-crawl (novel upsert only)", f"{elapsed:.2f}", f"{args.records / elapsed:,.0f}"])
+    finally:
+        cleanup()
+
+    print_table(
+        f"Ingest {args.records} novels + {args.records} shorts",
+        ["mode", "seconds", "rows/s"],
+        rows,
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--records", type=int, default=2000)
+    asyncio.run(run(parser.parse_args()))
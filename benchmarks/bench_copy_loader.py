@@ -0,0 +1,99 @@
+import argparse
+import csv
+import json
+from pathlib import Path
+import tempfile
+
+from benchmarks.common import BenchSession, bench_engine, print_table
+from database import Base
+from loader.copy_loader import load_file
+from models import BulkLoadCheckpoint, Novel, NovelShorts
+from sqlalchemy import select
+
+
+"""
+오프라인 COPY 적재 벤치마크
+소설 N건(JSONL)과 숏츠 N건(CSV) 파일을 만들어 loader로 적재하고 배치 크기별 초당 행 수와 단계별 시간을 측정한다.
+같은 소설 파일을 다시 적재(--restart, 전체 upsert)하는 재수집 경우도 함께 측정한다.
+HTTP 일괄 적재와의 비교는 benchmarks.bench_bulk_ingest 결과를 참고.
+
+    python -m benchmarks.bench_copy_loader --records 100000 --batch-sizes 5000 20000 50000
+"""
+
+BENCH_PLATFORM = 98  # 벤치마크 데이터 구분용 source_platform_type
+BENCH_SOURCE_OFFSET = 9_800_000
+
+
+def write_files(workdir: Path, count: int):
+    novels_path, shorts_path = workdir / "novels.jsonl", workdir / "shorts.csv"
+    with open(novels_path, "w", encoding="utf-8") as file:
+        for i in range(count):
+            record = {
+                "source_platform_type": BENCH_PLATFORM,
+                "source_id": BENCH_SOURCE_OFFSET + i,
+                "source_url": f"http://bench.local/{i}",
+                "title": f"bench {i}",
+                "author": "bench",
+                "description": "벤치마크 소설 설명\n둘째 줄",
+                "genres": [1, 2],
+                "views": i,
+            }
+            file.write(json.dumps(record, ensure_ascii=False) + "\n")
+    with open(shorts_path, "w", newline="", encoding="utf-8") as file:
+        writer = csv.writer(file)
+        writer.writerow(["source_platform_type", "novel_id", "content"])
+        writer.writerows([BENCH_PLATFORM, BENCH_SOURCE_OFFSET + i, f"bench shorts {i}"] for i in range(count))
+    return novels_path, shorts_path
+
+
+def cleanup():
+    db = BenchSession()
+    novel_nos = select(Novel.no).where(Novel.source_platform_type == BENCH_PLATFORM)
+    db.query(NovelShorts).filter(NovelShorts.novel_no.in_(novel_nos)).delete(synchronize_session=False)
+    db.query(Novel).filter(Novel.source_platform_type == BENCH_PLATFORM).delete(synchronize_session=False)
+    db.query(BulkLoadCheckpoint).filter(BulkLoadCheckpoint.job.like("bench:%")).delete(synchronize_session=False)
+    db.commit()
+    db.close()
+
+
+def measure(label: str, kind: str, path: Path, batch_size: int, restart: bool = False) -> list:
+    result = load_file(
+        bench_engine, kind, path, job=f"bench:{kind}", batch_size=batch_size, restart=restart, report=lambda _: None
+    )
+    return [
+        label,
+        batch_size,
+        f"{result['elapsed']:.2f}",
+        f"{result['rows_per_second']:,.0f}",
+        f"{result['read_seconds']:.2f}",
+        f"{result['copy_seconds']:.2f}",
+        f"{result['merge_seconds']:.2f}",
+    ]
+
+
+def run(args):
+    Base.metadata.create_all(bench_engine)
+    rows = []
+    with tempfile.TemporaryDirectory(prefix="bench_loader_") as workdir:
+        novels_path, shorts_path = write_files(Path(workdir), args.records)
+        for batch_size in args.batch_sizes:
+            cleanup()
+            try:
+                rows.append(measure("novels (insert)", "novels", novels_path, batch_size))
+                rows.append(measure("novels (re-crawl upsert)", "novels", novels_path, batch_size, restart=True))
+                rows.append(measure("shorts (source_id join)", "shorts", shorts_path, batch_size))
+            finally:
+                cleanup()
+
+    print_table(
+        f"COPY loader, {args.records} records per file",
+        ["file", "batch", "seconds", "rows/s", "read", "copy", "merge"],
+        rows,
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--records", type=int, default=50000)
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[5000, 20000])
+    run(parser.parse_args())
@@ -0,0 +1,153 @@
+import argparse
+import asyncio
+import csv
+from io import StringIO
+import json
+import resource
+import subprocess
+import sys
+import time
+
+from benchmarks.common import AsyncBenchSession, BenchSession, bench_engine, print_table
+from database import Base
+from models import Novel, NovelShorts
+from novel.novel_query import novel_shorts_export_query, stream_novel_shorts_csv
+from sqlalchemy import func, insert, literal, select, text
+
+
+"""
+CSV 추출 메모리 벤치마크
+행 수를 늘려가며(100k → 10M) 추출 중 프로세스 최대 RSS 증가량을 측정한다.
+측정마다 별도 프로세스를 띄워 이전 측정의 메모리가 섞이지 않게 한다.
+기존 방식(.all() + StringIO + data 리스트)은 --legacy-max-rows 까지만 측정한다.
+
+    python -m benchmarks.bench_export_csv --max-rows 10000000
+"""
+
+ROW_COUNTS = [100_000, 1_000_000, 10_000_000]
+
+
+def current_rss_mb() -> float:
+    with open("/proc/self/statm") as f:
+        return int(f.read().split()[1]) * resource.getpagesize() / 1024 / 1024
+
+
+def peak_rss_mb() -> float:
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+async def legacy_export(db) -> int:
+    """기존 구현: 전체 결과를 메모리에 올리고 CSV 문자열과 dict 리스트를 함께 생성"""
+    results = (await db.execute(novel_shorts_export_query())).all()
+    output = StringIO()
+    writer = csv.writer(output)
+    writer.writerow(["novel_no", "novel_short_no", "content", "views", "likes", "saves"])
+    data = []
+    for row in results:
+        data_row = dict(row._mapping)
+        data.append(data_row)
+        writer.writerow(data_row.values())
+    return len(output.getvalue())
+
+
+async def streaming_export(db) -> int:
+    size = 0
+    async for chunk in stream_novel_shorts_csv(db):
+        size += len(chunk)  # 실제 응답처럼 청크를 바로 버림
+    return size
+
+
+async def run_child(mode: str):
+    baseline = current_rss_mb()
+    async with AsyncBenchSession() as db:
+        start = time.perf_counter()
+        size = await (streaming_export(db) if mode == "stream" else legacy_export(db))
+        elapsed = time.perf_counter() - start
+    print(json.dumps({"rss_growth_mb": peak_rss_mb() - baseline, "seconds": elapsed, "bytes": size}))
+
+
+def measure(mode: str) -> dict:
+    output = subprocess.run(
+        [sys.executable, "-m", "benchmarks.bench_export_csv", "--child", mode],
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def add_shorts(db, novel: Novel, start: int, end: int):
+    series = func.generate_series(start + 1, end).column_valued("value")
+    db.execute(
+        insert(NovelShorts).from_select(
+            ["novel_no", "form_type", "content", "views", "likes", "saves", "comments"],
+            select(
+                literal(novel.no),
+                literal(1),
+                func.concat("bench shorts content ", series),
+                series % 1000,
+                series % 100,
+                series % 10,
+                literal(0),
+            ),
+        )
+    )
+    db.commit()
+
+
+def run(args):
+    Base.metadata.create_all(bench_engine)
+    db = BenchSession()
+    novel = Novel(title="bench", author="bench", source_url="http://bench.local")
+    db.add(novel)
+    db.commit()
+
+    try:
+        rows = []
+        seeded = 0
+        for row_count in [count for count in ROW_COUNTS if count <= args.max_rows]:
+            add_shorts(db, novel, seeded, row_count)
+            seeded = row_count
+            with bench_engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+                conn.execute(text("VACUUM ANALYZE novel_shorts"))
+
+            stream = measure("stream")
+            legacy = measure("legacy") if row_count <= args.legacy_max_rows else None
+            rows.append(
+                [
+                    f"{row_count:,}",
+                    f"{stream['bytes'] / 1024 / 1024:.0f}",
+                    f"{legacy['rss_growth_mb']:.0f}" if legacy else "-",
+                    f"{legacy['seconds']:.1f}" if legacy else "-",
+                    f"{stream['rss_growth_mb']:.0f}",
+                    f"{stream['seconds']:.1f}",
+                ]
+            )
+
+        print_table(
+            "CSV export peak RSS growth",
+            ["rows", "csv MB", "legacy MB", "legacy s", "stream MB", "stream s"],
+            rows,
+        )
+    finally:
+        db.query(NovelShorts).filter(NovelShorts.novel_no == novel.no).delete()
+        db.query(Novel).filter(Novel.no == novel.no).delete()
+        db.commit()
+        db.close()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--max-rows", type=int, default=ROW_COUNTS[-1])
+    parser.add_argument("--legacy-max-rows", type=int, default=1_000_000)
+    parser.add_argument("--child", choices=["stream", "legacy"], help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        asyncio.run(run_child(args.child))
+    else:
+        run(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+import argparse
+import asyncio
+import csv
+from io import StringIO
+import time
+
+from benchmarks.bench_export_csv import add_shorts
+from benchmarks.common import AsyncBenchSession, BenchSession, bench_engine, print_table
+from database import Base
+from models import Novel, NovelShorts
+from novel.novel_query import stream_novel_shorts_columnar, stream_novel_shorts_csv
+import pyarrow as pa
+import pyarrow.parquet as pq
+from sqlalchemy import text
+
+
+"""
+추출 형식별 크기/생성 시간/읽기 시간 비교 (CSV vs Arrow IPC vs Parquet)
+읽기 시간은 분석 쪽에서 파일을 타입이 있는 테이블로 불러오는 데 걸리는 시간이다.
+
+    python -m benchmarks.bench_export_formats --rows 1000000
+"""
+
+
+async def export(file_format: str) -> bytes:
+    async with AsyncBenchSession() as db:
+        if file_format == "csv":
+            return "".join([chunk async for chunk in stream_novel_shorts_csv(db)]).encode()
+        return b"".join([chunk async for chunk in stream_novel_shorts_columnar(db, file_format)])
+
+
+def load(file_format: str, data: bytes) -> int:
+    if file_format == "csv":
+        reader = csv.reader(StringIO(data.decode()))
+        next(reader)
+        # 텍스트를 다시 숫자로 변환해야 분석에 쓸 수 있음
+        return sum(1 for row in reader if [int(row[0]), int(row[1]), int(row[3]), int(row[4]), int(row[5])])
+    if file_format == "parquet":
+        return pq.read_table(pa.BufferReader(data)).num_rows
+    return pa.ipc.open_stream(data).read_all().num_rows
+
+
+async def run(args):
+    Base.metadata.create_all(bench_engine)
+    db = BenchSession()
+    novel = Novel(title="bench", author="bench", source_url="http://bench.local")
+    db.add(novel)
+    db.commit()
+
+    try:
+        add_shorts(db, novel, 0, args.rows)
+        with bench_engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+            conn.execute(text("VACUUM ANALYZE novel_shorts"))
+
+        rows = []
+        for file_format in ["csv", "arrow", "parquet"]:
+            start = time.perf_counter()
+            data = await export(file_format)
+            export_seconds = time.perf_counter() - start
+
+            start = time.perf_counter()
+            loaded = load(file_format, data)
+            load_seconds = time.perf_counter() - start
+            rows.append(
+                [file_format, f"{len(data) / 1024 / 1024:.1f}", f"{export_seconds:.1f}", f"{load_seconds:.2f}", loaded]
+            )
+
+        print_table(f"export formats ({args.rows:,} rows)", ["format", "MB", "export s", "load s", "rows"], rows)
+    finally:
+        db.query(NovelShorts).filter(NovelShorts.novel_no == novel.no).delete()
+        db.query(Novel).filter(Novel.no == novel.no).delete()
+        db.commit()
+        db.close()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    args = parser.parse_args()
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+import argparse
+import asyncio
+from datetime import datetime, timedelta
+import os
+import time
+
+from benchmarks.common import percentile, print_table
+import httpx
+from jose import jwt
+
+
+"""
+GET /shorts 부하 벤치마크 (동시 클라이언트 수 기준 처리량/지연시간)
+실행 중인 서버에 요청을 보내므로, 변경 전/후 커밋을 각각 띄워 같은 옵션으로 비교한다.
+
+    uvicorn main:app --port 8000 --workers 1
+    python -m benchmarks.bench_feed_load --url http://localhost:8000 --concurrency 200 --duration 30
+"""
+
+
+def make_token(user_no: int) -> str:
+    # 서버와 같은 SECRET_KEY/ALGORITHM으로 테스트용 토큰 발급
+    payload = {"sub": "bench", "user_no": user_no, "exp": datetime.now() + timedelta(hours=1)}
+    return jwt.encode(payload, os.getenv("SECRET_KEY"), algorithm=os.getenv("ALGORITHM"))
+
+
+async def worker(client: httpx.AsyncClient, deadline: float, limit: int, latencies: list, errors: list):
+    while time.perf_counter() < deadline:
+        start = time.perf_counter()
+        try:
+            response = await client.get("/shorts", params={"limit": limit})
+            if response.status_code != 200:
+                errors.append(response.status_code)
+                continue
+        except httpx.HTTPError as e:
+            errors.append(type(e).__name__)
+            continue
+        latencies.append((time.perf_counter() - start) * 1000)
+
+
+async def run(args):
+    headers = {"Authorization": f"Bearer {make_token(args.user_no)}"}
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+    latencies, errors = [], []
+
+    async with httpx.AsyncClient(base_url=args.url, headers=headers, limits=limits, timeout=60) as client:
+        started = time.perf_counter()
+        deadline = started + args.duration
+        await asyncio.gather(
+            *(worker(client, deadline, args.limit, latencies, errors) for _ in range(args.concurrency))
+        )
+        elapsed = time.perf_counter() - started
+
+    if not latencies:
+        print(f"성공한 요청이 없습니다 (errors={errors[:5]})")
+        return
+
+    print_table(
+        f"GET /shorts load (concurrency={args.concurrency}, {args.duration}s)",
+        ["requests", "errors", "req/s", "p50 ms", "p99 ms"],
+        [
+            [
+                len(latencies),
+                len(errors),
+                f"{len(latencies) / elapsed:.1f}",
+                f"{percentile(latencies, 50):.1f}",
+                f"{percentile(latencies, 99):.1f}",
+            ]
+        ],
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--url", default="http://localhost:8000")
+    parser.add_argument("--concurrency", type=int, default=200)
+    parser.add_argument("--duration", type=int, default=30)
+    parser.add_argument("--limit", type=int, default=10)
+    parser.add_argument("--user-no", type=int, default=1)
+    args = parser.parse_args()
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+import argparse
+import asyncio
+
+from benchmarks.common import AsyncBenchSession, BenchSession, bench_engine, measure_async, print_table
+from database import Base
+from models import Novel, NovelShorts
+from novel.novel_query import get_posts
+from sqlalchemy import func, insert, literal, select, text
+
+
+"""
+GET /shorts 페이지네이션 벤치마크: OFFSET 방식 vs 커서(키셋) 방식
+페이지 깊이가 깊어져도 커서 방식의 p99가 일정하게 유지되는지 확인한다.
+
+    python -m benchmarks.bench_feed_pagination --pages 10000 --limit 10
+"""
+
+
+def seed(db, total: int) -> int:
+    novel = Novel(title="bench", author="bench", source_url="http://bench.local")
+    db.add(novel)
+    db.commit()
+
+    series = func.generate_series(1, total).column_valued("value")
+    db.execute(
+        insert(NovelShorts).from_select(
+            ["novel_no", "form_type", "content", "music", "views", "likes", "saves", "comments"],
+            select(
+                literal(novel.no),
+                literal(1),
+                func.concat("bench shorts ", series),
+                literal("bench.mp3"),
+                literal(0),
+                literal(0),
+                literal(0),
+                literal(0),
+            ),
+        )
+    )
+    db.commit()
+    db.execute(text("ANALYZE novel_shorts"))
+    return novel.no
+
+
+def cleanup(db, novel_no: int):
+    db.query(NovelShorts).filter(NovelShorts.novel_no == novel_no).delete()
+    db.query(Novel).filter(Novel.no == novel_no).delete()
+    db.commit()
+
+
+async def run(args):
+    Base.metadata.create_all(bench_engine)
+    db = BenchSession()
+    novel_no = seed(db, args.pages * args.limit)
+
+    try:
+        async with AsyncBenchSession() as async_db:
+            depths = [page for page in (1, 10, 100, 1000, 10000) if page <= args.pages]
+            rows = []
+            for page in depths:
+                offset = (page - 1) * args.limit
+
+                # 해당 페이지 직전까지의 마지막 숏츠 번호 (커서 모드의 시작점)
+                after_no = None
+                if offset:
+                    after_no = (
+                        db.query(NovelShorts.no).order_by(NovelShorts.no.desc()).offset(offset - 1).limit(1).scalar()
+                    )
+
+                offset_stats = await measure_async(lambda: get_posts(async_db, args.limit, offset), args.repeat)
+                cursor_stats = await measure_async(
+                    lambda: get_posts(async_db, args.limit, 0, after_no=after_no), args.repeat
+                )
+                rows.append(
+                    [
+                        page,
+                        f"{offset_stats['p50']:.2f}",
+                        f"{offset_stats['p99']:.2f}",
+                        f"{cursor_stats['p50']:.2f}",
+                        f"{cursor_stats['p99']:.2f}",
+                    ]
+                )
+
+        print_table(
+            f"feed pagination (limit={args.limit}, ms)",
+            ["page", "offset p50", "offset p99", "cursor p50", "cursor p99"],
+            rows,
+        )
+    finally:
+        cleanup(db, novel_no)
+        db.close()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--pages", type=int, default=10000)
+    parser.add_argument("--limit", type=int, default=10)
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
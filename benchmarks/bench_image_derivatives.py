@@ -0,0 +1,110 @@
+import argparse
+import asyncio
+import hashlib
+from io import BytesIO
+import os
+from pathlib import Path
+import shutil
+import tempfile
+import time
+
+from benchmarks.common import print_table
+from novel import media_store
+from novel.image_derivatives import IMAGE_VARIANTS, ImageDerivativePool
+from PIL import Image
+
+
+"""
+이미지 파생본 생성 처리량 벤치마크
+휴대폰 사진 크기(기본 3024x4032) 원본 여러 장을 ImageDerivativePool로 동시에 처리해
+워커 수별 초당 처리 이미지 수(전체, 워커당)와 원본/파생본 평균 크기를 측정한다.
+원본은 노이즈 + 그라데이션으로 만들어 실제 사진처럼 압축이 잘 되지 않게 한다.
+
+    python -m benchmarks.bench_image_derivatives --count 48 --workers 1 2 4
+    python -m benchmarks.bench_image_derivatives --format png
+"""
+
+
+def make_source(size, seed: int, image_format: str) -> bytes:
+    noise = [Image.effect_noise(size, sigma) for sigma in (30 + seed % 7, 45, 60)]
+    gradient = Image.linear_gradient("L").resize(size)
+    image = Image.merge("RGB", [Image.blend(channel, gradient, 0.6) for channel in noise])
+    buffer = BytesIO()
+    image.save(buffer, image_format, **({"quality": 90} if image_format == "JPEG" else {}))
+    return buffer.getvalue()
+
+
+def prepare_sources(workdir: Path, args) -> list:
+    size = tuple(int(value) for value in args.size.split("x"))
+    extension = ".jpg" if args.format == "jpeg" else ".png"
+    paths = []
+    for seed in range(args.count + 1):  # 마지막 1장은 워커 프로세스 시작용 워밍업
+        data = make_source(size, seed, args.format.upper())
+        path = media_store.media_path("image", hashlib.sha256(data).hexdigest(), extension)
+        (workdir / path).parent.mkdir(parents=True, exist_ok=True)
+        (workdir / path).write_bytes(data)
+        paths.append(path)
+    return paths
+
+
+async def measure(paths: list, workers: int) -> dict:
+    shutil.rmtree(media_store.UPLOAD_DIR / media_store.DERIVED_SUBDIR, ignore_errors=True)
+    pool = ImageDerivativePool(workers=workers, max_pending=len(paths))
+    try:
+        # 워커 프로세스를 모두 띄운 뒤 측정
+        await asyncio.gather(*[pool.ensure(paths[-1]) for _ in range(workers)])
+        start = time.perf_counter()
+        results = await asyncio.gather(*[pool.ensure(path) for path in paths[:-1]])
+        elapsed = time.perf_counter() - start
+    finally:
+        pool.shutdown()
+    return {"seconds": elapsed, "results": results}
+
+
+async def run(args):
+    workdir = Path(tempfile.mkdtemp(prefix="bench_images_"))
+    media_store.MEDIA_ROOT = workdir
+    media_store.UPLOAD_DIR = workdir / "uploads"
+    try:
+        paths = prepare_sources(workdir, args)
+        source_kb = sum((workdir / path).stat().st_size for path in paths[:-1]) / len(paths[:-1]) / 1024
+
+        rows = []
+        for workers in args.workers:
+            result = await measure(paths, workers)
+            per_second = args.count / result["seconds"]
+            rows.append([workers, f"{result['seconds']:.2f}", f"{per_second:.1f}", f"{per_second / workers:.1f}"])
+
+        # 파생본 평균 크기 (경로 이름의 _<너비>.webp 로 구분)
+        variant_kb = {}
+        for name, width in IMAGE_VARIANTS.items():
+            sizes = [
+                size
+                for written in result["results"]
+                for path, size in written.items()
+                if path.endswith(f"_{width}.webp")
+            ]
+            variant_kb[name] = sum(sizes) / len(sizes) / 1024
+    finally:
+        shutil.rmtree(workdir)
+
+    print_table(
+        f"{args.count} x {args.size} {args.format} → {', '.join(f'{n} {w}px' for n, w in IMAGE_VARIANTS.items())} WebP"
+        f" (cpu {os.cpu_count()})",
+        ["workers", "seconds", "images/s", "images/s/worker"],
+        rows,
+    )
+    print_table(
+        "Average file size (KB)",
+        ["source", *IMAGE_VARIANTS],
+        [[f"{source_kb:.0f}", *(f"{variant_kb[name]:.0f}" for name in IMAGE_VARIANTS)]],
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--count", type=int, default=24)
+    parser.add_argument("--size", default="3024x4032")
+    parser.add_argument("--format", choices=["jpeg", "png"], default="jpeg")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, max(1, (os.cpu_count() or 2) - 1)])
+    asyncio.run(run(parser.parse_args()))
@@ -0,0 +1,65 @@
+import argparse
+from datetime import datetime, timedelta, timezone
+import time
+
+from auth import jwt_bearer
+from benchmarks.common import print_table
+from jose import jwt
+
+
+"""
+JWT 검증 처리량 벤치마크 (DB 불필요)
+- cold: 매번 처음 보는 토큰 → 서명 검증 수행
+- warm: 같은 세션 토큰 반복 → 캐시에서 반환
+
+    python -m benchmarks.bench_jwt_verify --tokens 1000 --rounds 20
+"""
+
+
+def make_tokens(count: int):
+    expire = datetime.now(timezone.utc) + timedelta(minutes=30)
+    return [
+        jwt.encode({"sub": f"user{i}", "user_no": i + 1, "exp": expire}, jwt_bearer.SECRET_KEY, jwt_bearer.ALGORITHM)
+        for i in range(count)
+    ]
+
+
+def tokens_per_sec(tokens, rounds: int, clear_cache: bool) -> float:
+    start = time.perf_counter()
+    for _ in range(rounds):
+        if clear_cache:
+            jwt_bearer.token_cache.clear()
+        for token in tokens:
+            jwt_bearer.verify_token(token)
+    return len(tokens) * rounds / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--tokens", type=int, default=1000)
+    parser.add_argument("--rounds", type=int, default=20)
+    args = parser.parse_args()
+
+    # .env가 없는 환경에서도 실행할 수 있도록 기본 키 사용
+    jwt_bearer.SECRET_KEY = jwt_bearer.SECRET_KEY or "bench-secret"
+    jwt_bearer.ALGORITHM = jwt_bearer.ALGORITHM or "HS256"
+
+    tokens = make_tokens(args.tokens)
+    cold = tokens_per_sec(tokens, args.rounds, clear_cache=True)
+    jwt_bearer.token_cache.clear()
+    tokens_per_sec(tokens, 1, clear_cache=False)  # 캐시 채우기
+    warm = tokens_per_sec(tokens, args.rounds, clear_cache=False)
+
+    print_table(
+        f"JWT verify throughput ({args.tokens} tokens x {args.rounds} rounds)",
+        ["cache", "tokens/sec", "us/token"],
+        [
+            ["cold", f"{cold:,.0f}", f"{1_000_000 / cold:.1f}"],
+            ["warm", f"{warm:,.0f}", f"{1_000_000 / warm:.1f}"],
+        ],
+    )
+    print(f"\nspeedup: {warm / cold:.1f}x, cache stats: {jwt_bearer.token_cache.stats()}")
+
+
+if __name__ == "__main__":
+    main()
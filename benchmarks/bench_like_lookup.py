@@ -0,0 +1,132 @@
+import argparse
+import asyncio
+
+from benchmarks.common import AsyncBenchSession, BenchSession, bench_engine, measure_async, print_table
+from database import Base
+from models import Novel, NovelShorts, User, UserLike
+from novel.novel_query import get_posts
+from sqlalchemy import func, insert, literal, select, text
+
+
+"""
+로그인 사용자의 피드 조회 비용 벤치마크
+사용자의 좋아요 수가 10 → 1M 으로 늘어나도 get_posts 비용이 일정한지 확인한다.
+비교를 위해 기존 방식(사용자의 좋아요 전체 조회)도 함께 측정한다.
+
+    python -m benchmarks.bench_like_lookup --shorts 100000
+"""
+
+LIKE_COUNTS = [10, 1_000, 100_000, 1_000_000]
+
+
+def seed_shorts(db, total: int):
+    novel = Novel(title="bench", author="bench", source_url="http://bench.local")
+    user = User(id="benchlike", password="bench", name="bench")
+    db.add_all([novel, user])
+    db.commit()
+
+    series = func.generate_series(1, total).column_valued("value")
+    db.execute(
+        insert(NovelShorts).from_select(
+            ["novel_no", "form_type", "content", "views", "likes", "saves", "comments"],
+            select(
+                literal(novel.no),
+                literal(1),
+                func.concat("bench shorts ", series),
+                literal(0),
+                literal(0),
+                literal(0),
+                literal(0),
+            ),
+        )
+    )
+    db.commit()
+    return novel, user
+
+
+def add_likes(db, novel: Novel, user: User, start: int, end: int, total_shorts: int):
+    """start+1 ~ end 번째 좋아요 추가 (숏츠 번호는 순환하며 배정)"""
+    first_no = db.query(func.min(NovelShorts.no)).filter(NovelShorts.novel_no == novel.no).scalar()
+    series = func.generate_series(start + 1, end).column_valued("value")
+    db.execute(
+        insert(UserLike).from_select(
+            ["user_no", "novel_no", "novel_shorts_no", "is_del"],
+            select(literal(user.no), literal(novel.no), first_no + series % total_shorts, literal(False)),
+        )
+    )
+    db.commit()
+    db.execute(text("ANALYZE user_like"))
+
+
+async def legacy_get_posts(db, limit: int, user_no: int):
+    """기존 구현: 피드 페이지 조회 + 사용자의 좋아요 전체 조회"""
+    posts = await get_posts(db, limit, 0)
+    likes = set(
+        await db.scalars(
+            select(UserLike.novel_shorts_no).where(UserLike.user_no == user_no, UserLike.is_del.is_(False))
+        )
+    )
+    return [post.no in likes for post in posts]
+
+
+def cleanup(db, novel: Novel, user: User):
+    db.query(UserLike).filter(UserLike.user_no == user.no).delete()
+    db.commit()
+
+    # 숏츠 삭제 시 FK 검사가 user_like를 훑으므로 삭제된 튜플을 먼저 정리
+    with bench_engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        conn.execute(text("VACUUM user_like"))
+
+    db.query(NovelShorts).filter(NovelShorts.novel_no == novel.no).delete()
+    db.query(Novel).filter(Novel.no == novel.no).delete()
+    db.query(User).filter(User.no == user.no).delete()
+    db.commit()
+
+
+async def run(args):
+    Base.metadata.create_all(bench_engine)
+    db = BenchSession()
+    novel, user = seed_shorts(db, args.shorts)
+
+    try:
+        async with AsyncBenchSession() as async_db:
+            rows = []
+            seeded = 0
+            for like_count in [count for count in LIKE_COUNTS if count <= args.max_likes]:
+                add_likes(db, novel, user, seeded, like_count, args.shorts)
+                seeded = like_count
+
+                current = await measure_async(lambda: get_posts(async_db, args.limit, 0, user.no), args.repeat)
+                legacy = await measure_async(lambda: legacy_get_posts(async_db, args.limit, user.no), args.repeat)
+                rows.append(
+                    [
+                        like_count,
+                        f"{legacy['p50']:.2f}",
+                        f"{legacy['p99']:.2f}",
+                        f"{current['p50']:.2f}",
+                        f"{current['p99']:.2f}",
+                    ]
+                )
+
+        print_table(
+            f"logged-in feed by user like count (limit={args.limit}, ms)",
+            ["likes", "legacy p50", "legacy p99", "scoped p50", "scoped p99"],
+            rows,
+        )
+    finally:
+        cleanup(db, novel, user)
+        db.close()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--shorts", type=int, default=100_000)
+    parser.add_argument("--limit", type=int, default=10)
+    parser.add_argument("--repeat", type=int, default=30)
+    parser.add_argument("--max-likes", type=int, default=LIKE_COUNTS[-1])
+    args = parser.parse_args()
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
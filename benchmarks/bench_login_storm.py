@@ -0,0 +1,114 @@
+import argparse
+import asyncio
+from collections import Counter
+import time
+
+from benchmarks.common import percentile, print_table
+import httpx
+
+
+"""
+로그인 폭주 중 피드 지연시간 벤치마크
+1) 피드만 조회하는 구간, 2) 피드 조회 + 초당 --login-rate 건의 로그인 구간의 GET /shorts p50/p99를 비교한다.
+로그인은 응답을 기다리지 않고 일정 간격으로 보내므로(open loop) 서버가 감당 못 하는 부하도 그대로 들어간다.
+
+    BCRYPT_ROUNDS=12 uvicorn main:app --port 8000 --workers 1
+    python -m benchmarks.bench_login_storm --url http://localhost:8000 --login-rate 100 --duration 20
+"""
+
+BENCH_USER = {"id": "benchlogin", "password": "Bench1234", "name": "bench", "gender": "X", "age": 20}
+
+
+async def feed_worker(client: httpx.AsyncClient, deadline: float, latencies: list, errors: list):
+    while time.perf_counter() < deadline:
+        start = time.perf_counter()
+        try:
+            response = await client.get("/shorts", params={"limit": 10})
+            if response.status_code != 200:
+                errors.append(response.status_code)
+                continue
+        except httpx.HTTPError as e:
+            errors.append(type(e).__name__)
+            continue
+        latencies.append((time.perf_counter() - start) * 1000)
+
+
+async def login_once(client: httpx.AsyncClient, results: Counter, latencies: list):
+    start = time.perf_counter()
+    try:
+        response = await client.post("/user/login", json={"id": BENCH_USER["id"], "password": BENCH_USER["password"]})
+        results[response.status_code] += 1
+        if response.status_code == 200:
+            latencies.append((time.perf_counter() - start) * 1000)
+    except httpx.HTTPError as e:
+        results[type(e).__name__] += 1
+
+
+async def login_storm(client: httpx.AsyncClient, deadline: float, rate: int, results: Counter, latencies: list):
+    tasks = []
+    interval = 1 / rate
+    next_at = time.perf_counter()
+    while next_at < deadline:
+        tasks.append(asyncio.create_task(login_once(client, results, latencies)))
+        next_at += interval
+        await asyncio.sleep(max(0.0, next_at - time.perf_counter()))
+    await asyncio.gather(*tasks)
+
+
+async def run_phase(args, headers: dict, login_rate: int):
+    limits = httpx.Limits(max_connections=args.concurrency + 500, max_keepalive_connections=args.concurrency)
+    feed_latencies, feed_errors = [], []
+    login_results, login_latencies = Counter(), []
+
+    async with httpx.AsyncClient(base_url=args.url, headers=headers, limits=limits, timeout=60) as client:
+        deadline = time.perf_counter() + args.duration
+        jobs = [feed_worker(client, deadline, feed_latencies, feed_errors) for _ in range(args.concurrency)]
+        if login_rate:
+            jobs.append(login_storm(client, deadline, login_rate, login_results, login_latencies))
+        await asyncio.gather(*jobs)
+
+    return feed_latencies, feed_errors, login_results, login_latencies
+
+
+async def run(args):
+    async with httpx.AsyncClient(base_url=args.url, timeout=60) as client:
+        await client.post("/user/signup", json=BENCH_USER)  # 이미 있으면 409
+        login = await client.post("/user/login", json={"id": BENCH_USER["id"], "password": BENCH_USER["password"]})
+        headers = {"Authorization": f"Bearer {login.json()['access_token']}"}
+
+    rows = []
+    for label, rate in (("feed only", 0), (f"feed + {args.login_rate} logins/s", args.login_rate)):
+        feed, feed_errors, logins, login_latencies = await run_phase(args, headers, rate)
+        rows.append(
+            [
+                label,
+                len(feed),
+                f"{percentile(feed, 50):.1f}" if feed else "-",
+                f"{percentile(feed, 99):.1f}" if feed else "-",
+                len(feed_errors),
+                logins.get(200, 0),
+                logins.get(503, 0),
+                sum(logins.values()) - logins.get(200, 0) - logins.get(503, 0),
+                f"{percentile(login_latencies, 99):.0f}" if login_latencies else "-",
+            ]
+        )
+
+    print_table(
+        f"GET /shorts latency during login storm (feed concurrency={args.concurrency}, {args.duration}s per phase)",
+        ["phase", "feed reqs", "feed p50", "feed p99", "feed err", "login ok", "login 503", "login err", "login p99"],
+        rows,
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--url", default="http://localhost:8000")
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--duration", type=int, default=20)
+    parser.add_argument("--login-rate", type=int, default=100)
+    args = parser.parse_args()
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+import argparse
+import asyncio
+import hashlib
+from pathlib import Path
+import shutil
+import tempfile
+
+from benchmarks.common import measure_async, print_table
+from httpx import ASGITransport, AsyncClient
+from novel import media_store
+
+
+"""
+업로드 미디어 제공 벤치마크
+큰 음악 파일(기본 20MB)을 /uploads/... 로 반복 조회하면서 요청 방식별 지연(p50/p99)과 응답 본문 크기를 비교한다.
+- full: 처음 재생 (전체 다운로드)
+- seek: 재생 위치 이동 (Range로 중간 256KB)
+- revalidate: 캐시된 파일 재요청 (If-None-Match → 304)
+앱은 같은 프로세스에서 ASGI로 호출하므로 네트워크/sendfile 비용은 포함되지 않는다.
+
+    python -m benchmarks.bench_media --size-mb 20 --repeat 50
+"""
+
+SEEK_SIZE = 256 * 1024
+
+
+async def run(args):
+    workdir = Path(tempfile.mkdtemp(prefix="bench_media_"))
+    media_store.MEDIA_ROOT = workdir
+    media_store.UPLOAD_DIR = workdir / "uploads"
+
+    data = b"\0" * (args.size_mb * 1024 * 1024)
+    path = media_store.media_path("music", hashlib.sha256(data).hexdigest(), ".wav")
+    (workdir / path).parent.mkdir(parents=True)
+    (workdir / path).write_bytes(data)
+
+    from main import app
+
+    middle = len(data) // 2
+    requests = {
+        "full": {},
+        "seek": {"Range": f"bytes={middle}-{middle + SEEK_SIZE - 1}"},
+    }
+    try:
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://bench") as client:
+            etag = (await client.head(f"/{path}")).headers["etag"]
+            requests["revalidate"] = {"If-None-Match": etag}
+
+            rows = []
+            for name, headers in requests.items():
+                response = await client.get(f"/{path}", headers=headers)
+                result = await measure_async(lambda: client.get(f"/{path}", headers=headers), args.repeat)
+                rows.append(
+                    [name, response.status_code, len(response.content), f"{result['p50']:.2f}", f"{result['p99']:.2f}"]
+                )
+    finally:
+        shutil.rmtree(workdir)
+
+    print_table(
+        f"GET /{media_store.UPLOAD_DIR.name}/... ({args.size_mb}MB file, {args.repeat} runs)",
+        ["request", "status", "body bytes", "p50 ms", "p99 ms"],
+        rows,
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--size-mb", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=50)
+    asyncio.run(run(parser.parse_args()))
@@ -0,0 +1,108 @@
+import argparse
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+from benchmarks.common import measure, print_table
+from comment.comment_query import _comment_response
+from comment.comment_schema import CommentListResponse, CommentResponse
+from fastapi._compat import ModelField
+from pydantic.fields import FieldInfo
+from utils.serialization import ORJSONResponse
+
+
+"""
+댓글 목록 직렬화 마이크로 벤치마크 (DB 없이 조회 결과 행만 흉내)
+- legacy: 행마다 dict + CommentResponse(**dict) 검증 후 FastAPI response_model 재검증 + JSON 직렬화
+- fast: construct(검증 생략) + ORJSONResponse
+댓글 API는 log_api_call이 반환값을 문자열로 로깅하므로 그 비용도 함께 측정한다.
+
+    python -m benchmarks.bench_serialize_comments --comments 10000
+"""
+
+
+def make_rows(count: int) -> list:
+    base = datetime(2024, 1, 1)
+    return [
+        SimpleNamespace(
+            Comment=SimpleNamespace(
+                no=no,
+                novel_shorts_no=1,
+                user_no=no % 500,
+                parent_no=None,
+                content=f"bench comment content {no} " * 3,
+                like=no % 50,
+                created_date=base + timedelta(seconds=no),
+                is_del=False,
+            ),
+            user_name=f"user{no % 500}",
+            reply_count=no % 7,
+        )
+        for no in range(1, count + 1)
+    ]
+
+
+def legacy(rows: list, response_field: ModelField, log: bool = False) -> bytes:
+    comment_list = []
+    for row in rows:
+        comment = row.Comment
+        try:
+            comment_dict = {
+                "no": comment.no,
+                "novel_shorts_no": comment.novel_shorts_no,
+                "user_no": comment.user_no,
+                "user_name": row.user_name,
+                "parent_no": comment.parent_no,
+                "content": comment.content,
+                "like": comment.like,
+                "created_date": comment.created_date,
+                "is_del": comment.is_del,
+                "reply_count": row.reply_count,
+            }
+            comment_list.append(CommentResponse(**comment_dict))
+        except Exception:
+            continue
+    result = CommentListResponse(success=True, message="ok", comments=comment_list)
+    if log:
+        f"응답 결과: {result}"  # log_api_call의 응답 로깅
+
+    # FastAPI가 response_model로 하는 처리와 동일 (routing.serialize_response)
+    value, _ = response_field.validate(result, {}, loc=("response",))
+    return response_field.serialize_json(value)
+
+
+def fast(rows: list, log: bool = False) -> bytes:
+    result = CommentListResponse.model_construct(
+        success=True, message="ok", comments=[_comment_response(row) for row in rows]
+    )
+    response = ORJSONResponse(result)
+    if log:
+        f"응답 결과: {response}"
+    return response.body
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--comments", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=30)
+    args = parser.parse_args()
+
+    rows = make_rows(args.comments)
+    response_field = ModelField(field_info=FieldInfo(annotation=CommentListResponse), name="Response")
+    assert len(legacy(rows, response_field)) == len(fast(rows))
+
+    results = {
+        "legacy (dict + validate + response_model)": measure(lambda: legacy(rows, response_field), args.repeat),
+        "fast (construct + orjson)": measure(lambda: fast(rows), args.repeat),
+        "legacy + log_api_call": measure(lambda: legacy(rows, response_field, log=True), args.repeat),
+        "fast + log_api_call": measure(lambda: fast(rows, log=True), args.repeat),
+    }
+    baseline = results["legacy (dict + validate + response_model)"]["p50"]
+    print_table(
+        f"Serialize {args.comments:,} comments (ms)",
+        ["path", "p50", "p99", "speedup"],
+        [[name, f"{r['p50']:.1f}", f"{r['p99']:.1f}", f"{baseline / r['p50']:.1f}x"] for name, r in results.items()],
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,162 @@
+import argparse
+from collections import defaultdict
+import os
+from pathlib import Path
+import re
+import socket
+import statistics
+import subprocess
+import sys
+import time
+from typing import List, Tuple
+from urllib.error import URLError
+from urllib.request import urlopen
+
+from benchmarks.common import (
+    BENCH_DB_HOST,
+    BENCH_DB_NAME,
+    BENCH_DB_PASSWORD,
+    BENCH_DB_PORT,
+    BENCH_DB_USER,
+    percentile,
+    print_table,
+)
+
+
+"""
+앱 시작 시간 벤치마크
+- import: 새 프로세스에서 `import main` 까지 걸린 시간
+- ready: uvicorn main:app 프로세스를 띄운 시점부터 /health_check 첫 200 응답까지 걸린 시간
+- --profile: `python -X importtime` 결과를 모아 패키지별/모듈별 import 비용 상위 항목 출력
+--app-dir 로 다른 체크아웃(git worktree 등)을 지정해 변경 전후를 비교할 수 있다.
+
+    python -m benchmarks.bench_startup --repeat 10
+    python -m benchmarks.bench_startup --app-dir /tmp/before
+    python -m benchmarks.bench_startup --profile --top 20
+"""
+
+REPO_DIR = Path(__file__).resolve().parent.parent
+READY_TIMEOUT = 30.0
+POLL_INTERVAL = 0.005
+# -X importtime 출력 한 줄: "import time:   self |   cumulative | (들여쓰기)모듈명"
+IMPORTTIME_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \| (.+)$")
+
+
+def app_env(app_dir: Path) -> dict:
+    # 앱이 운영 DB 대신 벤치마크 DB를 보도록 DB_* 를 덮어씀
+    return {
+        **os.environ,
+        "PYTHONPATH": str(app_dir),
+        "DB_USER": BENCH_DB_USER,
+        "DB_PASSWORD": BENCH_DB_PASSWORD,
+        "DB_HOST": BENCH_DB_HOST,
+        "DB_PORT": BENCH_DB_PORT,
+        "DB_NAME": BENCH_DB_NAME,
+    }
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def measure_import(app_dir: Path) -> float:
+    start = time.perf_counter()
+    subprocess.run([sys.executable, "-c", "import main"], cwd=app_dir, env=app_env(app_dir), check=True)
+    return (time.perf_counter() - start) * 1000
+
+
+def measure_ready(app_dir: Path) -> float:
+    port = free_port()
+    url = f"http://127.0.0.1:{port}/health_check"
+    start = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--port", str(port), "--log-level", "warning"],
+        cwd=app_dir,
+        env=app_env(app_dir),
+    )
+    try:
+        while time.perf_counter() - start < READY_TIMEOUT:
+            if process.poll() is not None:
+                raise RuntimeError(f"앱 프로세스가 종료되었습니다 (exit {process.returncode})")
+            try:
+                with urlopen(url, timeout=1) as response:
+                    if response.status == 200:
+                        return (time.perf_counter() - start) * 1000
+            except (URLError, ConnectionError):
+                time.sleep(POLL_INTERVAL)
+        raise RuntimeError(f"{READY_TIMEOUT}초 안에 응답하지 않았습니다")
+    finally:
+        process.terminate()
+        process.wait()
+
+
+def profile_imports(app_dir: Path) -> List[Tuple[str, int, int]]:
+    """import main 중 import된 모듈별 (이름, 자체 시간 us, 누적 시간 us)"""
+    stderr = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import main"],
+        cwd=app_dir,
+        env=app_env(app_dir),
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stderr
+    modules = []
+    for line in stderr.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        if match:
+            modules.append((match.group(3).strip(), int(match.group(1)), int(match.group(2))))
+    return modules
+
+
+def print_import_profile(app_dir: Path, top: int):
+    modules = profile_imports(app_dir)
+    by_package = defaultdict(int)
+    for name, self_us, _ in modules:
+        by_package[name.split(".")[0]] += self_us
+
+    total_ms = sum(by_package.values()) / 1000
+    print_table(
+        f"Import cost by top-level package (total {total_ms:.0f} ms)",
+        ["package", "self ms"],
+        [[name, f"{us / 1000:.1f}"] for name, us in sorted(by_package.items(), key=lambda item: -item[1])[:top]],
+    )
+    print_table(
+        "Slowest modules (cumulative, includes imported children)",
+        ["module", "self ms", "cumulative ms"],
+        [
+            [name, f"{self_us / 1000:.1f}", f"{cumulative_us / 1000:.1f}"]
+            for name, self_us, cumulative_us in sorted(modules, key=lambda module: -module[2])[:top]
+        ],
+    )
+
+
+def summarize(samples) -> list:
+    return [f"{statistics.median(samples):.0f}", f"{percentile(samples, 99):.0f}", f"{min(samples):.0f}"]
+
+
+def run(args):
+    app_dir = Path(args.app_dir).resolve()
+    if args.profile:
+        print_import_profile(app_dir, args.top)
+        return
+
+    measure_import(app_dir)  # 바이트코드 캐시(.pyc) 생성용 워밍업
+    imports = [measure_import(app_dir) for _ in range(args.repeat)]
+    readies = [measure_ready(app_dir) for _ in range(args.repeat)]
+
+    print_table(
+        f"Startup time ({app_dir}, {args.repeat} runs, ms)",
+        ["measure", "p50", "p99", "min"],
+        [["import main", *summarize(imports)], ["spawn → first 200", *summarize(readies)]],
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repeat", type=int, default=10)
+    parser.add_argument("--app-dir", default=str(REPO_DIR))
+    parser.add_argument("--profile", action="store_true", help="시간 측정 대신 모듈별 import 비용 출력")
+    parser.add_argument("--top", type=int, default=25)
+    run(parser.parse_args())
@@ -0,0 +1,183 @@
+import argparse
+import asyncio
+import json
+from pathlib import Path
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from uuid import uuid4
+
+from benchmarks.bench_export_csv import current_rss_mb, peak_rss_mb
+from benchmarks.common import AsyncBenchSession, BenchSession, bench_engine, percentile, print_table
+from database import Base
+from fastapi import UploadFile
+from models import MediaFile, Novel, NovelShorts
+from novel import admin_router, media_store
+from novel.novel_query import get_posts
+
+
+"""
+동시 미디어 업로드 벤치마크
+큰 음악 파일(기본 50MB WAV) 여러 개를 동시에 save_file로 저장하면서, 같은 이벤트 루프에서 피드 조회(get_posts)를
+반복해 업로드 중 피드 지연(p50/p99/max)과 프로세스 최대 RSS 증가량을 측정한다.
+기존 방식(await file.read() 후 이벤트 루프에서 open().write())과 청크 스트리밍 방식을 각각 별도 프로세스에서 측정한다.
+업로드 파일은 Starlette와 같이 1MB를 넘으면 디스크로 넘어가는 SpooledTemporaryFile로 준비한다.
+
+    python -m benchmarks.bench_uploads --uploads 8 --size-mb 50
+"""
+
+SPOOL_MAX_SIZE = 1024 * 1024  # Starlette 멀티파트 파서의 메모리 보관 한도
+FEED_PROBE_INTERVAL = 0.01
+
+
+async def legacy_save_file(file: UploadFile, file_type: str) -> str:
+    """기존 구현: 파일 전체를 메모리로 읽고 이벤트 루프에서 바로 씀"""
+    file_path = media_store.UPLOAD_DIR / media_store.MEDIA_SUBDIRS[file_type] / f"{uuid4()}.wav"
+    file_path.parent.mkdir(parents=True, exist_ok=True)
+    contents = await file.read()
+    with open(file_path, "wb") as f:
+        f.write(contents)
+    return str(file_path)
+
+
+async def stream_save_file(file: UploadFile, file_type: str) -> str:
+    """현재 구현: 청크 스트리밍 + 내용 주소 저장 (업로드마다 세션 사용)"""
+    async with AsyncBenchSession() as db:
+        return (await admin_router.save_file(db, file, file_type)).path
+
+
+def make_upload(size_mb: int, seed: int) -> UploadFile:
+    spooled = tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_SIZE)
+    chunk = b"\0" * (1024 * 1024)
+    spooled.write(seed.to_bytes(8, "big"))  # 업로드마다 내용이 달라야 중복 제거 없이 모두 저장됨
+    for _ in range(size_mb):
+        spooled.write(chunk)
+    spooled.seek(0)
+    return UploadFile(spooled, size=size_mb * 1024 * 1024 + 8, filename="bench.wav")
+
+
+async def probe_feed(done: asyncio.Event, samples: list):
+    async with AsyncBenchSession() as db:
+        while not done.is_set():
+            start = time.perf_counter()
+            await get_posts(db, 10, 0, None)
+            samples.append((time.perf_counter() - start) * 1000)
+            await asyncio.sleep(FEED_PROBE_INTERVAL)
+
+
+async def run_child(mode: str, uploads: int, size_mb: int):
+    workdir = Path(tempfile.mkdtemp(prefix="bench_uploads_"))
+    media_store.MEDIA_ROOT = workdir
+    media_store.UPLOAD_DIR = workdir / "uploads"
+    files = [make_upload(size_mb, seed) for seed in range(uploads)]
+    save = legacy_save_file if mode == "legacy" else stream_save_file
+
+    # 피드 조회 워밍업 (커넥션/캐시) 후 기준 메모리 측정
+    async with AsyncBenchSession() as db:
+        await get_posts(db, 10, 0, None)
+    baseline = current_rss_mb()
+
+    done = asyncio.Event()
+    samples = []
+    probe = asyncio.create_task(probe_feed(done, samples))
+    start = time.perf_counter()
+    try:
+        await asyncio.gather(*[save(file, "music") for file in files])
+        elapsed = time.perf_counter() - start
+    finally:
+        done.set()
+        await probe
+        for file in files:
+            file.file.close()
+        shutil.rmtree(workdir)
+
+    print(
+        json.dumps(
+            {
+                "rss_growth_mb": peak_rss_mb() - baseline,
+                "seconds": elapsed,
+                "feed_p50": statistics.median(samples),
+                "feed_p99": percentile(samples, 99),
+                "feed_max": max(samples),
+            }
+        )
+    )
+
+
+def measure(mode: str, args) -> dict:
+    output = subprocess.run(
+        [
+            sys.executable,
+            "-m",
+            "benchmarks.bench_uploads",
+            "--child",
+            mode,
+            "--uploads",
+            str(args.uploads),
+            "--size-mb",
+            str(args.size_mb),
+        ],
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def run(args):
+    Base.metadata.create_all(bench_engine)
+    db = BenchSession()
+    novel = Novel(title="bench", author="bench", source_url="http://bench.local")
+    db.add(novel)
+    db.flush()
+    db.add_all([NovelShorts(novel_no=novel.no, form_type=1, content=f"bench {i}") for i in range(50)])
+    db.commit()
+
+    try:
+        rows = []
+        for mode in ["legacy", "stream"]:
+            result = measure(mode, args)
+            rows.append(
+                [
+                    mode,
+                    f"{result['rss_growth_mb']:.0f}",
+                    f"{result['seconds']:.2f}",
+                    f"{result['feed_p50']:.1f}",
+                    f"{result['feed_p99']:.1f}",
+                    f"{result['feed_max']:.1f}",
+                ]
+            )
+
+        print_table(
+            f"{args.uploads} concurrent {args.size_mb}MB uploads",
+            ["mode", "peak RSS +MB", "upload s", "feed p50 ms", "feed p99 ms", "feed max ms"],
+            rows,
+        )
+    finally:
+        db.query(NovelShorts).filter(NovelShorts.novel_no == novel.no).delete()
+        db.query(Novel).filter(Novel.no == novel.no).delete()
+        db.query(MediaFile).filter(MediaFile.path.like(f"{media_store.UPLOAD_DIR.name}/music/%")).delete(
+            synchronize_session=False
+        )
+        db.commit()
+        db.close()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--uploads", type=int, default=8)
+    parser.add_argument("--size-mb", type=int, default=50)
+    parser.add_argument("--child", choices=["stream", "legacy"], help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        asyncio.run(run_child(args.child, args.uploads, args.size_mb))
+    else:
+        run(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+import os
+import statistics
+import time
+from typing import Awaitable, Callable, Dict, List
+
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+
+"""
+벤치마크 공통 유틸
+- 운영 DB를 건드리지 않도록 tests/conftest.py 와 같은 TEST_DB_* 환경변수를 사용
+- 저장소 루트에서 `python -m benchmarks.<모듈명>` 으로 실행
+"""
+
+BENCH_DB_USER = os.getenv("TEST_DB_USER", "postgres")
+BENCH_DB_PASSWORD = os.getenv("TEST_DB_PASSWORD", "postgres")
+BENCH_DB_HOST = os.getenv("TEST_DB_HOST", "localhost")
+BENCH_DB_PORT = os.getenv("TEST_DB_PORT", "5432")
+BENCH_DB_NAME = os.getenv("TEST_DB_NAME", "test_db")
+
+BENCH_DB_URL = f"postgresql://{BENCH_DB_USER}:{BENCH_DB_PASSWORD}@{BENCH_DB_HOST}:{BENCH_DB_PORT}/{BENCH_DB_NAME}"
+BENCH_ASYNC_DB_URL = (
+    f"postgresql+asyncpg://{BENCH_DB_USER}:{BENCH_DB_PASSWORD}@{BENCH_DB_HOST}:{BENCH_DB_PORT}/{BENCH_DB_NAME}"
+)
+
+# 데이터 적재/정리는 동기 세션, 측정 대상 쿼리 함수는 앱과 같은 비동기 세션으로 실행
+bench_engine = create_engine(BENCH_DB_URL)
+BenchSession = sessionmaker(autocommit=False, autoflush=False, bind=bench_engine)
+bench_async_engine = create_async_engine(BENCH_ASYNC_DB_URL)
+AsyncBenchSession = async_sessionmaker(bind=bench_async_engine, autoflush=False, expire_on_commit=False)
+
+
+def percentile(samples: List[float], pct: float) -> float:
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def measure(func: Callable[[], object], repeat: int) -> Dict[str, float]:
+    """func를 repeat회 실행하고 ms 단위 p50/p99를 반환"""
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - start) * 1000)
+
+    return {"p50": statistics.median(samples), "p99": percentile(samples, 99)}
+
+
+async def measure_async(func: Callable[[], Awaitable[object]], repeat: int) -> Dict[str, float]:
+    """비동기 func를 repeat회 실행하고 ms 단위 p50/p99를 반환"""
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        await func()
+        samples.append((time.perf_counter() - start) * 1000)
+
+    return {"p50": statistics.median(samples), "p99": percentile(samples, 99)}
+
+
+def print_table(title: str, headers: List[str], rows: List[List[object]]):
+    print(f"\n=== {title} ===")
+    widths = [max(len(str(h)), *(len(str(row[i])) for row in rows)) for i, h in enumerate(headers)]
+    print("  ".join(str(h).rjust(w) for h, w in zip(headers, widths)))
+    for row in rows:
+        print("  ".join(str(v).rjust(w) for v, w in zip(row, widths)))
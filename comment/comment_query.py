@@ -1,3 +1,7 @@
+from datetime import datetime
+import os
+from typing import List, Optional, Tuple
+
 from comment.comment_schema import (
     CommentActionResponse,
     CommentCreate,
@@ -5,62 +9,197 @@ from comment.comment_schema import (
     CommentResponse,
     CommentUpdate,
 )
-from models import Comment, NovelShorts, User, UserLike
-from sqlalchemy import update
-from sqlalchemy.orm import Session
+from models import Comment, NovelShorts, UserLike
+from sqlalchemy import func, select, tuple_, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased
+from user.user_query import get_user_names
+from utils.cache import cache
+from utils.pagination import encode_cursor
+
+
+# 숏츠별 댓글 목록 캐시 (작성/수정/삭제/좋아요 시 무효화)
+COMMENT_CACHE_TTL = float(os.getenv("COMMENT_CACHE_TTL", "60"))  # 초
+
+COMMENT_PAGE_SIZE = int(os.getenv("COMMENT_PAGE_SIZE", "20"))
+REPLY_PREVIEW_SIZE = int(os.getenv("REPLY_PREVIEW_SIZE", "3"))  # 댓글마다 함께 내려주는 답글 수
+
+# 댓글별 삭제되지 않은 직계 답글 수 (페이지에 포함된 행에 대해서만 계산됨)
+Reply = aliased(Comment)
+REPLY_COUNT = (
+    select(func.count())
+    .where(Reply.parent_no == Comment.no, Reply.is_del.is_(False))
+    .correlate(Comment)
+    .scalar_subquery()
+    .label("reply_count")
+)
 
 
-def get_comments(db: Session, novel_shorts_no: int) -> CommentListResponse:
+def comments_cache_key(novel_shorts_no: int) -> str:
+    return f"comments:{novel_shorts_no}"
+
+
+def _comment_select():
+    """댓글 + 답글 수 조회 구문 (작성자 이름은 fill_user_names에서 이름 캐시로 채움)"""
+    return select(Comment, REPLY_COUNT)
+
+
+def _page_filter(query, after: Optional[Tuple[datetime, int]], limit: int):
+    # (created_date, no) 키셋 페이지네이션: 커서 이후 행부터 바로 탐색
+    if after is not None:
+        query = query.where(tuple_(Comment.created_date, Comment.no) > tuple_(*after))
+    return query.order_by(Comment.created_date.asc(), Comment.no.asc()).limit(limit)
+
+
+def _comment_response(row) -> CommentResponse:
+    # DB 값으로만 만드므로 검증 생략 (응답 스키마 검증은 utils.serialization.RESPONSE_VALIDATION에서)
+    comment = row.Comment
+    return CommentResponse.model_construct(
+        **{
+            "no": comment.no,
+            "novel_shorts_no": comment.novel_shorts_no,
+            "user_no": comment.user_no,
+            "user_name": "",
+            "parent_no": comment.parent_no,
+            "content": comment.content or "",  # 응답 스키마에서 NULL이 아닌 필드
+            "like": comment.like or 0,
+            "created_date": comment.created_date,
+            "is_del": comment.is_del,
+            "reply_count": row.reply_count,
+            "replies": [],
+            "next_reply_cursor": None,
+        },
+    )
+
+
+def _cached_comment(data: dict) -> CommentResponse:
+    """캐시에 저장한 model_dump(mode="json") 값을 검증 없이 모델로 복원"""
+    return CommentResponse.model_construct(
+        **{
+            **data,  # 메모리 캐시는 저장된 객체를 그대로 돌려주므로 복사해서 변환
+            "created_date": datetime.fromisoformat(data["created_date"]),
+            "replies": [_cached_comment(reply) for reply in data["replies"]],
+        },
+    )
+
+
+async def fill_user_names(db: AsyncSession, comments: List[CommentResponse]) -> None:
+    """댓글과 답글 미리보기의 작성자 이름을 이름 캐시 조회 한 번으로 채움"""
+    tree = [*comments, *(reply for comment in comments for reply in comment.replies)]
+    names = await get_user_names(db, (comment.user_no for comment in tree))
+    for comment in tree:
+        comment.user_name = names.get(comment.user_no) or ""  # 이름이 NULL이거나 탈퇴한 사용자
+
+
+def comment_cursor(comment: CommentResponse) -> str:
+    return encode_cursor(comment.created_date.isoformat(), comment.no)
+
+
+async def attach_reply_previews(db: AsyncSession, comments: List[CommentResponse]) -> None:
+    """페이지에 포함된 댓글들의 앞쪽 답글을 한 번의 조회로 가져와 트리로 연결"""
+    parents = {comment.no: comment for comment in comments if comment.reply_count}
+    if not parents or REPLY_PREVIEW_SIZE <= 0:
+        return
+
+    ranked = (
+        select(
+            Comment.no,
+            func.row_number()
+            .over(partition_by=Comment.parent_no, order_by=(Comment.created_date.asc(), Comment.no.asc()))
+            .label("rank"),
+        )
+        .where(Comment.parent_no.in_(parents), Comment.is_del.is_(False))
+        .subquery()
+    )
+    rows = (
+        await db.execute(
+            _comment_select()
+            .join(ranked, ranked.c.no == Comment.no)
+            .where(ranked.c.rank <= REPLY_PREVIEW_SIZE)
+            .order_by(Comment.parent_no, ranked.c.rank)
+        )
+    ).all()
+
+    # 정렬된 결과를 한 번 순회하며 부모 댓글에 붙임
+    for row in rows:
+        parents[row.Comment.parent_no].replies.append(_comment_response(row))
+    for parent in parents.values():
+        if parent.replies and parent.reply_count > len(parent.replies):
+            parent.next_reply_cursor = comment_cursor(parent.replies[-1])
+
+
+async def get_comments(
+    db: AsyncSession,
+    novel_shorts_no: int,
+    limit: int = COMMENT_PAGE_SIZE,
+    after: Optional[Tuple[datetime, int]] = None,
+) -> CommentListResponse:
+    """숏츠의 최상위 댓글을 작성순으로 한 페이지 조회 (각 댓글에 답글 수와 앞쪽 답글 포함)"""
+    # 가장 많이 조회되는 첫 페이지(기본 크기)만 캐시
+    cacheable = after is None and limit == COMMENT_PAGE_SIZE
     try:
-        # User 테이블과 조인하여 작성자 정보 함께 조회
-        comments = (
-            db.query(Comment, User.name.label("user_name"))
-            .join(User, User.no == Comment.user_no)
-            .filter(Comment.novel_shorts_no == novel_shorts_no, Comment.is_del.is_(False))
-            .order_by(Comment.created_date.asc())
-            .all()
+        if cacheable:
+            cached = await cache.get(comments_cache_key(novel_shorts_no))
+            if cached is not None:
+                comment_list = [_cached_comment(comment) for comment in cached]
+                await fill_user_names(db, comment_list)  # 캐시 이후 이름이 바뀌었을 수 있으므로 다시 채움
+                message = "댓글을 성공적으로 조회했습니다" if comment_list else "댓글이 없습니다"
+                return CommentListResponse(success=True, message=message, comments=comment_list)
+
+        query = _comment_select().where(
+            Comment.novel_shorts_no == novel_shorts_no, Comment.parent_no.is_(None), Comment.is_del.is_(False)
         )
-
-        if not comments:
-            return CommentListResponse(success=True, message="댓글이 없습니다", comments=[])
-
-        # 댓글 변환
-        comment_list = []
-        for comment, user_name in comments:
-            try:
-                comment_dict = {
-                    "no": comment.no,
-                    "novel_shorts_no": comment.novel_shorts_no,
-                    "user_no": comment.user_no,
-                    "user_name": user_name,  # 작성자 이름 추가
-                    "parent_no": comment.parent_no,
-                    "content": comment.content,
-                    "like": comment.like,
-                    "created_date": comment.created_date,
-                    "is_del": comment.is_del,
-                }
-                comment_response = CommentResponse(**comment_dict)
-                comment_list.append(comment_response)
-            except Exception as e:
-                print(f"Error converting comment {comment.no}: {str(e)}")
-                continue
-
-        return CommentListResponse(success=True, message="댓글을 성공적으로 조회했습니다", comments=comment_list)
+        comment_list = [_comment_response(row) for row in (await db.execute(_page_filter(query, after, limit))).all()]
+        await attach_reply_previews(db, comment_list)
+        await fill_user_names(db, comment_list)
+
+        if cacheable:
+            await cache.set(
+                comments_cache_key(novel_shorts_no),
+                [comment.model_dump(mode="json") for comment in comment_list],
+                COMMENT_CACHE_TTL,
+            )
+        message = "댓글을 성공적으로 조회했습니다" if comment_list else "댓글이 없습니다"
+        return CommentListResponse(success=True, message=message, comments=comment_list)
     except Exception as e:
         print(f"Error in get_comments: {str(e)}")
         return CommentListResponse(success=False, message="댓글 조회 중 오류가 발생했습니다", comments=[])
 
 
-def create_comment(db: Session, comment_data: CommentCreate) -> CommentActionResponse:
+async def get_replies(
+    db: AsyncSession,
+    parent_no: int,
+    limit: int = COMMENT_PAGE_SIZE,
+    after: Optional[Tuple[datetime, int]] = None,
+) -> CommentListResponse:
+    """댓글의 직계 답글을 작성순으로 한 페이지 조회"""
+    try:
+        parent = await db.scalar(select(Comment.no).where(Comment.no == parent_no, Comment.is_del.is_(False)))
+        if not parent:
+            return CommentListResponse(success=False, message="존재하지 않는 댓글입니다", comments=[])
+
+        query = _comment_select().where(Comment.parent_no == parent_no, Comment.is_del.is_(False))
+        comment_list = [_comment_response(row) for row in (await db.execute(_page_filter(query, after, limit))).all()]
+        await attach_reply_previews(db, comment_list)
+        await fill_user_names(db, comment_list)
+
+        message = "답글을 성공적으로 조회했습니다" if comment_list else "답글이 없습니다"
+        return CommentListResponse(success=True, message=message, comments=comment_list)
+    except Exception as e:
+        print(f"Error in get_replies: {str(e)}")
+        return CommentListResponse(success=False, message="답글 조회 중 오류가 발생했습니다", comments=[])
+
+
+async def create_comment(db: AsyncSession, comment_data: CommentCreate) -> CommentActionResponse:
     try:
         # 숏츠 존재 여부 확인
-        shorts = db.query(NovelShorts).filter(NovelShorts.no == comment_data.novel_shorts_no).first()
+        shorts = await db.scalar(select(NovelShorts).where(NovelShorts.no == comment_data.novel_shorts_no))
         if not shorts:
             return CommentActionResponse(success=False, message="존재하지 않는 숏츠입니다")
 
         # 부모 댓글 존재 여부 확인 (대댓글인 경우)
         if comment_data.parent_no:
-            parent_comment = db.query(Comment).filter(Comment.no == comment_data.parent_no).first()
+            parent_comment = await db.scalar(select(Comment).where(Comment.no == comment_data.parent_no))
             if not parent_comment:
                 return CommentActionResponse(success=False, message="존재하지 않는 부모 댓글입니다")
 
@@ -77,27 +216,28 @@ def create_comment(db: Session, comment_data: CommentCreate) -> CommentActionRes
         # 숏츠의 댓글 수 증가
         shorts.comments += 1
 
-        db.commit()
-        db.refresh(new_comment)
+        await db.commit()
+        await db.refresh(new_comment)
+        await cache.delete(comments_cache_key(comment_data.novel_shorts_no))
 
         return CommentActionResponse(success=True, message="댓글이 작성되었습니다", comment_no=new_comment.no)
 
     except Exception as e:
         print(f"Error in create_comment: {str(e)}")  # 에러 로깅 추가
-        db.rollback()
+        await db.rollback()
         return CommentActionResponse(success=False, message=f"댓글 작성 중 오류가 발생했습니다: {str(e)}")
 
 
-def update_comment(db: Session, comment_no: int, user_no: int, update_data: CommentUpdate) -> CommentActionResponse:
+async def update_comment(
+    db: AsyncSession, comment_no: int, user_no: int, update_data: CommentUpdate
+) -> CommentActionResponse:
     try:
-        comment = (
-            db.query(Comment)
-            .filter(
+        comment = await db.scalar(
+            select(Comment).where(
                 Comment.no == comment_no,
                 Comment.user_no == user_no,
                 Comment.is_del.is_(False),
             )
-            .first()
         )
 
         if not comment:
@@ -107,25 +247,24 @@ def update_comment(db: Session, comment_no: int, user_no: int, update_data: Comm
             return CommentActionResponse(success=False, message="댓글 내용을 입력해주세요", comment_no=None)
 
         comment.content = update_data.content
-        db.commit()
+        await db.commit()
+        await cache.delete(comments_cache_key(comment.novel_shorts_no))
 
         return CommentActionResponse(success=True, message="댓글이 수정되었습니다", comment_no=comment_no)
     except Exception as e:
         print(f"Error in update_comment: {str(e)}")
-        db.rollback()
+        await db.rollback()
         return CommentActionResponse(success=False, message="댓글 수정 중 오류가 발생했습니다", comment_no=None)
 
 
-def delete_comment(db: Session, comment_no: int, user_no: int) -> CommentActionResponse:
+async def delete_comment(db: AsyncSession, comment_no: int, user_no: int) -> CommentActionResponse:
     try:
-        comment = (
-            db.query(Comment)
-            .filter(
+        comment = await db.scalar(
+            select(Comment).where(
                 Comment.no == comment_no,
                 Comment.user_no == user_no,
                 Comment.is_del.is_(False),
             )
-            .first()
         )
 
         if not comment:
@@ -139,35 +278,38 @@ def delete_comment(db: Session, comment_no: int, user_no: int) -> CommentActionR
             .where(NovelShorts.no == comment.novel_shorts_no)
             .values(comments=NovelShorts.comments - 1)
         )
-        db.execute(stmt)
+        await db.execute(stmt)
 
-        db.commit()
+        await db.commit()
+        await cache.delete(comments_cache_key(comment.novel_shorts_no))
         return CommentActionResponse(success=True, message="댓글이 삭제되었습니다", comment_no=comment_no)
     except Exception as e:
         print(f"Error in delete_comment: {str(e)}")
-        db.rollback()
+        await db.rollback()
         return CommentActionResponse(success=False, message="댓글 삭제 중 오류가 발생했습니다", comment_no=None)
 
 
-def like_comment(db: Session, user_no: int, comment_no: int) -> CommentActionResponse:
+async def like_comment(db: AsyncSession, user_no: int, comment_no: int) -> CommentActionResponse:
     try:
         # 댓글 존재 여부 확인
-        comment = db.query(Comment).filter(Comment.no == comment_no, Comment.is_del.is_(False)).first()
+        comment = await db.scalar(select(Comment).where(Comment.no == comment_no, Comment.is_del.is_(False)))
         if not comment:
             return CommentActionResponse(success=False, message="존재하지 않는 댓글입니다")
 
         # 이미 좋아요를 눌렀는지 확인
-        existing_like = (
-            db.query(UserLike)
-            .filter(UserLike.user_no == user_no, UserLike.comment_no == comment_no, UserLike.is_del.is_(False))
-            .first()
+        existing_like = await db.scalar(
+            select(UserLike).where(
+                UserLike.user_no == user_no, UserLike.comment_no == comment_no, UserLike.is_del.is_(False)
+            )
         )
 
         if existing_like:
             return CommentActionResponse(success=False, message="이미 좋아요를 눌렀습니다")
 
         # 새로운 좋아요 기록 생성 또는 기존 기록 업데이트
-        like_record = db.query(UserLike).filter(UserLike.user_no == user_no, UserLike.comment_no == comment_no).first()
+        like_record = await db.scalar(
+            select(UserLike).where(UserLike.user_no == user_no, UserLike.comment_no == comment_no).limit(1)
+        )
 
         if like_record:
             like_record.is_del = False
@@ -177,28 +319,29 @@ def like_comment(db: Session, user_no: int, comment_no: int) -> CommentActionRes
 
         # 댓글의 좋아요 수 증가
         comment.like += 1
-        db.commit()
+        await db.commit()
+        await cache.delete(comments_cache_key(comment.novel_shorts_no))
 
         return CommentActionResponse(success=True, message="댓글에 좋아요를 눌렀습니다", comment_no=comment_no)
 
     except Exception as e:
         print(f"Error in like_comment: {str(e)}")
-        db.rollback()
+        await db.rollback()
         return CommentActionResponse(success=False, message="좋아요 처리 중 오류가 발생했습니다", comment_no=None)
 
 
-def dislike_comment(db: Session, user_no: int, comment_no: int) -> CommentActionResponse:
+async def dislike_comment(db: AsyncSession, user_no: int, comment_no: int) -> CommentActionResponse:
     try:
         # 댓글 존재 여부 확인
-        comment = db.query(Comment).filter(Comment.no == comment_no, Comment.is_del.is_(False)).first()
+        comment = await db.scalar(select(Comment).where(Comment.no == comment_no, Comment.is_del.is_(False)))
         if not comment:
             return CommentActionResponse(success=False, message="존재하지 않는 댓글입니다")
 
         # 좋아요 기록 확인
-        like_record = (
-            db.query(UserLike)
-            .filter(UserLike.user_no == user_no, UserLike.comment_no == comment_no, UserLike.is_del.is_(False))
-            .first()
+        like_record = await db.scalar(
+            select(UserLike).where(
+                UserLike.user_no == user_no, UserLike.comment_no == comment_no, UserLike.is_del.is_(False)
+            )
         )
 
         if not like_record:
@@ -207,11 +350,12 @@ def dislike_comment(db: Session, user_no: int, comment_no: int) -> CommentAction
         # 좋아요 취소 처리
         like_record.is_del = True
         comment.like -= 1
-        db.commit()
+        await db.commit()
+        await cache.delete(comments_cache_key(comment.novel_shorts_no))
 
         return CommentActionResponse(success=True, message="댓글 좋아요를 취소했습니다", comment_no=comment_no)
 
     except Exception as e:
         print(f"Error in dislike_comment: {str(e)}")
-        db.rollback()
+        await db.rollback()
         return CommentActionResponse(success=False, message="좋아요 취소 중 오류가 발생했습니다", comment_no=None)
@@ -1,39 +1,90 @@
+from datetime import datetime
+from typing import Optional, Tuple
+
 from auth.jwt_bearer import JWTBearer
 from comment.comment_query import (
+    COMMENT_PAGE_SIZE,
+    comment_cursor,
     create_comment,
     delete_comment,
     dislike_comment,
     get_comments,
+    get_replies,
     like_comment,
     update_comment,
 )
 from comment.comment_schema import CommentActionResponse, CommentCreate, CommentListResponse, CommentUpdate
 from database import get_db
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from novel.novel_router import NEXT_CURSOR_HEADER
+from sqlalchemy.ext.asyncio import AsyncSession
 from utils.logger import log_api_call
+from utils.pagination import decode_cursor
+from utils.serialization import fast_response
 
 
 app = APIRouter(prefix="/shorts")
 jwt_bearer = JWTBearer()
 
+LIMIT_QUERY = Query(default=COMMENT_PAGE_SIZE, ge=1, le=100)
+CURSOR_QUERY = Query(default=None, description="이전 응답의 X-Next-Cursor 값")
+
+
+def parse_comment_cursor(cursor: Optional[str]) -> Optional[Tuple[datetime, int]]:
+    if not cursor:
+        return None
+    try:
+        created_date, no = decode_cursor(cursor)
+        return datetime.fromisoformat(created_date), int(no)
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="올바르지 않은 커서입니다")
+
+
+def set_next_cursor(response: Response, result: CommentListResponse, limit: int):
+    # 다음 페이지가 있을 수 있으면 마지막 댓글을 커서로 전달
+    if len(result.comments) == limit:
+        response.headers[NEXT_CURSOR_HEADER] = comment_cursor(result.comments[-1])
+
 
 @app.get("/{shorts_no}/comments", response_model=CommentListResponse)
 @log_api_call
-async def get_shorts_comments(shorts_no: int, db: Session = Depends(get_db)):
-    result = get_comments(db, shorts_no)
+async def get_shorts_comments(
+    shorts_no: int,
+    response: Response,
+    limit: int = LIMIT_QUERY,
+    cursor: Optional[str] = CURSOR_QUERY,
+    db: AsyncSession = Depends(get_db),
+):
+    result = await get_comments(db, shorts_no, limit, parse_comment_cursor(cursor))
     if not result.success:
         raise HTTPException(status_code=400, detail=result.message)
-    return result
+    set_next_cursor(response, result, limit)
+    return fast_response(result, CommentListResponse, response)
+
+
+@app.get("/comment/{comment_no}/replies", response_model=CommentListResponse)
+@log_api_call
+async def get_comment_replies(
+    comment_no: int,
+    response: Response,
+    limit: int = LIMIT_QUERY,
+    cursor: Optional[str] = Query(default=None, description="X-Next-Cursor 또는 댓글의 next_reply_cursor 값"),
+    db: AsyncSession = Depends(get_db),
+):
+    result = await get_replies(db, comment_no, limit, parse_comment_cursor(cursor))
+    if not result.success:
+        raise HTTPException(status_code=400, detail=result.message)
+    set_next_cursor(response, result, limit)
+    return fast_response(result, CommentListResponse, response)
 
 
 @app.post("/comment", response_model=CommentActionResponse)
 @log_api_call
 async def create_shorts_comment(
-    comment_data: CommentCreate, current_user: dict = Depends(jwt_bearer), db: Session = Depends(get_db)
+    comment_data: CommentCreate, current_user: dict = Depends(jwt_bearer), db: AsyncSession = Depends(get_db)
 ):
     comment_data.user_no = current_user["user_no"]
-    result = create_comment(db, comment_data)
+    result = await create_comment(db, comment_data)
     if not result.success:
         raise HTTPException(status_code=400, detail=result.message)
     return result
@@ -45,9 +96,9 @@ async def update_shorts_comment(
     comment_no: int,
     update_data: CommentUpdate,
     current_user: dict = Depends(jwt_bearer),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
 ):
-    result = update_comment(db, comment_no, current_user["user_no"], update_data)
+    result = await update_comment(db, comment_no, current_user["user_no"], update_data)
     if not result.success:
         raise HTTPException(status_code=400, detail=result.message)
     return result
@@ -56,9 +107,9 @@ async def update_shorts_comment(
 @app.delete("/comment/{comment_no}", response_model=CommentActionResponse)
 @log_api_call
 async def delete_shorts_comment(
-    comment_no: int, current_user: dict = Depends(jwt_bearer), db: Session = Depends(get_db)
+    comment_no: int, current_user: dict = Depends(jwt_bearer), db: AsyncSession = Depends(get_db)
 ):
-    result = delete_comment(db, comment_no, current_user["user_no"])
+    result = await delete_comment(db, comment_no, current_user["user_no"])
     if not result.success:
         raise HTTPException(status_code=400, detail=result.message)
     return result
@@ -66,8 +117,10 @@ async def delete_shorts_comment(
 
 @app.post("/comment/{comment_no}/like", response_model=CommentActionResponse)
 @log_api_call
-async def like_shorts_comment(comment_no: int, current_user: dict = Depends(jwt_bearer), db: Session = Depends(get_db)):
-    result = like_comment(db, current_user["user_no"], comment_no)
+async def like_shorts_comment(
+    comment_no: int, current_user: dict = Depends(jwt_bearer), db: AsyncSession = Depends(get_db)
+):
+    result = await like_comment(db, current_user["user_no"], comment_no)
     if not result.success:
         raise HTTPException(status_code=400, detail=result.message)
     return result
@@ -76,9 +129,9 @@ async def like_shorts_comment(comment_no: int, current_user: dict = Depends(jwt_
 @app.delete("/comment/{comment_no}/like", response_model=CommentActionResponse)
 @log_api_call
 async def dislike_shorts_comment(
-    comment_no: int, current_user: dict = Depends(jwt_bearer), db: Session = Depends(get_db)
+    comment_no: int, current_user: dict = Depends(jwt_bearer), db: AsyncSession = Depends(get_db)
 ):
-    result = dislike_comment(db, current_user["user_no"], comment_no)
+    result = await dislike_comment(db, current_user["user_no"], comment_no)
     if not result.success:
         raise HTTPException(status_code=400, detail=result.message)
     return result
@@ -34,6 +34,9 @@ class CommentResponse(BaseModel):
     like: int
     created_date: datetime
     is_del: bool
+    reply_count: int = 0  # 삭제되지 않은 직계 답글 수
+    replies: List["CommentResponse"] = []  # 앞쪽 일부 답글 (나머지는 답글 조회 API로)
+    next_reply_cursor: Optional[str] = None  # replies 이후 답글을 이어서 조회할 커서
 
     class Config:
         json_schema_extra = {
@@ -47,6 +50,9 @@ class CommentResponse(BaseModel):
                 "like": 0,
                 "created_date": "2024-02-09T12:00:00",
                 "is_del": False,
+                "reply_count": 0,
+                "replies": [],
+                "next_reply_cursor": None,
             }
         }
 
@@ -3,8 +3,8 @@ from pathlib import Path
 
 from dotenv import load_dotenv
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
 
 
 # 현재 파일의 디렉토리를 기준으로 .env 파일 경로 설정
@@ -19,25 +19,27 @@ DB_NAME = os.getenv("DB_NAME")
 
 # PostgreSQL connection URL
 DB_URL = f"postgresql://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_NAME}"
+ASYNC_DB_URL = f"postgresql+asyncpg://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_NAME}"
 
-engine = create_engine(
-    DB_URL,
+# 동기 엔진은 스키마 생성(DDL) 등 요청 처리 밖의 작업에만 사용
+engine = create_engine(DB_URL)
+
+# API 요청은 이벤트 루프를 막지 않도록 asyncpg 기반 비동기 엔진 사용
+async_engine = create_async_engine(
+    ASYNC_DB_URL,
     pool_size=50,
     max_overflow=0,
 )  # DB 커넥션 풀 생성
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)  # DB접속을 위한 클래스
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine,
+    class_=AsyncSession,
+    autoflush=False,
+    expire_on_commit=False,  # commit 후 속성 접근 시 지연 로딩(동기 IO)이 일어나지 않도록 함
+)  # DB접속을 위한 클래스
 
 Base = declarative_base()  # Base 클래스는 DB 모델 구성할 때 사용
 
 
-def get_db():
-    db = SessionLocal()
-    try:
+async def get_db():
+    async with AsyncSessionLocal() as db:
         yield db
-    finally:
-        db.close()
-
-
-# META = Base.metadata
-# get_db = AsyncDB(DB_URL, meta=META, autocommit=False, autoflush=False, expire_on_commit=False)
-# DB = Annotated[AsyncSession, Depends(get_db)]
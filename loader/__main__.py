@@ -0,0 +1,50 @@
+import argparse
+from pathlib import Path
+import sys
+
+from database import engine
+from loader.copy_loader import BULK_LOAD_BATCH_SIZE, KINDS, LoaderError, list_checkpoints, load_file
+from sqlalchemy.exc import SQLAlchemyError
+
+
+"""
+카탈로그 백필용 오프라인 적재 명령 (HTTP 일괄 적재 API 대신 COPY로 적재)
+
+    python -m loader novels data/ridi_novels.jsonl               # 소설 upsert
+    python -m loader shorts data/ridi_shorts.csv --batch-size 50000
+    python -m loader novels data/ridi_novels.jsonl --restart     # 체크포인트를 지우고 처음부터
+    python -m loader status                                      # 작업별 체크포인트
+"""
+
+
+def main():
+    parser = argparse.ArgumentParser(prog="python -m loader")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    for kind in KINDS:
+        load_parser = subparsers.add_parser(kind, help=f"{kind} 파일 적재 (중단된 작업은 이어서 적재)")
+        load_parser.add_argument("path", type=Path, help="JSONL 또는 CSV 파일")
+        load_parser.add_argument("--format", choices=["jsonl", "csv"], default=None, help="기본값: 확장자로 판단")
+        load_parser.add_argument("--job", default=None, help=f"체크포인트 이름 (기본값: {kind}:<파일 이름>)")
+        load_parser.add_argument("--batch-size", type=int, default=BULK_LOAD_BATCH_SIZE, help="트랜잭션당 레코드 수")
+        load_parser.add_argument("--restart", action="store_true", help="체크포인트를 지우고 처음부터 적재")
+    subparsers.add_parser("status", help="작업별 체크포인트 출력")
+    args = parser.parse_args()
+
+    if args.command == "status":
+        for checkpoint in list_checkpoints(engine):
+            print(
+                f"{checkpoint['job']}: position {checkpoint['position']} created {checkpoint['created_rows']}"
+                f" updated {checkpoint['updated_rows']} skipped {checkpoint['skipped_rows']}"
+                f" ({checkpoint['updated_date']:%Y-%m-%d %H:%M:%S})"
+            )
+        return
+
+    try:
+        load_file(engine, args.command, args.path, args.format, args.job, args.batch_size, args.restart)
+    except (LoaderError, OSError, SQLAlchemyError) as e:
+        print(f"Error in loader: {str(e)}", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,409 @@
+import csv
+from io import StringIO
+import json
+import os
+from pathlib import Path
+import time
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+from models import BulkLoadCheckpoint, FormType, MediaFile, Novel, NovelShorts
+from novel.media_store import UPLOAD_DIR
+from novel.novel_query import NOVEL_UPSERT_KEEP_COLUMNS
+from sqlalchemy import (
+    ARRAY,
+    BigInteger,
+    Column,
+    MetaData,
+    Table,
+    and_,
+    func,
+    literal_column,
+    or_,
+    select,
+    text,
+    union_all,
+    update,
+)
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.engine import Connection, Engine
+
+
+"""
+카탈로그 백필용 오프라인 적재 (JSONL/CSV → 임시 스테이징 테이블 COPY → 한 구문으로 병합)
+- 스테이징 테이블은 models.py의 컬럼 정의(이름/타입)로 만들고, 배치마다 트랜잭션 안에서 만들어 커밋 시 삭제
+- 소설: (source_platform_type, source_id) 기준 upsert, 같은 배치 안의 같은 작품은 파일에서 마지막 레코드만 적재
+  source_platform_type이나 source_id가 없는 레코드는 건너뜀 (NULL 키는 ON CONFLICT에 걸리지 않아 재적재 시 중복됨)
+  건너뛴 수(배치 안의 중복 포함)와 그중 키가 없는 수(missing key)를 따로 보고
+- 숏츠: source_id(또는 novel_id)를 플랫폼이 있는 소설과 조인해 한 번에 novel_no로 바꿈
+  source_platform_type이 있으면 그 플랫폼의 소설, 없으면 가장 먼저 등록된 소설에 연결하고 못 찾은 레코드는 건너뜀
+- 파일에 없는 컬럼은 넣거나 덮어쓰지 않음 (예: views만 있는 파일로 조회수만 갱신)
+- 배치 적재와 체크포인트(커밋한 레코드 수) 기록이 같은 트랜잭션이라, 중단 후 다시 실행하면 다음 레코드부터 이어서 적재
+  완료한 파일 끝에 레코드를 덧붙여 다시 실행하면 새 레코드만 적재
+- 게시글 캐시는 지우지 않으므로, 갱신한 소설 제목/작가는 캐시 TTL(POST_CACHE_TTL)이 지나면 반영됨
+"""
+
+BULK_LOAD_BATCH_SIZE = int(os.getenv("BULK_LOAD_BATCH_SIZE", "20000"))  # 한 트랜잭션에 적재할 레코드 수
+BULK_LOAD_LOCK_KEY = 7_320_025  # 같은 작업을 동시에 실행하지 않도록 (작업 이름 해시와 함께) 잡는 advisory lock
+FILE_FORMATS = {".jsonl": "jsonl", ".ndjson": "jsonl", ".csv": "csv"}
+KINDS = ("novels", "shorts")
+SHORTS_SOURCE_ALIASES = {"novel_id": "source_id"}  # 숏츠 등록 API와 같은 필드 이름도 허용
+
+COPY_ESCAPES = str.maketrans({"\\": "\\\\", "\t": "\\t", "\n": "\\n", "\r": "\\r"})
+
+
+class LoaderError(Exception):
+    pass
+
+
+def _staging_table(name: str, columns: List[Column]) -> Table:
+    return Table(
+        name,
+        MetaData(),
+        Column("line_no", BigInteger, nullable=False),  # 입력 파일의 레코드 번호 (중복 처리/적재 순서용)
+        *columns,
+        prefixes=["TEMPORARY"],
+        postgresql_on_commit="DROP",
+    )
+
+
+def _model_columns(table: Table, excluded: set) -> List[Column]:
+    return [Column(column.name, column.type) for column in table.columns if column.name not in excluded]
+
+
+novel_table, shorts_table = Novel.__table__, NovelShorts.__table__
+
+NOVEL_STAGING = _staging_table("novel_staging", _model_columns(novel_table, {"no"}))
+SHORTS_STAGING = _staging_table(
+    "novel_shorts_staging",
+    [
+        Column("source_platform_type", novel_table.c.source_platform_type.type),
+        Column("source_id", novel_table.c.source_id.type),
+        *_model_columns(shorts_table, {"no", "novel_no", "updated_date"}),
+    ],
+)
+STAGING_TABLES = {"novels": NOVEL_STAGING, "shorts": SHORTS_STAGING}
+
+
+def detect_format(path: Path) -> str:
+    file_format = FILE_FORMATS.get(path.suffix.lower())
+    if file_format is None:
+        raise LoaderError(f"파일 형식을 알 수 없습니다: {path.name} (--format jsonl|csv 지정)")
+    return file_format
+
+
+def read_records(path: Path, file_format: str, skip: int) -> Iterator[Tuple[int, Optional[dict]]]:
+    """(레코드 번호, 레코드) 순서대로 읽음. 번호가 skip 이하인 레코드는 파싱하지 않고 건너뜀 (빈 줄은 None)"""
+    with open(path, newline="", encoding="utf-8-sig") as file:
+        if file_format == "jsonl":
+            for line_no, line in enumerate(file, start=1):
+                if line_no <= skip:
+                    continue
+                if not line.strip():
+                    yield line_no, None
+                    continue
+                try:
+                    yield line_no, json.loads(line)
+                except json.JSONDecodeError as e:
+                    raise LoaderError(f"{path.name} {line_no}번째 줄: JSON 오류 ({e.msg})")
+        else:
+            for line_no, row in enumerate(csv.DictReader(file), start=1):
+                if line_no > skip:
+                    # CSV는 빈 값과 NULL을 구분할 수 없어 빈 값은 NULL로 적재
+                    yield line_no, {key: (value if value != "" else None) for key, value in row.items()}
+
+
+def read_batches(records: Iterator[Tuple[int, Optional[dict]]], batch_size: int) -> Iterator[Tuple[int, List]]:
+    """(배치 마지막 레코드 번호, [(레코드 번호, 레코드), ...]) 묶음"""
+    batch, last, pending = [], 0, False
+    for line_no, record in records:
+        last, pending = line_no, True
+        if record is not None:
+            batch.append((line_no, record))
+        if len(batch) >= batch_size:
+            yield last, batch
+            batch, pending = [], False
+    if pending:  # 남은 레코드 (빈 줄만 남았어도 체크포인트 위치는 옮김)
+        yield last, batch
+
+
+def copy_value(value) -> str:
+    """COPY text 형식의 값 (NULL은 \\N, 배열은 PostgreSQL 배열 리터럴)"""
+    if value is None:
+        return "\\N"
+    if isinstance(value, bool):
+        return "t" if value else "f"
+    if isinstance(value, (list, tuple)):
+        items = [
+            "NULL" if item is None else '"' + str(item).replace("\\", "\\\\").replace('"', '\\"') + '"'
+            for item in value
+        ]
+        value = "{" + ",".join(items) + "}"
+    return str(value).translate(COPY_ESCAPES)
+
+
+def present_columns(staging: Table, batch: List[Tuple[int, dict]], aliases: Dict[str, str]) -> List[str]:
+    """배치의 레코드에 하나라도 있는 스테이징 컬럼 (모델 컬럼 순서)"""
+    keys = {aliases.get(key, key) for _, record in batch for key in record}
+    return [column.name for column in staging.columns if column.name in keys]
+
+
+def copy_batch(connection: Connection, staging: Table, columns: List[str], batch: List, aliases: Dict[str, str]):
+    array_columns = {column.name for column in staging.columns if isinstance(column.type, ARRAY)}
+    buffer = StringIO()
+    for line_no, record in batch:
+        record = {aliases.get(key, key): value for key, value in record.items()}
+        for name in array_columns:
+            if isinstance(record.get(name), str) and record[name].startswith("["):
+                record[name] = json.loads(record[name])  # CSV의 genres 등 JSON 배열 표기
+        buffer.write("\t".join([str(line_no), *(copy_value(record.get(name)) for name in columns)]))
+        buffer.write("\n")
+    buffer.seek(0)
+    cursor = connection.connection.cursor()
+    try:
+        cursor.copy_expert(f"COPY {staging.name} (line_no, {', '.join(columns)}) FROM STDIN", buffer)
+    finally:
+        cursor.close()
+
+
+def merge_novels(connection: Connection, columns: List[str]) -> Dict[str, int]:
+    """스테이징의 소설을 upsert (같은 작품은 레코드 번호가 가장 큰 것만)"""
+    staging = NOVEL_STAGING
+    keys = ["source_platform_type", "source_id"]
+    columns = [*keys, *(name for name in columns if name not in keys)]
+    latest = (
+        select(*[staging.c[name] for name in columns])
+        .where(staging.c.source_platform_type.isnot(None), staging.c.source_id.isnot(None))
+        .distinct(staging.c.source_platform_type, staging.c.source_id)
+        .order_by(staging.c.source_platform_type, staging.c.source_id, staging.c.line_no.desc())
+    )
+    stmt = pg_insert(novel_table).from_select(columns, latest)
+    set_ = {name: stmt.excluded[name] for name in columns if name not in NOVEL_UPSERT_KEEP_COLUMNS}
+    if set_:
+        stmt = stmt.on_conflict_do_update(constraint="uq_novel_source_platform_type_source_id", set_=set_)
+    else:  # 키만 있는 파일은 새 작품만 추가
+        stmt = stmt.on_conflict_do_nothing(constraint="uq_novel_source_platform_type_source_id")
+    stmt = stmt.returning(literal_column("xmax = 0").label("inserted"))  # 새로 INSERT된 행은 xmax가 0
+    upserted = stmt.cte("upserted")
+    missing_key = (
+        select(func.count())
+        .where(or_(staging.c.source_platform_type.is_(None), staging.c.source_id.is_(None)))
+        .scalar_subquery()
+    )
+    created, total, missing = connection.execute(
+        select(func.count().filter(upserted.c.inserted), func.count(), missing_key).select_from(upserted)
+    ).one()
+    return {"created": created, "updated": total - created, "missing_key": missing}
+
+
+def _novel_match(staging: Table):
+    """숏츠 스테이징 행과 연결할 소설 조건 (플랫폼이 없는 소설은 (플랫폼, source_id)로 유일하지 않아 제외)"""
+    return and_(
+        novel_table.c.source_id == staging.c.source_id,
+        novel_table.c.source_platform_type.isnot(None),
+        or_(
+            staging.c.source_platform_type.is_(None),
+            novel_table.c.source_platform_type == staging.c.source_platform_type,
+        ),
+    )
+
+
+def merge_shorts(connection: Connection, columns: List[str]) -> Dict[str, int]:
+    """스테이징의 숏츠를 source_id로 소설과 조인해 파일 순서대로 적재하고 미디어 참조 수를 갱신"""
+    staging = SHORTS_STAGING
+    resolved = (
+        select(staging.c.line_no, novel_table.c.no.label("novel_no"))
+        .join(novel_table, _novel_match(staging))
+        .distinct(staging.c.line_no)
+        .order_by(staging.c.line_no, novel_table.c.no)
+        .cte("resolved")
+    )
+    columns = [name for name in columns if name not in ("source_platform_type", "source_id", "form_type")]
+    rows = (
+        select(
+            resolved.c.novel_no,
+            func.coalesce(staging.c.form_type, FormType.TEXT.value),
+            *[staging.c[name] for name in columns],
+        )
+        .join(resolved, resolved.c.line_no == staging.c.line_no)
+        .order_by(staging.c.line_no)
+    )
+    inserted = (
+        pg_insert(shorts_table)
+        .from_select(["novel_no", "form_type", *columns], rows)
+        .returning(shorts_table.c.image, shorts_table.c.music)
+        .cte("inserted")
+    )
+
+    # 새 숏츠가 가리키는 업로드 파일의 참조 수를 같은 구문에서 올림
+    paths = union_all(select(inserted.c.image.label("path")), select(inserted.c.music)).subquery()
+    refs = (
+        select(paths.c.path, func.count().label("count"))
+        .where(paths.c.path.like(f"{UPLOAD_DIR.name}/%"))
+        .group_by(paths.c.path)
+        .subquery()
+    )
+    media_table = MediaFile.__table__
+    refs_updated = (
+        update(media_table)
+        .where(media_table.c.path == refs.c.path)
+        .values(ref_count=media_table.c.ref_count + refs.c.count, touched_date=func.localtimestamp())
+        .returning(media_table.c.path)
+        .cte("refs_updated")
+    )
+    created = connection.scalar(select(func.count()).select_from(inserted).add_cte(refs_updated))
+    return {"created": created, "updated": 0, "missing_key": 0}
+
+
+def unresolved_lines(connection: Connection, limit: int) -> List[int]:
+    """연결할 소설을 찾지 못한 숏츠 레코드 번호 (앞에서부터 limit건)"""
+    staging = SHORTS_STAGING
+    matched = select(novel_table.c.no).where(_novel_match(staging))
+    stmt = select(staging.c.line_no).where(~matched.exists()).order_by(staging.c.line_no).limit(limit)
+    return list(connection.scalars(stmt))
+
+
+def get_checkpoint(connection: Connection, job: str) -> Optional[dict]:
+    table = BulkLoadCheckpoint.__table__
+    row = connection.execute(select(table).where(table.c.job == job)).mappings().first()
+    return dict(row) if row else None
+
+
+def save_checkpoint(connection: Connection, job: str, kind: str, position: int, counts: Dict[str, int]):
+    table = BulkLoadCheckpoint.__table__
+    values = {
+        "position": position,
+        "created_rows": counts["created"],
+        "updated_rows": counts["updated"],
+        "skipped_rows": counts["skipped"],
+        "updated_date": func.localtimestamp(),
+    }
+    stmt = pg_insert(table).values(job=job, kind=kind, **values)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[table.c.job],
+        set_={
+            "position": values["position"],
+            "updated_date": values["updated_date"],
+            # 재시작(--restart)이 아니면 이전 실행의 집계에 더함
+            **{name: table.c[name] + stmt.excluded[name] for name in ("created_rows", "updated_rows", "skipped_rows")},
+        },
+    )
+    connection.execute(stmt)
+
+
+def reset_checkpoint(connection: Connection, job: str):
+    table = BulkLoadCheckpoint.__table__
+    connection.execute(table.delete().where(table.c.job == job))
+
+
+def list_checkpoints(engine: Engine) -> List[dict]:
+    table = BulkLoadCheckpoint.__table__
+    with engine.connect() as connection:
+        return [dict(row) for row in connection.execute(select(table).order_by(table.c.job)).mappings()]
+
+
+def load_batch(connection: Connection, kind: str, batch: List, timings: Dict[str, float]) -> Tuple[dict, List[int]]:
+    """배치를 스테이징에 COPY한 뒤 병합 (호출한 쪽 트랜잭션에서 체크포인트와 함께 커밋)"""
+    counts, unresolved = {"created": 0, "updated": 0, "missing_key": 0}, []
+    if batch:
+        started = time.perf_counter()
+        staging = STAGING_TABLES[kind]
+        aliases = SHORTS_SOURCE_ALIASES if kind == "shorts" else {}
+        staging.create(connection)
+        columns = present_columns(staging, batch, aliases)
+        copy_batch(connection, staging, columns, batch, aliases)
+        copied = time.perf_counter()
+        timings["copy"] += copied - started
+        if kind == "novels":
+            counts = merge_novels(connection, columns)
+        else:
+            counts = merge_shorts(connection, columns)
+            if counts["created"] < len(batch):
+                unresolved = unresolved_lines(connection, limit=5)
+        timings["merge"] += time.perf_counter() - copied
+    counts["skipped"] = len(batch) - counts["created"] - counts["updated"]
+    return counts, unresolved
+
+
+def load_file(
+    engine: Engine,
+    kind: str,
+    path: Path,
+    file_format: Optional[str] = None,
+    job: Optional[str] = None,
+    batch_size: int = BULK_LOAD_BATCH_SIZE,
+    restart: bool = False,
+    report: Callable[[str], None] = print,
+) -> dict:
+    """파일을 배치 단위로 COPY 적재하고 배치마다 체크포인트를 함께 커밋 (적재 결과와 처리 속도 반환)"""
+    if kind not in KINDS:
+        raise LoaderError(f"알 수 없는 적재 대상입니다: {kind}")
+    path = Path(path)
+    file_format = file_format or detect_format(path)
+    job = job or f"{kind}:{path.name}"
+
+    totals = {"records": 0, "created": 0, "updated": 0, "skipped": 0, "missing_key": 0}
+    timings = {"read": 0.0, "copy": 0.0, "merge": 0.0}
+    start = time.perf_counter()
+    with engine.connect() as connection:
+        with connection.begin():
+            locked = connection.scalar(
+                text("SELECT pg_try_advisory_lock(:key, hashtext(:job))"), {"key": BULK_LOAD_LOCK_KEY, "job": job}
+            )
+            if not locked:
+                raise LoaderError(f"같은 작업이 이미 실행 중입니다: {job}")
+            if restart:
+                reset_checkpoint(connection, job)
+            checkpoint = get_checkpoint(connection, job)
+        try:
+            skip = checkpoint["position"] if checkpoint else 0
+            if skip:
+                report(f"{job}: {skip}번째 레코드까지 적재됨, 이어서 적재")
+            first = skip + 1
+
+            batches = read_batches(read_records(path, file_format, skip), batch_size)
+            while True:
+                started = time.perf_counter()
+                position, batch = next(batches, (None, None))
+                timings["read"] += time.perf_counter() - started
+                if position is None:
+                    break
+
+                batch_start = time.perf_counter()
+                with connection.begin():
+                    counts, unresolved = load_batch(connection, kind, batch, timings)
+                    save_checkpoint(connection, job, kind, position, counts)
+
+                elapsed = time.perf_counter() - batch_start
+                totals["records"] += len(batch)
+                for name in ("created", "updated", "skipped", "missing_key"):
+                    totals[name] += counts[name]
+                rate = len(batch) / elapsed if elapsed else 0.0
+                report(
+                    f"records {first}-{position}: created {counts['created']} updated {counts['updated']}"
+                    f" skipped {counts['skipped']} (missing key {counts['missing_key']})"
+                    f" ({elapsed:.2f}s, {rate:,.0f} rows/s)"
+                )
+                if unresolved:
+                    report(f"  novel not found: records {', '.join(map(str, unresolved))}")
+                first = position + 1
+        finally:
+            with connection.begin():
+                connection.execute(
+                    text("SELECT pg_advisory_unlock(:key, hashtext(:job))"), {"key": BULK_LOAD_LOCK_KEY, "job": job}
+                )
+
+    elapsed = time.perf_counter() - start
+    result = {
+        "job": job,
+        **totals,
+        "elapsed": elapsed,
+        "rows_per_second": totals["records"] / elapsed if elapsed else 0.0,
+        **{f"{name}_seconds": seconds for name, seconds in timings.items()},
+    }
+    report(
+        f"{job}: {totals['records']} records in {elapsed:.2f}s ({result['rows_per_second']:,.0f} rows/s;"
+        f" read {timings['read']:.2f}s, copy {timings['copy']:.2f}s, merge {timings['merge']:.2f}s)"
+        f" created {totals['created']} updated {totals['updated']} skipped {totals['skipped']}"
+        f" (missing key {totals['missing_key']})"
+    )
+    return result
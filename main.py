@@ -1,23 +1,46 @@
+from contextlib import asynccontextmanager
+
 from comment import comment_router
-from database import engine
 from fastapi import FastAPI
 from fastapi.middleware.gzip import GZipMiddleware
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
 from fastapi.responses import RedirectResponse
-import models
-from novel import admin_router, novel_router
+from novel import admin_router, media_router, novel_router
+from novel.image_derivatives import image_derivatives
+from novel.media_store import media_garbage_collector
 from starlette.middleware.cors import CORSMiddleware
 from user import user_router
+from user.active_log_buffer import active_log_buffer
+from user.password_hasher import password_hasher
 from user.user_router import active_router
+from utils.cache import cache
+
+
+# 스키마 생성/변경은 앱 시작과 분리된 `python -m migrations upgrade` 에서만 수행 (워커 시작 시 DDL/스키마 조회 없음)
+
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # 활동 로그 버퍼: 시작 시 백그라운드 저장 태스크 실행, 종료 시 남은 로그 저장
+    await active_log_buffer.start()
+    # 캐시 백엔드: Redis 사용 시 다른 워커의 무효화 메시지 구독
+    await cache.start()
+    # 미디어 GC: 참조가 없어진 업로드 파일을 주기적으로 정리
+    await media_garbage_collector.start()
+    yield
+    await media_garbage_collector.stop()
+    await cache.close()
+    await active_log_buffer.stop()
+    password_hasher.shutdown()
+    image_derivatives.shutdown()
 
-models.Base.metadata.create_all(bind=engine)
 
 app = FastAPI(
     title="Novel Shorts API",
     description="Novel Shorts API Documentation",
     version="1.0.0",
     swagger_ui_parameters={"syntaxHighlight.theme": "obsidian"},
+    lifespan=lifespan,
 )
 
 # CORS 설정
@@ -27,6 +50,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[novel_router.NEXT_CURSOR_HEADER, admin_router.NEXT_WATERMARK_HEADER],
 )
 
 # 미들웨어
@@ -39,6 +63,7 @@ app.include_router(novel_router.app, tags=["novel"])
 app.include_router(comment_router.app, tags=["comment"])
 app.include_router(active_router, prefix="/user", tags=["user"])
 app.include_router(admin_router.app, tags=["admin"])
+app.include_router(media_router.app, tags=["media"])
 
 
 @app.get("/")
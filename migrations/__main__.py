@@ -0,0 +1,36 @@
+import argparse
+
+from database import engine
+from migrations.runner import get_current_version, get_pending_migrations, upgrade
+
+
+"""
+스키마 마이그레이션 명령 (앱 시작과 분리해 배포 시 한 번만 실행)
+
+    python -m migrations upgrade            # 최신 버전까지 적용
+    python -m migrations upgrade --target 2 # 2번까지만 적용
+    python -m migrations status             # 현재 버전과 미적용 목록
+"""
+
+
+def main():
+    parser = argparse.ArgumentParser(prog="python -m migrations")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    upgrade_parser = subparsers.add_parser("upgrade", help="미적용 마이그레이션 적용")
+    upgrade_parser.add_argument("--target", type=int, default=None, help="이 버전까지만 적용")
+    subparsers.add_parser("status", help="현재 버전과 미적용 마이그레이션 출력")
+    args = parser.parse_args()
+
+    if args.command == "upgrade":
+        applied = upgrade(engine, args.target)
+        for migration in applied:
+            print(f"applied {migration}")
+        print(f"current version: {get_current_version(engine)} ({len(applied)} applied)")
+    else:
+        print(f"current version: {get_current_version(engine)}")
+        for migration in get_pending_migrations(engine):
+            print(f"pending {migration}")
+
+
+if __name__ == "__main__":
+    main()
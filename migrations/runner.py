@@ -0,0 +1,108 @@
+import importlib
+from pathlib import Path
+import re
+from typing import List, NamedTuple, Optional, Set
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection, Engine
+
+
+"""
+버전 기반 스키마 마이그레이션 실행기
+- migrations/versions/NNNN_설명.py 파일을 번호 순으로 적용하고 schema_migrations 테이블에 기록
+- 각 버전 파일은 upgrade(connection)를 정의하고, 트랜잭션 밖에서 실행해야 하면(CONCURRENTLY 등)
+  TRANSACTIONAL = False 를 지정 (이 경우 재실행해도 안전하도록 작성)
+- 여러 곳에서 동시에 실행해도 advisory lock으로 한 번에 하나만 적용
+"""
+
+VERSIONS_DIR = Path(__file__).parent / "versions"
+VERSION_FILE_PATTERN = re.compile(r"^(\d{4})_(\w+)\.py$")
+MIGRATION_LOCK_KEY = 7_320_019  # pg_advisory_lock 키 (이 실행기 전용)
+
+
+class Migration(NamedTuple):
+    version: int
+    name: str
+    module: object
+
+    @property
+    def transactional(self) -> bool:
+        return getattr(self.module, "TRANSACTIONAL", True)
+
+    def __str__(self) -> str:
+        return f"{self.version:04d}_{self.name}"
+
+
+def load_migrations() -> List[Migration]:
+    migrations = []
+    for path in sorted(VERSIONS_DIR.iterdir()):
+        match = VERSION_FILE_PATTERN.match(path.name)
+        if match:
+            module = importlib.import_module(f"migrations.versions.{path.stem}")
+            migrations.append(Migration(int(match.group(1)), match.group(2), module))
+
+    versions = [migration.version for migration in migrations]
+    if len(set(versions)) != len(versions):
+        raise RuntimeError(f"마이그레이션 버전이 중복되었습니다: {versions}")
+    return migrations
+
+
+def ensure_migrations_table(connection: Connection) -> None:
+    connection.execute(
+        text(
+            "CREATE TABLE IF NOT EXISTS schema_migrations ("
+            "version INTEGER PRIMARY KEY, name TEXT NOT NULL, applied_at TIMESTAMP NOT NULL DEFAULT LOCALTIMESTAMP)"
+        )
+    )
+
+
+def get_applied_versions(connection: Connection) -> Set[int]:
+    exists = connection.execute(text("SELECT to_regclass('schema_migrations')")).scalar()
+    if exists is None:
+        return set()
+    return set(connection.execute(text("SELECT version FROM schema_migrations")).scalars())
+
+
+def get_pending_migrations(engine: Engine, target: Optional[int] = None) -> List[Migration]:
+    with engine.connect() as connection:
+        applied = get_applied_versions(connection)
+    return [
+        migration
+        for migration in load_migrations()
+        if migration.version not in applied and (target is None or migration.version <= target)
+    ]
+
+
+def _apply(connection: Connection, migration: Migration) -> None:
+    migration.module.upgrade(connection)
+    connection.execute(
+        text("INSERT INTO schema_migrations (version, name) VALUES (:version, :name)"),
+        {"version": migration.version, "name": migration.name},
+    )
+
+
+def upgrade(engine: Engine, target: Optional[int] = None) -> List[Migration]:
+    """아직 적용되지 않은 마이그레이션을 target 버전까지 순서대로 적용하고 적용한 목록을 반환"""
+    applied = []
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as lock_connection:
+        lock_connection.execute(text("SELECT pg_advisory_lock(:key)"), {"key": MIGRATION_LOCK_KEY})
+        try:
+            ensure_migrations_table(lock_connection)
+            # 잠금을 기다리는 동안 다른 실행기가 적용했을 수 있으므로 잠금 후에 대상 확인
+            for migration in get_pending_migrations(engine, target):
+                if migration.transactional:
+                    with engine.begin() as connection:
+                        _apply(connection, migration)
+                else:
+                    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as connection:
+                        _apply(connection, migration)
+                applied.append(migration)
+        finally:
+            lock_connection.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": MIGRATION_LOCK_KEY})
+    return applied
+
+
+def get_current_version(engine: Engine) -> Optional[int]:
+    with engine.connect() as connection:
+        applied = get_applied_versions(connection)
+    return max(applied) if applied else None
@@ -0,0 +1,75 @@
+from typing import Dict, Optional, Sequence, Set
+
+from sqlalchemy.engine import Connection
+
+
+"""
+마이그레이션 버전 파일에서 쓰는 스키마 변경 도우미
+- 이미 적용된 변경은 건너뛰므로 create_all로 만들어진 기존 DB에도 그대로 실행할 수 있음
+- 인덱스는 CREATE INDEX CONCURRENTLY로 만들어 운영 중에도 테이블 쓰기를 막지 않음 (AUTOCOMMIT 커넥션 필요)
+- 빌드에 실패해 INVALID로 남은 인덱스는 지우고 다시 만듦
+"""
+
+
+def get_indexes(connection: Connection) -> Dict[str, bool]:
+    """현재 스키마의 인덱스 이름 -> 유효(INVALID가 아님) 여부"""
+    rows = connection.exec_driver_sql(
+        "SELECT c.relname, i.indisvalid FROM pg_index i "
+        "JOIN pg_class c ON c.oid = i.indexrelid "
+        "JOIN pg_namespace n ON n.oid = c.relnamespace "
+        "WHERE n.nspname = current_schema()"
+    )
+    return dict(rows.all())
+
+
+def get_constraints(connection: Connection) -> Set[str]:
+    rows = connection.exec_driver_sql(
+        "SELECT c.conname FROM pg_constraint c "
+        "JOIN pg_namespace n ON n.oid = c.connamespace "
+        "WHERE n.nspname = current_schema()"
+    )
+    return set(rows.scalars())
+
+
+def create_index(
+    connection: Connection,
+    name: str,
+    table: str,
+    columns: Sequence[str],
+    where: Optional[str] = None,
+    unique: bool = False,
+) -> None:
+    indexes = get_indexes(connection)
+    if indexes.get(name):
+        return
+
+    preparer = connection.dialect.identifier_preparer
+    if name in indexes:
+        connection.exec_driver_sql(f"DROP INDEX CONCURRENTLY IF EXISTS {preparer.quote(name)}")
+    connection.exec_driver_sql(
+        f"CREATE {'UNIQUE ' if unique else ''}INDEX CONCURRENTLY {preparer.quote(name)} "
+        f"ON {preparer.quote(table)} ({', '.join(preparer.quote(column) for column in columns)})"
+        + (f" WHERE {where}" if where else "")
+    )
+
+
+def add_unique_constraint(
+    connection: Connection,
+    name: str,
+    table: str,
+    columns: Sequence[str],
+    deduplicate: Optional[str] = None,
+) -> None:
+    """중복 정리(deduplicate SQL) 후 유니크 인덱스를 만들고 ADD CONSTRAINT ... USING INDEX로 승격"""
+    if name in get_constraints(connection):
+        return
+
+    if deduplicate and not get_indexes(connection).get(name):
+        connection.exec_driver_sql(deduplicate)
+    create_index(connection, name, table, columns, unique=True)
+
+    preparer = connection.dialect.identifier_preparer
+    connection.exec_driver_sql(
+        f"ALTER TABLE {preparer.quote(table)} ADD CONSTRAINT {preparer.quote(name)} "
+        f"UNIQUE USING INDEX {preparer.quote(name)}"
+    )
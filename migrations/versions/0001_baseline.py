@@ -0,0 +1,110 @@
+from sqlalchemy.engine import Connection
+
+
+"""
+초기 스키마 (create_all로 만들어진 기존 DB에서는 이미 있는 테이블을 건너뜀)
+"""
+
+STATEMENTS = [
+    """CREATE TABLE IF NOT EXISTS novel (
+        no SERIAL NOT NULL,
+        source_platform_type SMALLINT,
+        source_id INTEGER,
+        source_url TEXT,
+        title VARCHAR(50),
+        author VARCHAR(50),
+        description TEXT,
+        genres SMALLINT[],
+        subtitle VARCHAR(100),
+        content TEXT,
+        cover_image TEXT,
+        chapters INTEGER,
+        views INTEGER,
+        recommends INTEGER,
+        created_date TIMESTAMP WITHOUT TIME ZONE,
+        last_uploaded_date TIMESTAMP WITHOUT TIME ZONE,
+        PRIMARY KEY (no)
+    )""",
+    """CREATE TABLE IF NOT EXISTS "user" (
+        no SERIAL NOT NULL,
+        id VARCHAR(10),
+        password VARCHAR(100),
+        name VARCHAR(10),
+        gender VARCHAR(1) NOT NULL,
+        age SMALLINT NOT NULL,
+        created_date TIMESTAMP WITHOUT TIME ZONE NOT NULL,
+        PRIMARY KEY (no)
+    )""",
+    """CREATE TABLE IF NOT EXISTS novel_shorts (
+        no SERIAL NOT NULL,
+        novel_no INTEGER,
+        form_type SMALLINT,
+        content TEXT,
+        image TEXT,
+        music TEXT,
+        views INTEGER,
+        likes INTEGER,
+        saves INTEGER,
+        comments INTEGER,
+        PRIMARY KEY (no),
+        FOREIGN KEY (novel_no) REFERENCES novel (no)
+    )""",
+    """CREATE TABLE IF NOT EXISTS comment (
+        no SERIAL NOT NULL,
+        novel_shorts_no INTEGER,
+        user_no INTEGER,
+        parent_no INTEGER,
+        created_date TIMESTAMP WITHOUT TIME ZONE NOT NULL,
+        is_del BOOLEAN NOT NULL,
+        content TEXT,
+        "like" INTEGER,
+        PRIMARY KEY (no),
+        FOREIGN KEY (novel_shorts_no) REFERENCES novel_shorts (no),
+        FOREIGN KEY (user_no) REFERENCES "user" (no),
+        FOREIGN KEY (parent_no) REFERENCES comment (no)
+    )""",
+    """CREATE TABLE IF NOT EXISTS user_save (
+        no SERIAL NOT NULL,
+        user_no INTEGER,
+        novel_no INTEGER,
+        novel_shorts_no INTEGER,
+        is_del BOOLEAN NOT NULL,
+        PRIMARY KEY (no),
+        FOREIGN KEY (user_no) REFERENCES "user" (no),
+        FOREIGN KEY (novel_no) REFERENCES novel (no),
+        FOREIGN KEY (novel_shorts_no) REFERENCES novel_shorts (no)
+    )""",
+    """CREATE TABLE IF NOT EXISTS user_active_log (
+        no SERIAL NOT NULL,
+        user_no INTEGER,
+        novel_no INTEGER,
+        novel_shorts_no INTEGER,
+        comment_no INTEGER,
+        active_type INTEGER,
+        acted_date TIMESTAMP WITHOUT TIME ZONE,
+        created_date TIMESTAMP WITHOUT TIME ZONE NOT NULL,
+        PRIMARY KEY (no),
+        FOREIGN KEY (user_no) REFERENCES "user" (no),
+        FOREIGN KEY (novel_no) REFERENCES novel (no),
+        FOREIGN KEY (novel_shorts_no) REFERENCES novel_shorts (no),
+        FOREIGN KEY (comment_no) REFERENCES comment (no)
+    )""",
+    """CREATE TABLE IF NOT EXISTS user_like (
+        no SERIAL NOT NULL,
+        user_no INTEGER,
+        novel_no INTEGER,
+        novel_shorts_no INTEGER,
+        comment_no INTEGER,
+        is_del BOOLEAN NOT NULL,
+        PRIMARY KEY (no),
+        FOREIGN KEY (user_no) REFERENCES "user" (no),
+        FOREIGN KEY (novel_no) REFERENCES novel (no),
+        FOREIGN KEY (novel_shorts_no) REFERENCES novel_shorts (no),
+        FOREIGN KEY (comment_no) REFERENCES comment (no)
+    )""",
+]
+
+
+def upgrade(connection: Connection) -> None:
+    for statement in STATEMENTS:
+        connection.exec_driver_sql(statement)
@@ -0,0 +1,36 @@
+from migrations.schema import add_unique_constraint
+from sqlalchemy.engine import Connection
+
+
+"""
+user_like/user_save 사용자당 숏츠 기록 1건 유니크 제약 (좋아요/저장 토글의 ON CONFLICT 대상)
+중복 기록은 활성 기록을 우선 남기고, 같으면 먼저 만들어진 기록을 남김
+중복으로 부풀었던 숏츠 카운터(likes/saves)는 남은 활성 기록 수로 다시 맞춤 (중복이 있던 숏츠만)
+"""
+
+TRANSACTIONAL = False
+
+COUNTERS = {"user_like": "likes", "user_save": "saves"}
+
+# CTE의 DELETE 결과는 같은 구문의 다른 부분에 보이지 않으므로, 지운 기록은 번호로 제외하고 셈
+DEDUPLICATE = """WITH removed AS (
+    DELETE FROM {table} a USING {table} b
+    WHERE a.user_no = b.user_no AND a.novel_shorts_no = b.novel_shorts_no AND (a.is_del, a.no) > (b.is_del, b.no)
+    RETURNING a.no, a.novel_shorts_no
+)
+UPDATE novel_shorts s SET {counter} = (
+    SELECT count(*) FROM {table} r
+    WHERE r.novel_shorts_no = s.no AND NOT r.is_del AND r.no NOT IN (SELECT no FROM removed)
+)
+WHERE s.no IN (SELECT novel_shorts_no FROM removed)"""
+
+
+def upgrade(connection: Connection) -> None:
+    for table, counter in COUNTERS.items():
+        add_unique_constraint(
+            connection,
+            f"uq_{table}_user_no_novel_shorts_no",
+            table,
+            ["user_no", "novel_shorts_no"],
+            deduplicate=DEDUPLICATE.format(table=table, counter=counter),
+        )
@@ -0,0 +1,16 @@
+from migrations.schema import create_index
+from sqlalchemy.engine import Connection
+
+
+"""
+증분 추출용 novel_shorts.updated_date 변경 추적 컬럼과 인덱스
+"""
+
+TRANSACTIONAL = False
+
+
+def upgrade(connection: Connection) -> None:
+    connection.exec_driver_sql(
+        "ALTER TABLE novel_shorts ADD COLUMN IF NOT EXISTS updated_date TIMESTAMP NOT NULL DEFAULT LOCALTIMESTAMP"
+    )
+    create_index(connection, "ix_novel_shorts_updated_date", "novel_shorts", ["updated_date"])
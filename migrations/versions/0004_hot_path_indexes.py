@@ -0,0 +1,42 @@
+from migrations.schema import add_unique_constraint, create_index
+from sqlalchemy.engine import Connection
+
+
+"""
+핫 쿼리 인덱스와 소설 원본 유니크 제약
+소설 중복은 숏츠/기록이 참조하고 있어 자동으로 합치지 않음 (실패하면 중복을 직접 정리한 뒤 다시 실행)
+"""
+
+TRANSACTIONAL = False
+
+
+def upgrade(connection: Connection) -> None:
+    create_index(connection, "ix_novel_shorts_novel_no", "novel_shorts", ["novel_no"])
+    create_index(connection, "ix_novel_source_id", "novel", ["source_id"])
+    create_index(
+        connection,
+        "ix_comment_novel_shorts_no_created_date",
+        "comment",
+        ["novel_shorts_no", "created_date", "no"],
+        where="is_del IS false",
+    )
+    create_index(
+        connection,
+        "ix_comment_parent_no_created_date",
+        "comment",
+        ["parent_no", "created_date", "no"],
+        where="is_del IS false",
+    )
+    create_index(
+        connection,
+        "ix_user_like_user_no_comment_no",
+        "user_like",
+        ["user_no", "comment_no"],
+        where="comment_no IS NOT NULL",
+    )
+    add_unique_constraint(
+        connection,
+        "uq_novel_source_platform_type_source_id",
+        "novel",
+        ["source_platform_type", "source_id"],
+    )
@@ -0,0 +1,37 @@
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+
+
+"""
+내용 주소 기반 미디어 저장소의 파일 참조 수 테이블
+기존 숏츠가 가리키는 업로드 파일(uploads/...)은 현재 참조 수로 채움
+"""
+
+
+def upgrade(connection: Connection) -> None:
+    connection.exec_driver_sql(
+        """CREATE TABLE IF NOT EXISTS media_file (
+            path TEXT PRIMARY KEY,
+            sha256 VARCHAR(64),
+            size BIGINT,
+            ref_count INTEGER NOT NULL DEFAULT 0,
+            touched_date TIMESTAMP NOT NULL DEFAULT LOCALTIMESTAMP
+        )"""
+    )
+    connection.exec_driver_sql(
+        "CREATE INDEX IF NOT EXISTS ix_media_file_unreferenced_touched_date "
+        "ON media_file (touched_date) WHERE ref_count <= 0"
+    )
+    connection.execute(
+        text(
+            """INSERT INTO media_file (path, ref_count)
+        SELECT path, count(*) FROM (
+            SELECT image AS path FROM novel_shorts
+            UNION ALL
+            SELECT music FROM novel_shorts
+        ) refs
+        WHERE path LIKE 'uploads/%'
+        GROUP BY path
+        ON CONFLICT (path) DO NOTHING"""
+        )
+    )
@@ -0,0 +1,20 @@
+from sqlalchemy.engine import Connection
+
+
+"""
+오프라인 적재(python -m loader)의 작업별 체크포인트 테이블
+"""
+
+
+def upgrade(connection: Connection) -> None:
+    connection.exec_driver_sql(
+        """CREATE TABLE IF NOT EXISTS bulk_load_checkpoint (
+            job TEXT PRIMARY KEY,
+            kind VARCHAR(10) NOT NULL,
+            position BIGINT NOT NULL DEFAULT 0,
+            created_rows BIGINT NOT NULL DEFAULT 0,
+            updated_rows BIGINT NOT NULL DEFAULT 0,
+            skipped_rows BIGINT NOT NULL DEFAULT 0,
+            updated_date TIMESTAMP NOT NULL DEFAULT LOCALTIMESTAMP
+        )"""
+    )
@@ -2,7 +2,21 @@ from datetime import datetime
 import enum
 
 from database import Base
-from sqlalchemy import ARRAY, SMALLINT, VARCHAR, Boolean, Column, DateTime, ForeignKey, Integer, Text
+from sqlalchemy import (
+    ARRAY,
+    SMALLINT,
+    VARCHAR,
+    BigInteger,
+    Boolean,
+    Column,
+    DateTime,
+    ForeignKey,
+    Index,
+    Integer,
+    Text,
+    UniqueConstraint,
+    func,
+)
 
 
 """
@@ -43,6 +57,9 @@ class UserSave(Base):
     novel_shorts_no = Column(Integer, ForeignKey("novel_shorts.no"))
     is_del = Column(Boolean, nullable=False, default=False)
 
+    # 사용자당 숏츠 저장 기록은 1건 (저장/취소는 is_del 토글, ON CONFLICT 대상)
+    __table_args__ = (UniqueConstraint("user_no", "novel_shorts_no", name="uq_user_save_user_no_novel_shorts_no"),)
+
 
 class UserLike(Base):
     __tablename__ = "user_like"
@@ -54,6 +71,14 @@ class UserLike(Base):
     comment_no = Column(Integer, ForeignKey("comment.no"), nullable=True)
     is_del = Column(Boolean, nullable=False, default=False)
 
+    # 사용자당 숏츠 좋아요 기록은 1건 (좋아요/취소는 is_del 토글, ON CONFLICT 대상)
+    # 피드의 좋아요 여부 확인(user_no + 페이지의 숏츠 번호)도 이 인덱스로 처리
+    # 댓글 좋아요 기록은 novel_shorts_no가 없으므로 (user_no, comment_no) 부분 인덱스로 조회
+    __table_args__ = (
+        UniqueConstraint("user_no", "novel_shorts_no", name="uq_user_like_user_no_novel_shorts_no"),
+        Index("ix_user_like_user_no_comment_no", user_no, comment_no, postgresql_where=comment_no.isnot(None)),
+    )
+
 
 class UserActiveLog(Base):
     __tablename__ = "user_active_log"
@@ -87,7 +112,7 @@ class Novel(Base):
 
     no = Column(Integer, primary_key=True, autoincrement=True)
     source_platform_type = Column(SMALLINT)
-    source_id = Column(Integer)
+    source_id = Column(Integer, index=True)  # 플랫폼 없이 source_id만으로 찾는 숏츠 등록/미디어 수정용
     # source_type = Column(SMALLINT)
     source_url = Column(Text)
     title = Column(VARCHAR(50))
@@ -103,6 +128,11 @@ class Novel(Base):
     created_date = Column(DateTime, nullable=True)
     last_uploaded_date = Column(DateTime, nullable=True)
 
+    # 원본 플랫폼의 작품당 소설 1건 (중복 등록 확인 및 적재 시 upsert 대상)
+    __table_args__ = (
+        UniqueConstraint("source_platform_type", "source_id", name="uq_novel_source_platform_type_source_id"),
+    )
+
 
 # class NovelChapter(Base):
 #     __tablename__ = "novel_chapter"
@@ -123,7 +153,7 @@ class NovelShorts(Base):
     __tablename__ = "novel_shorts"
 
     no = Column(Integer, primary_key=True, autoincrement=True)
-    novel_no = Column(Integer, ForeignKey("novel.no"))
+    novel_no = Column(Integer, ForeignKey("novel.no"), index=True)
     form_type = Column(SMALLINT)
     content = Column(Text)
     image = Column(Text)
@@ -132,6 +162,41 @@ class NovelShorts(Base):
     likes = Column(Integer, default=0)
     saves = Column(Integer, default=0)
     comments = Column(Integer, default=0)
+    # 증분 추출용 변경 추적 컬럼: 카운터/미디어 등 어떤 UPDATE든 트랜잭션 시작 시각으로 갱신
+    updated_date = Column(
+        DateTime,
+        nullable=False,
+        server_default=func.localtimestamp(),
+        onupdate=func.localtimestamp(),
+        index=True,
+    )
+
+
+class MediaFile(Base):
+    __tablename__ = "media_file"
+
+    # 업로드 파일은 내용 해시로 저장하므로 같은 파일은 경로가 같음 (NovelShorts.image/music 값)
+    path = Column(Text, primary_key=True)
+    sha256 = Column(VARCHAR(64), nullable=True)  # 내용 주소 저장 이전에 올라온 파일은 NULL
+    size = Column(BigInteger, nullable=True)
+    ref_count = Column(Integer, nullable=False, default=0, server_default="0")  # 이 경로를 쓰는 숏츠 image/music 수
+    touched_date = Column(DateTime, nullable=False, server_default=func.localtimestamp())  # 마지막 업로드/참조 변경
+
+    # 참조가 없어진 뒤 유예 시간이 지난 파일만 골라 지우는 GC용 부분 인덱스
+    __table_args__ = (Index("ix_media_file_unreferenced_touched_date", touched_date, postgresql_where=ref_count <= 0),)
+
+
+class BulkLoadCheckpoint(Base):
+    __tablename__ = "bulk_load_checkpoint"
+
+    # 오프라인 적재(python -m loader) 작업별 진행 위치. 배치 적재와 같은 트랜잭션에서 갱신
+    job = Column(Text, primary_key=True)  # 작업 이름 (기본값: <적재 대상>:<파일 이름>)
+    kind = Column(VARCHAR(10), nullable=False)  # novels | shorts
+    position = Column(BigInteger, nullable=False, default=0, server_default="0")  # 적재를 마친 마지막 레코드 번호
+    created_rows = Column(BigInteger, nullable=False, default=0, server_default="0")
+    updated_rows = Column(BigInteger, nullable=False, default=0, server_default="0")
+    skipped_rows = Column(BigInteger, nullable=False, default=0, server_default="0")
+    updated_date = Column(DateTime, nullable=False, server_default=func.localtimestamp())
 
 
 class Comment(Base):
@@ -146,6 +211,20 @@ class Comment(Base):
     content = Column(Text)
     like = Column(Integer, default=0)
 
+    # 삭제되지 않은 댓글만 작성순으로 탐색하는 부분 인덱스 (목록 조건의 is_del IS false와 같은 식이어야 사용됨)
+    # - 숏츠별 댓글 페이지/소설 상세의 댓글 조회
+    # - 답글 페이지, 답글 미리보기, 답글 수 계산
+    __table_args__ = (
+        Index(
+            "ix_comment_novel_shorts_no_created_date",
+            novel_shorts_no,
+            created_date,
+            no,
+            postgresql_where=is_del.is_(False),
+        ),
+        Index("ix_comment_parent_no_created_date", parent_no, created_date, no, postgresql_where=is_del.is_(False)),
+    )
+
 
 class ActiveType(enum.Enum):
     VIEW_START = 1  # 시청 시작
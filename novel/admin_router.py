@@ -1,27 +1,42 @@
+from datetime import datetime
 import os
 from pathlib import Path
-from typing import Optional
-from uuid import uuid4
+from typing import Literal, Optional, Tuple
 
 from database import get_db
 from dotenv import load_dotenv
-from fastapi import APIRouter, Depends, Form, HTTPException, UploadFile
-from fastapi.responses import PlainTextResponse
-from models import NovelShorts
+from fastapi import APIRouter, Depends, File, Form, HTTPException, Query, UploadFile
+from fastapi.responses import StreamingResponse
+from novel.image_derivatives import image_derivatives
+from novel.media_store import SavedFile, UploadTooLarge, media_garbage_collector, store_media
 from novel.novel_query import (
+    COLUMNAR_EXPORT_FORMATS,
+    bulk_create_novel_shorts,
+    bulk_upsert_novels,
     create_novel,
     create_novel_shorts,
+    get_export_watermark,
     get_novel_detail,
-    get_novel_shorts_csv,
+    has_novel_shorts,
+    stream_novel_shorts_columnar,
+    stream_novel_shorts_csv,
+    update_shorts_media,
 )
 from novel.novel_schema import (
+    BulkIngestResponse,
+    NovelBulkCreateWithAdmin,
     NovelCreateWithAdmin,
     NovelDetailResponse,
     NovelResponse,
+    NovelShortsBulkCreateWithAdmin,
     NovelShortsCreateWithAdmin,
     NovelShortsResponse,
 )
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+from user.password_hasher import password_hasher
+from utils.cache import cache
+from utils.pagination import decode_cursor, encode_cursor
+from utils.serialization import fast_response
 
 
 # 현재 파일의 디렉토리를 기준으로 .env 파일 경로 설정
@@ -32,50 +47,48 @@ ADMIN_CODE = os.getenv("ADMIN_CODE", "admin_code")
 
 app = APIRouter(prefix="/admin")
 
-# 파일 저장 경로 설정
-UPLOAD_DIR = Path(__file__).parent.parent / "uploads"
-MUSIC_DIR = UPLOAD_DIR / "music"
-IMAGE_DIR = UPLOAD_DIR / "images"
-MUSIC_DIR.mkdir(parents=True, exist_ok=True)
-IMAGE_DIR.mkdir(parents=True, exist_ok=True)
+# 업로드 허용 형식/크기 (파일은 media_store에 내용 해시 경로로 저장)
+ALLOWED_EXTENSIONS = {"music": {".mp3", ".wav", ".ogg"}, "image": {".jpg", ".jpeg", ".png", ".gif"}}
+MAX_UPLOAD_SIZE = {
+    "music": int(os.getenv("MAX_MUSIC_UPLOAD_SIZE", str(100 * 1024 * 1024))),  # 100MB
+    "image": int(os.getenv("MAX_IMAGE_UPLOAD_SIZE", str(10 * 1024 * 1024))),  # 10MB
+}
+BULK_INGEST_MAX_RECORDS = int(os.getenv("BULK_INGEST_MAX_RECORDS", "5000"))  # 일괄 적재 요청당 최대 레코드 수
 
 
-async def save_file(file: UploadFile, file_type: str) -> str:
-    """파일을 저장하고 저장된 경로를 반환"""
+async def save_file(db: AsyncSession, file: UploadFile, file_type: str) -> Optional[SavedFile]:
+    """파일을 청크 단위로 저장하고 저장 결과(경로/크기/해시)를 반환 (같은 내용은 기존 파일 재사용)"""
     if not file:
-        return ""  # 파일이 없으면 빈 문자열 반환
+        return None  # 파일이 없으면 저장하지 않음
 
     # 파일 확장자 검증
-    allowed_extensions = {"music": {".mp3", ".wav", ".ogg"}, "image": {".jpg", ".jpeg", ".png", ".gif"}}
     file_ext = Path(file.filename).suffix.lower()
 
-    if file_ext not in allowed_extensions[file_type]:
+    if file_ext not in ALLOWED_EXTENSIONS[file_type]:
         raise HTTPException(status_code=400, detail=f"지원하지 않는 {file_type} 파일 형식입니다")
 
-    # 저장 디렉토리 선택
-    save_dir = MUSIC_DIR if file_type == "music" else IMAGE_DIR
+    # 크기를 알 수 있으면 쓰기 전에 거절 (모르는 경우에도 저장 중에 제한 확인)
+    max_size = MAX_UPLOAD_SIZE[file_type]
+    if file.size is not None and file.size > max_size:
+        raise HTTPException(status_code=413, detail=f"{file_type} 파일은 {max_size} 바이트를 넘을 수 없습니다")
 
-    # 고유한 파일명 생성
-    unique_filename = f"{uuid4()}{file_ext}"
-    file_path = save_dir / unique_filename
-
-    # 파일 저장
+    # 파일 저장: 전체를 메모리에 올리지 않고, 이벤트 루프를 막지 않도록 스레드에서 청크 단위로 복사
     try:
-        contents = await file.read()
-        with open(file_path, "wb") as f:
-            f.write(contents)
-        return str(file_path.relative_to(Path(__file__).parent.parent))
+        await file.seek(0)
+        return await store_media(db, file.file, file_type, file_ext, max_size)
+    except UploadTooLarge:
+        raise HTTPException(status_code=413, detail=f"{file_type} 파일은 {max_size} 바이트를 넘을 수 없습니다")
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"파일 저장 중 오류 발생: {str(e)}")
 
 
 @app.post("/novel", response_model=NovelResponse, description="[관리자] 소설 생성")
-async def create_novel_endpoint(request: NovelCreateWithAdmin, db: Session = Depends(get_db)):
+async def create_novel_endpoint(request: NovelCreateWithAdmin, db: AsyncSession = Depends(get_db)):
     # 관리자 코드 검증
     if request.admin_code != ADMIN_CODE:
         raise HTTPException(status_code=403, detail="잘못된 관리자 코드입니다")
 
-    result = create_novel(db, request.novel_data)
+    result = await create_novel(db, request.novel_data)
     if not result.success:
         raise HTTPException(status_code=400, detail=result.message)
     return result
@@ -85,42 +98,90 @@ def verify_admin_code(code: str) -> bool:
     return code == ADMIN_CODE
 
 
+def default_music_path(novel_id: int) -> str:
+    return f"https://storage.googleapis.com/hackathon-s3/music/{novel_id}.wav"
+
+
 @app.post("/shorts", response_model=NovelShortsResponse, description="[관리자] 숏츠 생성")
-async def create_shorts_endpoint(shorts_data: NovelShortsCreateWithAdmin, db: Session = Depends(get_db)):
+async def create_shorts_endpoint(shorts_data: NovelShortsCreateWithAdmin, db: AsyncSession = Depends(get_db)):
     # 관리자 코드 검증
     if not verify_admin_code(shorts_data.admin_code):
         raise HTTPException(status_code=403, detail="관리자 권한이 없습니다")
 
     # 음악 파일 처리
-    music_path = f"https://storage.googleapis.com/hackathon-s3/music/{shorts_data.shorts_data.novel_id}.wav"
+    music_path = default_music_path(shorts_data.shorts_data.novel_id)
     if shorts_data.music_file:
         raise HTTPException(status_code=500, detail="TODO: 음악 업로드 기능 추가 필요")
 
     # 숏츠 생성
-    result = create_novel_shorts(db, shorts_data.shorts_data, music_path)
+    result = await create_novel_shorts(db, shorts_data.shorts_data, music_path)
     if not result.success:
         raise HTTPException(status_code=400, detail=result.message)
 
     return result
 
 
-async def process_media_files(shorts: NovelShorts, image_file: Optional[UploadFile], music_file: Optional[UploadFile]):
-    """미디어 파일 처리 및 저장"""
-    music_path = None
-    image_path = None
-    old_paths = []
+@app.post(
+    "/novels/bulk", response_model=BulkIngestResponse, description="[관리자] 소설 일괄 적재 (원본 작품 기준 upsert)"
+)
+async def bulk_create_novels_endpoint(request: NovelBulkCreateWithAdmin, db: AsyncSession = Depends(get_db)):
+    if request.admin_code != ADMIN_CODE:
+        raise HTTPException(status_code=403, detail="잘못된 관리자 코드입니다")
+    if len(request.novels) > BULK_INGEST_MAX_RECORDS:
+        raise HTTPException(status_code=413, detail=f"한 번에 {BULK_INGEST_MAX_RECORDS}건까지 적재할 수 있습니다")
+
+    result = await bulk_upsert_novels(db, request.novels)
+    if not result.success:
+        raise HTTPException(status_code=400, detail=result.message)
+    return fast_response(result, BulkIngestResponse)
+
+
+@app.post("/shorts/bulk", response_model=BulkIngestResponse, description="[관리자] 숏츠 일괄 적재")
+async def bulk_create_shorts_endpoint(request: NovelShortsBulkCreateWithAdmin, db: AsyncSession = Depends(get_db)):
+    if not verify_admin_code(request.admin_code):
+        raise HTTPException(status_code=403, detail="관리자 권한이 없습니다")
+    if len(request.shorts) > BULK_INGEST_MAX_RECORDS:
+        raise HTTPException(status_code=413, detail=f"한 번에 {BULK_INGEST_MAX_RECORDS}건까지 적재할 수 있습니다")
+
+    music_paths = [default_music_path(shorts_data.novel_id) for shorts_data in request.shorts]
+    result = await bulk_create_novel_shorts(db, request.shorts, music_paths)
+    if not result.success:
+        raise HTTPException(status_code=400, detail=result.message)
+    return fast_response(result, BulkIngestResponse)
+
 
-    if music_file and music_file.filename:
-        music_path = await save_file(music_file, "music")
-        if shorts.music:
-            old_paths.append(shorts.music)
+@app.put(
+    "/shorts/{shorts_no}/media", response_model=NovelShortsResponse, description="[관리자] 숏츠 이미지/음악 업로드"
+)
+async def upload_shorts_media_endpoint(
+    shorts_no: int,
+    admin_code: str = Form(...),
+    image_file: Optional[UploadFile] = File(default=None),
+    music_file: Optional[UploadFile] = File(default=None),
+    db: AsyncSession = Depends(get_db),
+):
+    if not verify_admin_code(admin_code):
+        raise HTTPException(status_code=403, detail="관리자 권한이 없습니다")
 
-    if image_file and image_file.filename:
-        image_path = await save_file(image_file, "image")
-        if shorts.image:
-            old_paths.append(shorts.image)
+    # 저장만 되고 숏츠에 연결되지 못한 파일은 참조 수가 0으로 남아 GC가 정리
+    saved = {}
+    for file_type, file in (("image", image_file), ("music", music_file)):
+        if file and file.filename:
+            saved[file_type] = await save_file(db, file, file_type)
+
+    result = await update_shorts_media(
+        db,
+        shorts_no,
+        image=saved["image"].path if "image" in saved else None,
+        music=saved["music"].path if "music" in saved else None,
+    )
+    if not result.success:
+        raise HTTPException(status_code=400, detail=result.message)
 
-    return music_path, image_path, old_paths
+    # 피드/상세 응답이 가리키는 썸네일/피드 크기 WebP를 미리 생성 (응답은 기다리지 않음)
+    if "image" in saved:
+        image_derivatives.schedule(saved["image"].path)
+    return result
 
 
 # @app.put("/shorts/media", response_model=NovelShortsResponse, description="[관리자] 숏츠 미디어 업데이트")
@@ -159,35 +220,109 @@ async def process_media_files(shorts: NovelShorts, image_file: Optional[UploadFi
 async def read_novel_detail(
     novel_no: int,
     admin_code: str = Form(...),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
 ):
     if admin_code != ADMIN_CODE:
         raise HTTPException(status_code=403, detail="잘못된 관리자 코드입니다")
 
-    result = get_novel_detail(db, novel_no)
+    result = await get_novel_detail(db, novel_no)
     if isinstance(result, dict) and "error" in result:
         raise HTTPException(status_code=400, detail=result["msg"])
     return result
 
 
+NEXT_WATERMARK_HEADER = "X-Next-Watermark"
+SINCE_QUERY = Query(
+    default=None, description="이전 추출 응답의 X-Next-Watermark 값 (지정 시 그 이후 변경된 숏츠만 추출)"
+)
+
+
+async def prepare_export(admin_code: str, since: Optional[str], db: AsyncSession) -> Tuple[Optional[datetime], dict]:
+    """관리자 코드/기준값을 검증하고 (변경 기준 시각, 다음 기준값 헤더)를 반환"""
+    if admin_code != ADMIN_CODE:
+        raise HTTPException(status_code=403, detail="잘못된 관리자 코드입니다")
+
+    changed_since = None
+    if since:
+        try:
+            changed_since = datetime.fromisoformat(decode_cursor(since)[0])
+        except (ValueError, TypeError):
+            raise HTTPException(status_code=400, detail="올바르지 않은 기준값입니다")
+
+    # 전체 추출만 빈 경우 404, 증분 추출은 변경이 없어도 다음 기준값을 돌려줌
+    if changed_since is None and not await has_novel_shorts(db):
+        raise HTTPException(status_code=404, detail="데이터가 없습니다")
+
+    watermark = await get_export_watermark(db)
+    return changed_since, {NEXT_WATERMARK_HEADER: encode_cursor(watermark.isoformat())}
+
+
 @app.get(
     "/novel/export/csv",
-    response_class=PlainTextResponse,
+    response_class=StreamingResponse,
     description="[관리자] 소설 및 숏츠 데이터 CSV 추출",
 )
 async def export_novel_shorts_csv(
     admin_code: str,
-    db: Session = Depends(get_db),
+    since: Optional[str] = SINCE_QUERY,
+    # 응답 스트리밍이 끝날 때까지 세션(서버 사이드 커서)을 유지해야 하므로 request 범위로 지정
+    db: AsyncSession = Depends(get_db, scope="request"),
+):
+    changed_since, headers = await prepare_export(admin_code, since, db)
+    return StreamingResponse(
+        stream_novel_shorts_csv(db, changed_since=changed_since),
+        media_type="text/csv",
+        headers={"Content-Disposition": "attachment;filename=novel_shorts_data.csv", **headers},
+    )
+
+
+@app.get(
+    "/novel/export/{file_format}",
+    response_class=StreamingResponse,
+    description="[관리자] 소설 및 숏츠 데이터 컬럼형(Arrow IPC 스트림/Parquet) 추출",
+)
+async def export_novel_shorts_columnar(
+    file_format: Literal["arrow", "parquet"],
+    admin_code: str,
+    since: Optional[str] = SINCE_QUERY,
+    db: AsyncSession = Depends(get_db, scope="request"),
 ):
+    changed_since, headers = await prepare_export(admin_code, since, db)
+    media_type, extension = COLUMNAR_EXPORT_FORMATS[file_format]
+    return StreamingResponse(
+        stream_novel_shorts_columnar(db, file_format, changed_since=changed_since),
+        media_type=media_type,
+        headers={"Content-Disposition": f"attachment;filename=novel_shorts_data.{extension}", **headers},
+    )
+
+
+@app.get("/cache/stats", description="[관리자] 캐시 적중/미스/제거 통계")
+async def read_cache_stats(admin_code: str):
     if admin_code != ADMIN_CODE:
         raise HTTPException(status_code=403, detail="잘못된 관리자 코드입니다")
 
-    csv_content, data = get_novel_shorts_csv(db)
-    if not csv_content:
-        raise HTTPException(status_code=404, detail="데이터가 없습니다")
+    return cache.stats()
 
-    return PlainTextResponse(
-        content=csv_content,
-        media_type="text/csv",
-        headers={"Content-Disposition": "attachment;filename=novel_shorts_data.csv"},
-    )
+
+@app.get("/password/stats", description="[관리자] 비밀번호 해시 워커 풀 대기열 통계")
+async def read_password_pool_stats(admin_code: str):
+    if admin_code != ADMIN_CODE:
+        raise HTTPException(status_code=403, detail="잘못된 관리자 코드입니다")
+
+    return password_hasher.stats()
+
+
+@app.get("/media/stats", description="[관리자] 미디어 저장소 GC 통계")
+async def read_media_gc_stats(admin_code: str):
+    if admin_code != ADMIN_CODE:
+        raise HTTPException(status_code=403, detail="잘못된 관리자 코드입니다")
+
+    return media_garbage_collector.stats()
+
+
+@app.get("/images/stats", description="[관리자] 이미지 파생본 생성 프로세스 풀 통계")
+async def read_image_pool_stats(admin_code: str):
+    if admin_code != ADMIN_CODE:
+        raise HTTPException(status_code=403, detail="잘못된 관리자 코드입니다")
+
+    return image_derivatives.stats()
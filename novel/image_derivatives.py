@@ -0,0 +1,155 @@
+import asyncio
+from concurrent.futures import ProcessPoolExecutor
+import multiprocessing
+import os
+from typing import Dict, Optional, Set
+
+from novel import media_store
+from utils.image_processing import render_variants
+
+
+"""
+업로드 이미지 파생본(썸네일/피드 크기 WebP) 생성
+- 디코딩/리사이즈/인코딩은 CPU를 오래 쓰므로 별도 프로세스 풀에서 실행 (GIL과 이벤트 루프에 영향 없음)
+- 파생본 경로는 원본 해시와 너비로 정해지므로(media_store.derivative_path) 응답에는 생성 여부와 관계없이 URL을 넣고,
+  업로드 직후 미리 만들어 두며 아직 없는 URL이 요청되면 그때 생성 (같은 원본의 동시 요청은 한 번만 생성)
+- 대기 + 실행 중인 작업이 max_pending을 넘으면 ImageDerivativesBusy (업로드 직후 생성은 건너뛰고 요청 시 생성)
+"""
+
+IMAGE_VARIANTS = {
+    "thumb": int(os.getenv("IMAGE_THUMB_WIDTH", "320")),
+    "feed": int(os.getenv("IMAGE_FEED_WIDTH", "1080")),
+}
+IMAGE_WEBP_QUALITY = int(os.getenv("IMAGE_WEBP_QUALITY", "80"))
+IMAGE_WORKERS = int(os.getenv("IMAGE_WORKERS", str(max(1, (os.cpu_count() or 2) - 1))))
+IMAGE_MAX_PENDING = int(os.getenv("IMAGE_MAX_PENDING", str(IMAGE_WORKERS * 8)))
+IMAGE_WORKER_NICE = int(os.getenv("IMAGE_WORKER_NICE", "10"))
+
+
+class ImageDerivativesBusy(Exception):
+    """파생본 생성 대기열이 가득 참"""
+
+
+def image_variants(path: Optional[str]) -> Optional[Dict[str, str]]:
+    """응답에 넣을 파생본 경로 (내용 주소로 저장된 업로드 이미지만, 나머지는 None)"""
+    sha256 = media_store.content_hash(path)
+    if sha256 is None or not path.startswith(f"{media_store.UPLOAD_DIR.name}/{media_store.MEDIA_SUBDIRS['image']}/"):
+        return None
+    return {name: media_store.derivative_path(sha256, width) for name, width in IMAGE_VARIANTS.items()}
+
+
+def _init_worker(nice: int) -> None:
+    if nice > 0:
+        try:
+            os.nice(nice)
+        except OSError:
+            pass
+
+
+class ImageDerivativePool:
+    def __init__(
+        self,
+        workers: int = IMAGE_WORKERS,
+        max_pending: int = IMAGE_MAX_PENDING,
+        quality: int = IMAGE_WEBP_QUALITY,
+        worker_nice: int = IMAGE_WORKER_NICE,
+    ):
+        self.workers = workers
+        self.max_pending = max_pending
+        self.quality = quality
+        self.worker_nice = worker_nice
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self._scheduled: Set[asyncio.Task] = set()
+
+        self.completed = 0
+        self.failed = 0
+        self.rejected = 0
+        self.bytes_written = 0
+
+    @property
+    def executor(self) -> ProcessPoolExecutor:
+        # 실제로 이미지 작업이 있을 때 워커 프로세스 생성 (spawn: 스레드가 있는 앱 프로세스를 fork하지 않음)
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker,
+                initargs=(self.worker_nice,),
+            )
+        return self._executor
+
+    async def _render(self, source_path: str, sha256: str) -> Dict[str, int]:
+        outputs = [
+            (width, str(media_store.MEDIA_ROOT / media_store.derivative_path(sha256, width)))
+            for width in IMAGE_VARIANTS.values()
+        ]
+        source = str(media_store.MEDIA_ROOT / source_path)
+        try:
+            sizes = await asyncio.get_running_loop().run_in_executor(
+                self.executor, render_variants, source, outputs, self.quality
+            )
+        except Exception:
+            self.failed += 1
+            raise
+        self.completed += 1
+        self.bytes_written += sum(sizes.values())
+        return sizes
+
+    def _forget(self, sha256: str, finished: asyncio.Future) -> None:
+        self._inflight.pop(sha256, None)
+        if not finished.cancelled():
+            finished.exception()  # 기다리던 요청이 모두 취소됐어도 "exception was never retrieved" 경고가 나지 않도록
+
+    async def ensure(self, source_path: str) -> Dict[str, int]:
+        """원본 이미지의 모든 파생본을 만들고(이미 있으면 건너뜀) 파생본 경로별 크기 반환"""
+        sha256 = media_store.content_hash(source_path)
+        if sha256 is None:
+            raise ValueError(f"내용 주소 경로가 아닙니다: {source_path}")
+
+        future = self._inflight.get(sha256)
+        if future is None:
+            if len(self._inflight) >= self.max_pending:
+                self.rejected += 1
+                raise ImageDerivativesBusy()
+            future = asyncio.ensure_future(self._render(source_path, sha256))
+            self._inflight[sha256] = future
+            future.add_done_callback(lambda finished: self._forget(sha256, finished))
+        # 기다리던 요청이 취소돼도 같은 원본을 기다리는 다른 요청을 위해 생성은 계속
+        return await asyncio.shield(future)
+
+    def schedule(self, source_path: str) -> None:
+        """업로드 직후 백그라운드로 파생본 생성 (대기열이 가득하면 요청 시 생성으로 미룸)"""
+        if image_variants(source_path) is None:
+            return
+
+        async def run():
+            try:
+                await self.ensure(source_path)
+            except ImageDerivativesBusy:
+                pass
+            except Exception as e:
+                print(f"Error in ImageDerivativePool.schedule: {str(e)}")
+
+        task = asyncio.create_task(run())
+        self._scheduled.add(task)
+        task.add_done_callback(self._scheduled.discard)
+
+    def stats(self) -> dict:
+        return {
+            "workers": self.workers,
+            "max_pending": self.max_pending,
+            "pending": len(self._inflight),
+            "completed": self.completed,
+            "failed": self.failed,
+            "rejected": self.rejected,
+            "bytes_written": self.bytes_written,
+        }
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+
+
+image_derivatives = ImageDerivativePool()
@@ -0,0 +1,115 @@
+import os
+from pathlib import Path
+import re
+import stat
+from typing import Optional, Tuple
+
+from fastapi import APIRouter, HTTPException, Request, Response
+from novel import media_store
+from novel.image_derivatives import IMAGE_VARIANTS, ImageDerivativesBusy, image_derivatives
+from starlette.responses import FileResponse
+
+
+"""
+업로드 미디어(uploads/...) 제공
+- DB에 저장된 상대 경로(uploads/music/ab/<sha256>.wav)가 그대로 URL 경로가 됨
+- Range 요청(음악 탐색)과 If-Range는 FileResponse가 처리하고, If-None-Match가 맞으면 본문 없이 304
+- 내용 주소 파일은 파일명의 SHA-256을 강한 ETag로 쓰고 immutable로 캐시 (내용이 바뀌면 경로가 바뀜)
+- 이미지 파생본(derived/<해시>_<너비>.webp)이 아직 없으면 원본에서 생성한 뒤 제공
+- 서버가 http.response.pathsend 확장을 지원하면 FileResponse가 파일 경로만 넘겨 서버가 sendfile로 전송
+  MEDIA_ACCEL_REDIRECT를 설정하면 본문 대신 X-Accel-Redirect 헤더만 보내 nginx가 sendfile/Range로 전송
+"""
+
+MEDIA_CACHE_MAX_AGE = int(os.getenv("MEDIA_CACHE_MAX_AGE", str(365 * 24 * 3600)))  # 초, 내용 주소 파일용
+# nginx internal location 접두사 (예: /_media/ → alias <프로젝트>/uploads/). 비어 있으면 앱이 직접 전송
+MEDIA_ACCEL_REDIRECT = os.getenv("MEDIA_ACCEL_REDIRECT", "")
+
+CONTENT_ADDRESSED_NAME = re.compile(r"^[0-9a-f]{64}$")
+DERIVED_FILE_PATH = re.compile(rf"^{media_store.DERIVED_SUBDIR}/[0-9a-f]{{2}}/([0-9a-f]{{64}})_(\d+)\.webp$")
+
+app = APIRouter(prefix=f"/{media_store.UPLOAD_DIR.name}")
+
+
+def resolve_media_file(file_path: str) -> Optional[Tuple[Path, os.stat_result]]:
+    """URL 경로를 업로드 디렉토리 안의 일반 파일로 변환 (디렉토리 밖, 임시 파일, 없는 파일은 None)"""
+    root = media_store.UPLOAD_DIR.resolve()
+    path = (root / file_path).resolve()
+    if not path.is_relative_to(root) or path == root or path.relative_to(root).parts[0] == media_store.TEMP_SUBDIR:
+        return None
+    if path.suffix == ".tmp":  # 생성 중인 파생본
+        return None
+    try:
+        stat_result = path.stat()
+    except (FileNotFoundError, NotADirectoryError):
+        return None
+    if not stat.S_ISREG(stat_result.st_mode):
+        return None
+    return path, stat_result
+
+
+def is_content_addressed(path: Path) -> bool:
+    return bool(CONTENT_ADDRESSED_NAME.match(path.stem)) and path.parent.name == path.stem[:2]
+
+
+def is_derivative(path: Path) -> bool:
+    return path.parent.parent.name == media_store.DERIVED_SUBDIR
+
+
+async def create_missing_derivative(file_path: str) -> bool:
+    """요청한 파생본이 설정된 크기이고 원본 이미지가 있으면 생성 (생성 못 하면 False)"""
+    match = DERIVED_FILE_PATH.match(file_path)
+    if match is None or int(match.group(2)) not in IMAGE_VARIANTS.values():
+        return False
+    source_path = media_store.find_image_source(match.group(1))
+    if source_path is None:
+        return False
+    try:
+        await image_derivatives.ensure(source_path)
+    except ImageDerivativesBusy:
+        raise HTTPException(status_code=503, detail="이미지를 준비 중입니다", headers={"Retry-After": "1"})
+    except Exception as e:
+        print(f"Error in create_missing_derivative: {str(e)}")
+        return False
+    return True
+
+
+def media_etag(path: Path, stat_result: os.stat_result) -> str:
+    if is_content_addressed(path):
+        # 파일명이 곧 내용 해시라 워커/서버가 달라도, 파일을 다시 복사해도 같은 값
+        return f'"{path.stem}"'
+    return f'"{stat_result.st_mtime_ns:x}-{stat_result.st_size:x}"'
+
+
+def matches_if_none_match(if_none_match: str, etag: str) -> bool:
+    """If-None-Match는 약한 비교 (W/ 접두사 무시)"""
+    if if_none_match.strip() == "*":
+        return True
+    return etag in [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+
+
+@app.api_route("/{file_path:path}", methods=["GET", "HEAD"], description="미디어 - 업로드 파일 제공")
+async def serve_media(file_path: str, request: Request):
+    resolved = resolve_media_file(file_path)
+    if resolved is None and await create_missing_derivative(file_path):
+        resolved = resolve_media_file(file_path)
+    if resolved is None:
+        raise HTTPException(status_code=404, detail="존재하지 않는 파일입니다")
+    path, stat_result = resolved
+
+    etag = media_etag(path, stat_result)
+    if is_content_addressed(path) or is_derivative(path):
+        # 파생본도 원본 해시와 크기로 경로가 정해져 바뀌지 않음
+        cache_control = f"public, max-age={MEDIA_CACHE_MAX_AGE}, immutable"
+    else:
+        cache_control = "public, no-cache"  # 예전 파일명은 내용이 바뀔 수 있어 매번 ETag로 재검증
+    headers = {"etag": etag, "cache-control": cache_control}
+
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None and matches_if_none_match(if_none_match, etag):
+        return Response(status_code=304, headers=headers)
+
+    if MEDIA_ACCEL_REDIRECT:
+        relative = path.relative_to(media_store.UPLOAD_DIR.resolve()).as_posix()
+        return Response(headers={**headers, "x-accel-redirect": f"{MEDIA_ACCEL_REDIRECT.rstrip('/')}/{relative}"})
+
+    return FileResponse(path, headers=headers, stat_result=stat_result)
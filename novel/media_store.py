@@ -0,0 +1,320 @@
+import asyncio
+from collections import Counter
+from datetime import timedelta
+import hashlib
+import os
+from pathlib import Path
+import time
+from typing import BinaryIO, Dict, Iterable, List, NamedTuple, Optional
+from uuid import uuid4
+
+from database import async_engine
+from models import MediaFile
+from sqlalchemy import bindparam, func, select, text, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+
+
+"""
+내용 주소(content-addressed) 기반 업로드 미디어 저장소
+- 업로드는 임시 파일로 청크 단위 복사하면서 SHA-256을 계산하고, uploads/<종류>/<해시 앞 2자리>/<해시><확장자>로 옮김
+  같은 내용이 이미 있으면 임시 파일만 지우고 기존 경로를 그대로 사용 (중복 저장 없음)
+- media_file.ref_count는 그 경로를 가리키는 NovelShorts.image/music 수로, 숏츠 미디어를 바꾸는 트랜잭션에서 함께 갱신
+- 백그라운드 GC가 참조가 없어진 뒤 유예 시간이 지난 파일과, DB 기록 없이 디스크에만 남은 파일을 지움
+- 이미지 파생본(썸네일 등)은 uploads/derived/<해시 앞 2자리>/<원본 해시>_<너비>.webp 로, 원본이 지워지면 GC가 함께 정리
+- 같은 경로의 등록(업로드)과 삭제(GC)는 경로별 advisory lock으로 직렬화해, 지우는 중인 파일을 재사용하지 않음
+"""
+
+MEDIA_ROOT = Path(__file__).parent.parent  # DB에는 이 디렉토리 기준 상대 경로(uploads/...)를 저장
+UPLOAD_DIR = MEDIA_ROOT / "uploads"
+MEDIA_SUBDIRS = {"music": "music", "image": "images"}
+TEMP_SUBDIR = "tmp"
+DERIVED_SUBDIR = "derived"
+UPLOAD_CHUNK_SIZE = int(os.getenv("UPLOAD_CHUNK_SIZE", str(1024 * 1024)))  # 한 번에 읽고 쓰는 크기
+
+MEDIA_GC_INTERVAL = float(os.getenv("MEDIA_GC_INTERVAL", "600"))  # 초
+MEDIA_GC_GRACE = float(os.getenv("MEDIA_GC_GRACE", "3600"))  # 초, 참조가 없어져도 이 시간 동안은 지우지 않음
+MEDIA_GC_BATCH_SIZE = int(os.getenv("MEDIA_GC_BATCH_SIZE", "200"))  # 한 트랜잭션에서 확인/삭제할 파일 수
+MEDIA_GC_LOCK_KEY = 7_320_021  # 여러 워커 중 한 곳에서만 GC 실행
+MEDIA_PATH_LOCK_NAMESPACE = 7_320_022  # 경로별 advisory lock (namespace, hashtext(path))
+
+
+class UploadTooLarge(Exception):
+    """업로드 파일이 허용 크기를 넘음"""
+
+
+class SavedFile(NamedTuple):
+    path: str  # MEDIA_ROOT 기준 상대 경로 (DB에 저장하는 값)
+    size: int
+    sha256: str
+    deduplicated: bool  # 같은 내용의 파일이 이미 있어 새로 저장하지 않음
+
+
+def is_media_path(path: Optional[str]) -> bool:
+    """이 저장소가 관리하는 경로인지 (외부 URL 등은 참조 수를 세지 않음)"""
+    return bool(path) and path.startswith(f"{UPLOAD_DIR.name}/")
+
+
+def media_path(file_type: str, sha256: str, extension: str) -> str:
+    return f"{UPLOAD_DIR.name}/{MEDIA_SUBDIRS[file_type]}/{sha256[:2]}/{sha256}{extension}"
+
+
+def content_hash(path: Optional[str]) -> Optional[str]:
+    """내용 주소 경로(uploads/<종류>/ab/<sha256><확장자>)의 해시 (예전 uuid 파일명이나 외부 URL이면 None)"""
+    if not is_media_path(path):
+        return None
+    parts = path.split("/")
+    stem = parts[-1].partition(".")[0]
+    if len(parts) != 4 or len(stem) != 64 or parts[2] != stem[:2] or not all(c in "0123456789abcdef" for c in stem):
+        return None
+    return stem
+
+
+def derivative_path(sha256: str, width: int) -> str:
+    return f"{UPLOAD_DIR.name}/{DERIVED_SUBDIR}/{sha256[:2]}/{sha256}_{width}.webp"
+
+
+def find_image_source(sha256: str) -> Optional[str]:
+    """해시에 해당하는 원본 이미지 경로 (파생본 URL에는 원본 확장자가 없어 디렉토리에서 찾음)"""
+    for file in (UPLOAD_DIR / MEDIA_SUBDIRS["image"] / sha256[:2]).glob(f"{sha256}.*"):
+        return file.relative_to(MEDIA_ROOT).as_posix()
+    return None
+
+
+def copy_upload(source: BinaryIO, destination: Path, max_size: int, chunk_size: int = UPLOAD_CHUNK_SIZE):
+    """source를 chunk_size씩 읽어 destination에 쓰면서 크기 제한 확인과 SHA-256 계산을 함께 수행
+
+    블로킹 파일 IO이므로 워커 스레드에서 실행. 제한을 넘거나 실패하면 쓰던 파일을 지움
+    """
+    digest = hashlib.sha256()
+    size = 0
+    destination.parent.mkdir(parents=True, exist_ok=True)
+    try:
+        with open(destination, "xb") as f:
+            while chunk := source.read(chunk_size):
+                size += len(chunk)
+                if size > max_size:
+                    raise UploadTooLarge()
+                digest.update(chunk)
+                f.write(chunk)
+    except BaseException:
+        destination.unlink(missing_ok=True)
+        raise
+    return size, digest.hexdigest()
+
+
+def _place_file(temp_path: Path, destination: Path) -> bool:
+    """임시 파일을 최종 경로로 옮기고 새로 저장했는지 반환 (이미 있으면 임시 파일만 삭제)"""
+    if destination.exists():
+        temp_path.unlink(missing_ok=True)
+        return False
+    destination.parent.mkdir(parents=True, exist_ok=True)
+    os.replace(temp_path, destination)
+    return True
+
+
+def _lock_paths_stmt(paths: List[str]):
+    """경로별 advisory lock (트랜잭션 끝까지 유지). 교착을 피하려고 항상 정렬된 순서로, 행 잠금보다 먼저 잡음"""
+    return text(
+        "SELECT pg_advisory_xact_lock(:namespace, hashtext(path)) FROM unnest(CAST(:paths AS text[])) AS path"
+    ).bindparams(namespace=MEDIA_PATH_LOCK_NAMESPACE, paths=sorted(paths))
+
+
+async def store_media(db: AsyncSession, source: BinaryIO, file_type: str, extension: str, max_size: int) -> SavedFile:
+    """업로드 내용을 내용 주소 경로에 저장하고 media_file에 등록 (참조 수는 숏츠에 연결할 때 증가)"""
+    temp_path = UPLOAD_DIR / TEMP_SUBDIR / f"{uuid4()}{extension}"
+    size, sha256 = await asyncio.to_thread(copy_upload, source, temp_path, max_size)
+    path = media_path(file_type, sha256, extension)
+
+    try:
+        # 같은 경로를 GC가 지우는 중이면 끝날 때까지 기다린 뒤 등록 (등록 후에는 유예 시간 동안 지워지지 않음)
+        await db.execute(_lock_paths_stmt([path]))
+        await db.execute(
+            pg_insert(MediaFile)
+            .values(path=path, sha256=sha256, size=size)
+            .on_conflict_do_update(index_elements=[MediaFile.path], set_={"touched_date": func.localtimestamp()})
+        )
+        created = await asyncio.to_thread(_place_file, temp_path, MEDIA_ROOT / path)
+        await db.commit()
+    except BaseException:
+        await db.rollback()
+        temp_path.unlink(missing_ok=True)
+        raise
+
+    return SavedFile(path, size, sha256, deduplicated=not created)
+
+
+async def adjust_media_refs(db: AsyncSession, added: Iterable[Optional[str]], removed: Iterable[Optional[str]]):
+    """숏츠 image/music 변경에 맞춰 참조 수 갱신 (호출한 쪽 트랜잭션에서 함께 커밋)"""
+    deltas = Counter(path for path in added if is_media_path(path))
+    deltas.subtract(path for path in removed if is_media_path(path))
+    rows = [{"media_path": path, "delta": delta} for path, delta in deltas.items() if delta]
+    if not rows:
+        return
+
+    table = MediaFile.__table__
+    await db.execute(
+        update(table)
+        .where(table.c.path == bindparam("media_path"))
+        .values(ref_count=table.c.ref_count + bindparam("delta"), touched_date=func.localtimestamp()),
+        rows,
+    )
+
+
+def _list_stale_files(grace: float) -> List[Path]:
+    """수정된 지 grace초가 지난 저장소 파일과 임시 파일 목록"""
+    cutoff = time.time() - grace
+    files = []
+    for subdir in [*MEDIA_SUBDIRS.values(), TEMP_SUBDIR]:
+        root = UPLOAD_DIR / subdir
+        if root.exists():
+            files.extend(path for path in root.rglob("*") if path.is_file() and path.stat().st_mtime < cutoff)
+    return files
+
+
+def _remove_files(paths: Iterable[Path], grace: Optional[float] = None) -> int:
+    """파일 삭제 (grace를 주면 그 사이 다시 쓰인 파일은 남김)"""
+    cutoff = time.time() - grace if grace is not None else None
+    removed = 0
+    for path in paths:
+        try:
+            if cutoff is not None and path.stat().st_mtime >= cutoff:
+                continue
+            path.unlink()
+            removed += 1
+        except FileNotFoundError:
+            pass
+    return removed
+
+
+def _remove_orphan_derivatives(grace: float) -> int:
+    """원본 이미지가 없어진 파생본과 중단된 생성 작업의 임시 파일 삭제"""
+    root = UPLOAD_DIR / DERIVED_SUBDIR
+    if not root.exists():
+        return 0
+    cutoff = time.time() - grace
+    has_source = {}
+    orphans = []
+    for file in root.rglob("*"):
+        if not file.is_file() or file.stat().st_mtime >= cutoff:
+            continue
+        sha256 = file.name.partition("_")[0]
+        if sha256 not in has_source:
+            has_source[sha256] = find_image_source(sha256) is not None
+        if file.name.endswith(".tmp") or not has_source[sha256]:
+            orphans.append(file)
+    return _remove_files(orphans, grace)
+
+
+class MediaGarbageCollector:
+    def __init__(
+        self,
+        engine: AsyncEngine = async_engine,
+        interval: float = MEDIA_GC_INTERVAL,
+        grace: float = MEDIA_GC_GRACE,
+        batch_size: int = MEDIA_GC_BATCH_SIZE,
+    ):
+        self.engine = engine
+        self.interval = interval
+        self.grace = grace
+        self.batch_size = batch_size
+
+        self._task: Optional[asyncio.Task] = None
+        self.runs = 0
+        self.skipped = 0
+        self.removed_records = 0
+        self.removed_files = 0
+        self.failed = 0
+
+    async def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "runs": self.runs,
+            "skipped": self.skipped,
+            "removed_records": self.removed_records,
+            "removed_files": self.removed_files,
+            "failed": self.failed,
+        }
+
+    async def _run(self):
+        # 시작 직후가 아니라 interval마다 실행 (워커 시작을 느리게 하지 않도록)
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await self.collect()
+            except Exception as e:
+                self.failed += 1
+                print(f"Error in MediaGarbageCollector: {str(e)}")
+
+    async def collect(self) -> bool:
+        """참조 없는 파일을 한 번 정리. 다른 워커가 실행 중이면 건너뛰고 False"""
+        async with self.engine.connect() as connection:
+            lock = text("SELECT pg_try_advisory_lock(:key)").bindparams(key=MEDIA_GC_LOCK_KEY)
+            locked = (await connection.execute(lock)).scalar()
+            await connection.commit()
+            if not locked:
+                self.skipped += 1
+                return False
+            try:
+                await self._collect_unreferenced(connection)
+                await self._collect_untracked(connection)
+                self.removed_files += await asyncio.to_thread(_remove_orphan_derivatives, self.grace)
+            finally:
+                await connection.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": MEDIA_GC_LOCK_KEY})
+                await connection.commit()
+        self.runs += 1
+        return True
+
+    async def _collect_unreferenced(self, connection):
+        """ref_count가 0 이하이고 유예 시간이 지난 기록과 파일 삭제"""
+        table = MediaFile.__table__
+        stale = [table.c.ref_count <= 0, table.c.touched_date < func.localtimestamp() - timedelta(seconds=self.grace)]
+        while True:
+            async with connection.begin():
+                candidates = (
+                    (await connection.execute(select(table.c.path).where(*stale).limit(self.batch_size)))
+                    .scalars()
+                    .all()
+                )
+                if not candidates:
+                    return
+                # 경로 잠금 후 조건을 다시 확인하며 삭제 (그 사이 다시 업로드/참조된 파일은 제외)
+                await connection.execute(_lock_paths_stmt(candidates))
+                deleted = await connection.execute(
+                    table.delete().where(table.c.path.in_(candidates), *stale).returning(table.c.path)
+                )
+                paths = deleted.scalars().all()
+                # 경로 잠금을 쥔 채(커밋 전) 파일을 지워, 같은 내용을 새로 올리는 업로드와 겹치지 않게 함
+                self.removed_files += await asyncio.to_thread(_remove_files, [MEDIA_ROOT / path for path in paths])
+            self.removed_records += len(paths)
+            if len(candidates) < self.batch_size:
+                return
+
+    async def _collect_untracked(self, connection):
+        """media_file 기록 없이 디스크에만 남은 파일(실패한 업로드, 예전 uuid 파일명 등) 삭제"""
+        table = MediaFile.__table__
+        stale = await asyncio.to_thread(_list_stale_files, self.grace)
+        for start in range(0, len(stale), self.batch_size):
+            batch = {file.relative_to(MEDIA_ROOT).as_posix(): file for file in stale[start : start + self.batch_size]}
+            async with connection.begin():
+                await connection.execute(_lock_paths_stmt(list(batch)))
+                tracked = set(
+                    (await connection.execute(select(table.c.path).where(table.c.path.in_(list(batch))))).scalars()
+                )
+                orphans = [file for path, file in batch.items() if path not in tracked]
+                self.removed_files += await asyncio.to_thread(_remove_files, orphans, self.grace)
+
+
+media_garbage_collector = MediaGarbageCollector()
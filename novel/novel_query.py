@@ -1,9 +1,17 @@
+from collections import Counter, defaultdict
 import csv
+from datetime import datetime, timedelta
 from io import StringIO
-from typing import List, Optional, Tuple
+import os
+import time
+from typing import AsyncIterator, Dict, List, Optional, Set
 
-from models import Comment, Novel, NovelShorts, UserLike, UserSave
+from models import Comment, FormType, Novel, NovelShorts, UserLike, UserSave
+from novel.image_derivatives import image_variants
+from novel.media_store import adjust_media_refs
 from novel.novel_schema import (
+    BulkIngestResponse,
+    BulkRecordResult,
     CommentResponse,
     LikeResponse,
     NovelCreate,
@@ -15,280 +23,337 @@ from novel.novel_schema import (
     PostResponse,
     SaveResponse,
 )
-from sqlalchemy.orm import Session
+from sqlalchemy import func, literal, literal_column, select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from utils.cache import cache
 
 
-def get_post(post_no: int, user_no: Optional[int], db: Session) -> PostResponse:
-    try:
-        # 게시글 조회
-        post = (
-            db.query(NovelShorts, Novel)
-            .join(Novel, Novel.no == NovelShorts.novel_no)
-            .filter(NovelShorts.no == post_no)
-            .first()
+# 숏츠/소설 정보 중 거의 바뀌지 않는 부분만 캐시하고, 카운터와 is_like는 조회 시점에 덧씌움
+POST_CACHE_TTL = float(os.getenv("POST_CACHE_TTL", "300"))  # 초
+
+
+def _not_null(column, default):
+    """응답 스키마에서 NULL이 아닌 필드는 DB의 NULL을 기본값으로 바꿔 조회 (model_construct는 검증하지 않음)"""
+    return func.coalesce(column, default).label(column.key)
+
+
+POST_BASE_COLUMNS = (
+    NovelShorts.no,
+    _not_null(NovelShorts.form_type, FormType.OTHER.value),
+    _not_null(NovelShorts.content, ""),
+    NovelShorts.image,
+    NovelShorts.music,
+    _not_null(Novel.title, ""),
+    _not_null(Novel.author, ""),
+    _not_null(Novel.source_url, ""),
+)
+POST_COUNTER_COLUMNS = tuple(
+    _not_null(column, 0) for column in (NovelShorts.views, NovelShorts.likes, NovelShorts.saves, NovelShorts.comments)
+)
+
+
+def post_cache_key(shorts_no: int) -> str:
+    # v3: NULL 컬럼을 기본값으로 채움 (이전 형식으로 캐시된 NULL 값을 읽지 않도록)
+    return f"post:v3:{shorts_no}"
+
+
+def _post_base(row) -> dict:
+    """조회 결과 행에서 캐시할 불변 필드만 추출"""
+    base = {column.key: row._mapping[column.key] for column in POST_BASE_COLUMNS}
+    base["image_variants"] = image_variants(base["image"])
+    return base
+
+
+def _build_post_response(base: dict, counters, is_like: bool) -> PostResponse:
+    # DB 값으로만 만드므로 검증 생략 (응답 스키마 검증은 utils.serialization.RESPONSE_VALIDATION에서)
+    return PostResponse.model_construct(
+        **{
+            **base,
+            "views": counters.views,
+            "likes": counters.likes,
+            "saves": counters.saves,
+            "comments": counters.comments,
+            "is_like": is_like,
+        },
+    )
+
+
+async def get_post_bases(db: AsyncSession, shorts_nos: List[int]) -> Dict[int, dict]:
+    """숏츠 번호별 불변 필드 조회 (캐시에 없는 것만 IN 쿼리 한 번으로 가져와 캐시에 채움)"""
+    keys = {shorts_no: post_cache_key(shorts_no) for shorts_no in shorts_nos}
+    cached = await cache.get_many(list(keys.values()))
+    bases = {shorts_no: cached[key] for shorts_no, key in keys.items() if key in cached}
+
+    missing = [shorts_no for shorts_no in shorts_nos if shorts_no not in bases]
+    if missing:
+        rows = await db.execute(
+            select(*POST_BASE_COLUMNS).join(Novel, Novel.no == NovelShorts.novel_no).where(NovelShorts.no.in_(missing))
         )
+        loaded = {row.no: _post_base(row) for row in rows}
+        await cache.set_many({keys[shorts_no]: base for shorts_no, base in loaded.items()}, POST_CACHE_TTL)
+        bases.update(loaded)
+    return bases
+
+
+async def get_post(post_no: int, user_no: Optional[int], db: AsyncSession) -> PostResponse:
+    try:
+        base = await cache.get(post_cache_key(post_no))
+        if base is None:
+            # 캐시 미스: 소설 조인까지 한 번에 조회한 뒤 불변 필드를 캐시
+            post = (
+                await db.execute(
+                    select(*POST_BASE_COLUMNS, *POST_COUNTER_COLUMNS)
+                    .join(Novel, Novel.no == NovelShorts.novel_no)
+                    .where(NovelShorts.no == post_no)
+                )
+            ).first()
+            if post:
+                base = _post_base(post)
+                await cache.set(post_cache_key(post_no), base, POST_CACHE_TTL)
+        else:
+            # 캐시 히트: 카운터만 PK로 조회
+            post = (await db.execute(select(*POST_COUNTER_COLUMNS).where(NovelShorts.no == post_no))).first()
+            if not post:
+                await cache.delete(post_cache_key(post_no))
 
         if not post:
             return {"error": "Post not found", "msg": "존재하지 않는 숏츠입니다"}
 
         # 사용자가 좋아요를 눌렀는지 확인
-        is_like = False
-        if user_no:
-            like_exists = (
-                db.query(UserLike)
-                .filter(
-                    UserLike.user_no == user_no,
-                    UserLike.novel_shorts_no == post_no,
-                    UserLike.is_del.is_(False),
-                )
-                .first()
-            )
-            is_like = bool(like_exists)
-
-        return PostResponse(
-            no=post.NovelShorts.no,
-            form_type=post.NovelShorts.form_type,
-            content=post.NovelShorts.content,
-            music=post.NovelShorts.music,
-            views=post.NovelShorts.views,
-            likes=post.NovelShorts.likes,
-            saves=post.NovelShorts.saves,
-            comments=post.NovelShorts.comments,
-            title=post.Novel.title,
-            author=post.Novel.author,
-            source_url=post.Novel.source_url,
-            is_like=is_like,
-        )
+        is_like = post_no in await get_user_liked_shorts(db, user_no, [post_no])
+
+        return _build_post_response(base, post, is_like)
     except Exception as e:
         print(f"Error in get_post: {str(e)}")
         return {"error": str(e), "msg": "게시글을 가져오는 중 오류가 발생했습니다."}
 
 
-def get_posts(db: Session, limit: int, offset: int, user_no: Optional[int] = None) -> List[PostResponse]:
+async def get_user_liked_shorts(db: AsyncSession, user_no: Optional[int], shorts_nos: List[int]) -> Set[int]:
+    """shorts_nos 중 사용자가 좋아요를 누른 숏츠 번호 집합"""
+    if not user_no or not shorts_nos:
+        return set()
+
+    likes = await db.scalars(
+        select(UserLike.novel_shorts_no).where(
+            UserLike.user_no == user_no,
+            UserLike.novel_shorts_no.in_(shorts_nos),
+            UserLike.is_del.is_(False),
+        )
+    )
+    return set(likes)
+
+
+async def get_posts(
+    db: AsyncSession, limit: int, offset: int, user_no: Optional[int] = None, after_no: Optional[int] = None
+) -> List[PostResponse]:
     try:
-        # 게시글 목록 조회
-        posts = (
-            db.query(NovelShorts, Novel)
+        # 게시글 목록 조회 (페이지 구성과 카운터만 조회하고, 나머지 필드는 캐시에서 채움)
+        query = (
+            select(NovelShorts.no, *POST_COUNTER_COLUMNS)
             .join(Novel, Novel.no == NovelShorts.novel_no)
             .order_by(NovelShorts.no.desc())
-            .offset(offset)
             .limit(limit)
-            .all()
         )
+        if after_no is not None:
+            # 커서 모드: 마지막으로 받은 숏츠 번호 이후부터 PK 인덱스로 바로 탐색
+            query = query.where(NovelShorts.no < after_no)
+        else:
+            query = query.offset(offset)
+        posts = (await db.execute(query)).all()
 
-        # 사용자가 좋아요를 누른 게시글 목록 조회
-        user_likes = set()
-        if user_no:
-            likes = (
-                db.query(UserLike.novel_shorts_no)
-                .filter(
-                    UserLike.user_no == user_no,
-                    UserLike.is_del.is_(False),
-                )
-                .all()
-            )
-            user_likes = {like[0] for like in likes}
+        shorts_nos = [post.no for post in posts]
+        bases = await get_post_bases(db, shorts_nos)
+
+        # 사용자가 좋아요를 누른 게시글 조회 (현재 페이지의 숏츠로 범위 제한)
+        user_likes = await get_user_liked_shorts(db, user_no, shorts_nos)
 
         return [
-            PostResponse(
-                no=post.NovelShorts.no,
-                form_type=post.NovelShorts.form_type,
-                content=post.NovelShorts.content,
-                music=post.NovelShorts.music,
-                views=post.NovelShorts.views,
-                likes=post.NovelShorts.likes,
-                saves=post.NovelShorts.saves,
-                comments=post.NovelShorts.comments,
-                title=post.Novel.title,
-                author=post.Novel.author,
-                source_url=post.Novel.source_url,
-                is_like=post.NovelShorts.no in user_likes,
-            )
+            _build_post_response(bases[post.no], post, post.no in user_likes)
             for post in posts
+            if post.no in bases  # 두 조회 사이에 삭제된 숏츠는 제외
         ]
     except Exception as e:
         print(f"Error in get_posts: {str(e)}")
         return {"error": str(e), "msg": "숏츠 목록을 가져오는 중 오류가 발생했습니다"}
 
 
-def like_novel_shorts(db: Session, user_no: int, shorts_no: int) -> LikeResponse:
-    try:
-        # 숏츠 존재 여부 확인
-        shorts = db.query(NovelShorts).filter(NovelShorts.no == shorts_no).first()
-        if not shorts:
-            return LikeResponse(success=False, message="존재하지 않는 숏츠입니다", likes=0)
-
-        # 이미 좋아요를 눌렀는지 확인
-        existing_like = (
-            db.query(UserLike)
-            .filter(UserLike.user_no == user_no, UserLike.novel_shorts_no == shorts_no, UserLike.is_del.is_(False))
-            .first()
+def _activate_record_stmt(record_model, counter, user_no: int, shorts_no: int):
+    """기록을 활성화(없으면 생성)하고 상태가 실제로 바뀐 경우에만 숏츠 카운터를 1 올리는 단일 구문"""
+    toggled = (
+        pg_insert(record_model)
+        .from_select(
+            ["user_no", "novel_no", "novel_shorts_no", "is_del"],
+            select(literal(user_no), NovelShorts.novel_no, NovelShorts.no, literal(False)).where(
+                NovelShorts.no == shorts_no
+            ),
         )
-
-        if existing_like:
-            return LikeResponse(success=False, message="이미 좋아요를 눌렀습니다", likes=shorts.likes)
-
-        # 새로운 좋아요 기록 생성 또는 기존 기록 업데이트
-        like_record = (
-            db.query(UserLike).filter(UserLike.user_no == user_no, UserLike.novel_shorts_no == shorts_no).first()
+        .on_conflict_do_update(
+            index_elements=[record_model.user_no, record_model.novel_shorts_no],
+            set_={"is_del": False},
+            where=record_model.is_del.is_(True),
         )
+        .returning(record_model.novel_shorts_no)
+        .cte("toggled")
+    )
+    return (
+        update(NovelShorts)
+        .where(NovelShorts.no.in_(select(toggled.c.novel_shorts_no)))
+        .values({counter: counter + 1})
+        .returning(counter)
+        .execution_options(synchronize_session=False)  # 세션 동기화용 추가 SELECT 없이 RETURNING 값만 사용
+    )
+
+
+def _deactivate_record_stmt(record_model, counter, user_no: int, shorts_no: int):
+    """활성 기록을 취소하고 상태가 실제로 바뀐 경우에만 숏츠 카운터를 1 내리는 단일 구문"""
+    toggled = (
+        update(record_model)
+        .where(
+            record_model.user_no == user_no,
+            record_model.novel_shorts_no == shorts_no,
+            record_model.is_del.is_(False),
+        )
+        .values(is_del=True)
+        .returning(record_model.novel_shorts_no)
+        .cte("toggled")
+    )
+    return (
+        update(NovelShorts)
+        .where(NovelShorts.no.in_(select(toggled.c.novel_shorts_no)))
+        .values({counter: counter - 1})
+        .returning(counter)
+        .execution_options(synchronize_session=False)  # 세션 동기화용 추가 SELECT 없이 RETURNING 값만 사용
+    )
+
+
+async def like_novel_shorts(db: AsyncSession, user_no: int, shorts_no: int) -> LikeResponse:
+    try:
+        # 좋아요 기록 upsert + 좋아요 수 증가를 한 번에 처리 (동시 요청에도 카운트 유실 없음)
+        likes = await db.scalar(_activate_record_stmt(UserLike, NovelShorts.likes, user_no, shorts_no))
+        await db.commit()
 
-        if like_record:
-            like_record.is_del = False
-        else:
-            like_record = UserLike(user_no=user_no, novel_no=shorts.novel_no, novel_shorts_no=shorts_no)
-            db.add(like_record)
-
-        # 숏츠의 좋아요 수 증가
-        shorts.likes += 1
-        db.commit()
+        if likes is not None:
+            return LikeResponse(success=True, message="좋아요를 눌렀습니다", likes=likes)
 
-        return LikeResponse(success=True, message="좋아요를 눌렀습니다", likes=shorts.likes)
+        # 변경이 없으면 실패 사유 확인
+        likes = await db.scalar(select(NovelShorts.likes).where(NovelShorts.no == shorts_no))
+        if likes is None:
+            return LikeResponse(success=False, message="존재하지 않는 숏츠입니다", likes=0)
+        return LikeResponse(success=False, message="이미 좋아요를 눌렀습니다", likes=likes)
 
     except Exception as e:
         print(f"Error in like_novel_shorts: {str(e)}")
-        db.rollback()
+        await db.rollback()
         return LikeResponse(success=False, message="좋아요 처리 중 오류가 발생했습니다", likes=0)
 
 
-def unlike_novel_shorts(db: Session, user_no: int, shorts_no: int) -> LikeResponse:
+async def unlike_novel_shorts(db: AsyncSession, user_no: int, shorts_no: int) -> LikeResponse:
     try:
-        # 숏츠 존재 여부 확인
-        shorts = db.query(NovelShorts).filter(NovelShorts.no == shorts_no).first()
-        if not shorts:
-            return LikeResponse(success=False, message="존재하지 않는 숏츠입니다", likes=0)
-
-        # 좋아요 기록 확인
-        like_record = (
-            db.query(UserLike)
-            .filter(UserLike.user_no == user_no, UserLike.novel_shorts_no == shorts_no, UserLike.is_del.is_(False))
-            .first()
-        )
+        # 좋아요 취소 + 좋아요 수 감소를 한 번에 처리
+        likes = await db.scalar(_deactivate_record_stmt(UserLike, NovelShorts.likes, user_no, shorts_no))
+        await db.commit()
 
-        if not like_record:
-            return LikeResponse(success=False, message="좋아요 기록이 없습니다", likes=shorts.likes)
+        if likes is not None:
+            return LikeResponse(success=True, message="좋아요를 취소했습니다", likes=likes)
 
-        # 좋아요 취소 처리
-        like_record.is_del = True
-        shorts.likes -= 1
-        db.commit()
-
-        return LikeResponse(success=True, message="좋아요를 취소했습니다", likes=shorts.likes)
+        # 변경이 없으면 실패 사유 확인
+        likes = await db.scalar(select(NovelShorts.likes).where(NovelShorts.no == shorts_no))
+        if likes is None:
+            return LikeResponse(success=False, message="존재하지 않는 숏츠입니다", likes=0)
+        return LikeResponse(success=False, message="좋아요 기록이 없습니다", likes=likes)
 
     except Exception as e:
         print(f"Error in unlike_novel_shorts: {str(e)}")
-        db.rollback()
+        await db.rollback()
         return LikeResponse(success=False, message="좋아요 취소 중 오류가 발생했습니다", likes=0)
 
 
-def save_novel_shorts(db: Session, user_no: int, shorts_no: int) -> SaveResponse:
+async def save_novel_shorts(db: AsyncSession, user_no: int, shorts_no: int) -> SaveResponse:
     try:
-        # 숏츠 존재 여부 확인
-        shorts = db.query(NovelShorts).filter(NovelShorts.no == shorts_no).first()
-        if not shorts:
-            return SaveResponse(success=False, message="존재하지 않는 숏츠입니다", saves=0)
+        # 저장 기록 upsert + 저장 수 증가를 한 번에 처리
+        saves = await db.scalar(_activate_record_stmt(UserSave, NovelShorts.saves, user_no, shorts_no))
+        await db.commit()
 
-        # 이미 저장했는지 확인
-        existing_save = (
-            db.query(UserSave)
-            .filter(UserSave.user_no == user_no, UserSave.novel_shorts_no == shorts_no, UserSave.is_del.is_(False))
-            .first()
-        )
-
-        if existing_save:
-            return SaveResponse(success=False, message="이미 저장된 숏츠입니다", saves=shorts.saves)
+        if saves is not None:
+            return SaveResponse(success=True, message="숏츠를 저장했습니다", saves=saves)
 
-        # 새로운 저장 기록 생성 또는 기존 기록 업데이트
-        save_record = (
-            db.query(UserSave).filter(UserSave.user_no == user_no, UserSave.novel_shorts_no == shorts_no).first()
-        )
-
-        if save_record:
-            save_record.is_del = False
-        else:
-            save_record = UserSave(user_no=user_no, novel_no=shorts.novel_no, novel_shorts_no=shorts_no)
-            db.add(save_record)
-
-        # 숏츠의 저장 수 증가
-        shorts.saves += 1
-        db.commit()
-
-        return SaveResponse(success=True, message="숏츠를 저장했습니다", saves=shorts.saves)
+        # 변경이 없으면 실패 사유 확인
+        saves = await db.scalar(select(NovelShorts.saves).where(NovelShorts.no == shorts_no))
+        if saves is None:
+            return SaveResponse(success=False, message="존재하지 않는 숏츠입니다", saves=0)
+        return SaveResponse(success=False, message="이미 저장된 숏츠입니다", saves=saves)
 
     except Exception as e:
         print(f"Error in save_novel_shorts: {str(e)}")
-        db.rollback()
+        await db.rollback()
         return SaveResponse(success=False, message="저장 처리 중 오류가 발생했습니다", saves=0)
 
 
-def unsave_novel_shorts(db: Session, user_no: int, shorts_no: int) -> SaveResponse:
+async def unsave_novel_shorts(db: AsyncSession, user_no: int, shorts_no: int) -> SaveResponse:
     try:
-        # 숏츠 존재 여부 확인
-        shorts = db.query(NovelShorts).filter(NovelShorts.no == shorts_no).first()
-        if not shorts:
-            return SaveResponse(success=False, message="존재하지 않는 숏츠입니다", saves=0)
+        # 저장 취소 + 저장 수 감소를 한 번에 처리
+        saves = await db.scalar(_deactivate_record_stmt(UserSave, NovelShorts.saves, user_no, shorts_no))
+        await db.commit()
 
-        # 저장 기록 확인
-        save_record = (
-            db.query(UserSave)
-            .filter(UserSave.user_no == user_no, UserSave.novel_shorts_no == shorts_no, UserSave.is_del.is_(False))
-            .first()
-        )
-
-        if not save_record:
-            return SaveResponse(success=False, message="저장 기록이 없습니다", saves=shorts.saves)
+        if saves is not None:
+            return SaveResponse(success=True, message="저장을 취소했습니다", saves=saves)
 
-        # 저장 취소 처리
-        save_record.is_del = True
-        shorts.saves -= 1
-        db.commit()
-
-        return SaveResponse(success=True, message="저장을 취소했습니다", saves=shorts.saves)
+        # 변경이 없으면 실패 사유 확인
+        saves = await db.scalar(select(NovelShorts.saves).where(NovelShorts.no == shorts_no))
+        if saves is None:
+            return SaveResponse(success=False, message="존재하지 않는 숏츠입니다", saves=0)
+        return SaveResponse(success=False, message="저장 기록이 없습니다", saves=saves)
 
     except Exception as e:
         print(f"Error in unsave_novel_shorts: {str(e)}")
-        db.rollback()
+        await db.rollback()
         return SaveResponse(success=False, message="저장 취소 중 오류가 발생했습니다", saves=0)
 
 
-def create_novel(db: Session, novel_data: NovelCreate) -> NovelResponse:
+def novel_values(novel_data: NovelCreate) -> dict:
+    """요청 필드 중 novel 테이블에 있는 컬럼만 (source_type 등 저장하지 않는 필드 제외)"""
+    columns = Novel.__table__.columns
+    return {key: value for key, value in novel_data.model_dump().items() if key in columns}
+
+
+async def create_novel(db: AsyncSession, novel_data: NovelCreate) -> NovelResponse:
     try:
         # 이미 존재하는 소설인지 확인
-        existing_novel = (
-            db.query(Novel)
-            .filter(
+        existing_novel = await db.scalar(
+            select(Novel)
+            .where(
                 Novel.source_platform_type == novel_data.source_platform_type, Novel.source_id == novel_data.source_id
             )
-            .first()
+            .limit(1)
         )
 
         if existing_novel:
             return NovelResponse(success=False, message="이미 존재하는 소설입니다", novel_no=existing_novel.no)
 
         # 새 소설 생성
-        new_novel = Novel(**novel_data.model_dump())
+        new_novel = Novel(**novel_values(novel_data))
         db.add(new_novel)
-        db.commit()
-        db.refresh(new_novel)
+        await db.commit()
+        await db.refresh(new_novel)
 
         return NovelResponse(success=True, message="소설이 생성되었습니다", novel_no=new_novel.no)
     except Exception as e:
         print(f"Error in create_novel: {str(e)}")
-        db.rollback()
+        await db.rollback()
         return NovelResponse(success=False, message="소설 생성 중 오류가 발생했습니다")
 
 
-def get_novel_no_by_source_id(db: Session, source_id: int) -> Optional[int]:
+async def get_novel_no_by_source_id(db: AsyncSession, source_id: int) -> Optional[int]:
     """소설의 source_id로 novel_no를 찾아오는 함수"""
-    novel = db.query(Novel.no).filter(Novel.source_id == source_id).first()
-    return novel.no if novel else None
+    return await db.scalar(select(Novel.no).where(Novel.source_id == source_id).limit(1))
 
 
-def create_novel_shorts(
-    db: Session, shorts_data: NovelShortsCreate, music_path: Optional[str] = None
+async def create_novel_shorts(
+    db: AsyncSession, shorts_data: NovelShortsCreate, music_path: Optional[str] = None
 ) -> NovelShortsResponse:
     try:
-        novel_no = get_novel_no_by_source_id(db, shorts_data.novel_id)
+        novel_no = await get_novel_no_by_source_id(db, shorts_data.novel_id)
         if not novel_no:
             return NovelShortsResponse(success=False, message="해당하는 소설을 찾을 수 없습니다")
 
@@ -300,63 +365,191 @@ def create_novel_shorts(
         )
 
         db.add(new_shorts)
-        db.commit()
-        db.refresh(new_shorts)
+        await adjust_media_refs(db, added=[music_path], removed=[])
+        await db.commit()
+        await db.refresh(new_shorts)
+        await cache.delete(post_cache_key(new_shorts.no))
 
         return NovelShortsResponse(success=True, message="숏츠가 생성되었습니다", shorts_no=new_shorts.no)
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         print(f"Error creating shorts: {str(e)}")
         return NovelShortsResponse(success=False, message="숏츠 생성 중 오류가 발생했습니다")
 
 
-def get_novel_detail(db: Session, novel_no: int):
+# 크롤러 재수집 시 갱신하지 않는 컬럼 (upsert 키와 최초 등록 값)
+NOVEL_UPSERT_KEEP_COLUMNS = {"source_platform_type", "source_id", "created_date"}
+
+
+def _bulk_response(results: List[dict], start: float) -> BulkIngestResponse:
+    elapsed = time.perf_counter() - start
+    counts = Counter(result["status"] for result in results)
+    return BulkIngestResponse(
+        success=True,
+        message=f"{counts['created']}건 생성, {counts['updated']}건 갱신",
+        total=len(results),
+        created=counts["created"],
+        updated=counts["updated"],
+        skipped=len(results) - counts["created"] - counts["updated"],
+        elapsed_ms=elapsed * 1000,
+        rows_per_second=len(results) / elapsed if elapsed > 0 else 0,
+        # DB 값으로만 만드므로 레코드별 검증 생략
+        results=[BulkRecordResult.model_construct(**result) for result in results],
+    )
+
+
+def _bulk_result(index: int, status: str, novel_no: Optional[int] = None, shorts_no: Optional[int] = None) -> dict:
+    return {"index": index, "status": status, "novel_no": novel_no, "shorts_no": shorts_no}
+
+
+async def bulk_upsert_novels(db: AsyncSession, novels: List[NovelCreate]) -> BulkIngestResponse:
+    """소설 여러 건을 (source_platform_type, source_id) 기준 upsert 한 구문으로 적재하고 한 번만 커밋"""
+    start = time.perf_counter()
+    try:
+        results: List[Optional[dict]] = [None] * len(novels)
+        # 같은 요청 안의 같은 작품은 마지막 레코드만 적재 (한 구문의 ON CONFLICT가 같은 행을 두 번 바꿀 수 없음)
+        latest: Dict[tuple, int] = {}
+        for index, novel_data in enumerate(novels):
+            if novel_data.source_id is None:
+                results[index] = _bulk_result(index, "missing_source_id")
+                continue
+            key = (novel_data.source_platform_type, novel_data.source_id)
+            if key in latest:
+                results[latest[key]] = _bulk_result(latest[key], "duplicate")
+            latest[key] = index
+
+        if latest:
+            rows = [novel_values(novels[index]) for index in latest.values()]
+            table = Novel.__table__
+            stmt = pg_insert(table)
+            stmt = stmt.on_conflict_do_update(
+                constraint="uq_novel_source_platform_type_source_id",
+                set_={key: stmt.excluded[key] for key in rows[0] if key not in NOVEL_UPSERT_KEEP_COLUMNS},
+            ).returning(
+                table.c.no,
+                table.c.source_platform_type,
+                table.c.source_id,
+                literal_column("xmax = 0").label("inserted"),  # 새로 INSERT된 행은 xmax가 0
+            )
+            # 여러 VALUES 묶음으로 나눠 실행되며, 결과는 upsert 키로 요청 위치에 맞춤
+            updated_nos = []
+            for row in (await db.execute(stmt, rows)).all():
+                index = latest[(row.source_platform_type, row.source_id)]
+                results[index] = _bulk_result(index, "created" if row.inserted else "updated", novel_no=row.no)
+                if not row.inserted:
+                    updated_nos.append(row.no)
+
+            # 제목/작가 등이 바뀐 소설의 숏츠는 캐시된 게시글 정보를 지움
+            stale_shorts = []
+            if updated_nos:
+                stale_shorts = (
+                    await db.scalars(select(NovelShorts.no).where(NovelShorts.novel_no.in_(updated_nos)))
+                ).all()
+            await db.commit()
+            if stale_shorts:
+                await cache.delete(*[post_cache_key(shorts_no) for shorts_no in stale_shorts])
+
+        return _bulk_response(results, start)
+    except Exception as e:
+        print(f"Error in bulk_upsert_novels: {str(e)}")
+        await db.rollback()
+        return BulkIngestResponse(success=False, message="소설 일괄 적재 중 오류가 발생했습니다", total=len(novels))
+
+
+async def bulk_create_novel_shorts(
+    db: AsyncSession, shorts: List[NovelShortsCreate], music_paths: List[Optional[str]]
+) -> BulkIngestResponse:
+    """숏츠 여러 건의 source_id를 한 번에 novel_no로 바꿔 한 구문으로 적재하고 한 번만 커밋"""
+    start = time.perf_counter()
+    try:
+        # source_id만으로 찾으므로 여러 플랫폼에 같은 값이 있으면 가장 먼저 등록된 소설에 연결
+        source_ids = {shorts_data.novel_id for shorts_data in shorts}
+        found = await db.execute(
+            select(Novel.source_id, func.min(Novel.no)).where(Novel.source_id.in_(source_ids)).group_by(Novel.source_id)
+        )
+        novel_nos = dict(found.all())
+
+        results: List[Optional[dict]] = [None] * len(shorts)
+        indexes, rows = [], []
+        for index, (shorts_data, music_path) in enumerate(zip(shorts, music_paths)):
+            novel_no = novel_nos.get(shorts_data.novel_id)
+            if novel_no is None:
+                results[index] = _bulk_result(index, "novel_not_found")
+                continue
+            indexes.append(index)
+            rows.append({"novel_no": novel_no, "content": shorts_data.content, "form_type": 1, "music": music_path})
+
+        if rows:
+            table = NovelShorts.__table__
+            # 여러 VALUES 묶음으로 나눠 실행돼도 RETURNING 순서를 요청 순서에 맞춤
+            stmt = pg_insert(table).returning(table.c.no, sort_by_parameter_order=True)
+            shorts_nos = (await db.scalars(stmt, rows)).all()
+            await adjust_media_refs(db, added=[row["music"] for row in rows], removed=[])
+            await db.commit()
+            for index, row, shorts_no in zip(indexes, rows, shorts_nos):
+                results[index] = _bulk_result(index, "created", novel_no=row["novel_no"], shorts_no=shorts_no)
+            await cache.delete(*[post_cache_key(shorts_no) for shorts_no in shorts_nos])
+
+        return _bulk_response(results, start)
+    except Exception as e:
+        print(f"Error in bulk_create_novel_shorts: {str(e)}")
+        await db.rollback()
+        return BulkIngestResponse(success=False, message="숏츠 일괄 적재 중 오류가 발생했습니다", total=len(shorts))
+
+
+async def get_novel_detail(db: AsyncSession, novel_no: int):
     try:
         # 소설 정보 조회
-        novel = db.query(Novel).filter(Novel.no == novel_no).first()
+        novel = await db.scalar(select(Novel).where(Novel.no == novel_no))
         if not novel:
             return {"error": "Novel not found", "msg": "존재하지 않는 소설입니다"}
 
         # 숏츠 및 댓글 정보 조회
         shorts_list = (
-            db.query(NovelShorts).filter(NovelShorts.novel_no == novel_no).order_by(NovelShorts.no.desc()).all()
-        )
-
-        # 각 숏츠의 댓글 조회
-        result_shorts = []
-        for shorts in shorts_list:
-            comments = (
-                db.query(Comment)
-                .filter(Comment.novel_shorts_no == shorts.no, Comment.is_del.is_(False))
+            await db.scalars(
+                select(NovelShorts).where(NovelShorts.novel_no == novel_no).order_by(NovelShorts.no.desc())
+            )
+        ).all()
+
+        # 모든 숏츠의 댓글을 한 번에 조회한 뒤 숏츠별로 묶음
+        comments_by_shorts = defaultdict(list)
+        if shorts_list:
+            comments = await db.scalars(
+                select(Comment)
+                .where(
+                    Comment.novel_shorts_no.in_([shorts.no for shorts in shorts_list]),
+                    Comment.is_del.is_(False),
+                )
                 .order_by(Comment.created_date.asc())
-                .all()
             )
-
-            comments_response = [
-                CommentResponse(
-                    no=comment.no,
-                    user_no=comment.user_no,
-                    content=comment.content,
-                    created_date=comment.created_date,
-                    like=comment.like,
-                    is_del=comment.is_del,
-                    parent_no=comment.parent_no,
+            for comment in comments:
+                comments_by_shorts[comment.novel_shorts_no].append(
+                    CommentResponse(
+                        no=comment.no,
+                        user_no=comment.user_no,
+                        content=comment.content,
+                        created_date=comment.created_date,
+                        like=comment.like,
+                        is_del=comment.is_del,
+                        parent_no=comment.parent_no,
+                    )
                 )
-                for comment in comments
-            ]
 
-            shorts_with_comments = NovelShortsWithComments(
+        result_shorts = [
+            NovelShortsWithComments(
                 no=shorts.no,
                 form_type=shorts.form_type,
                 content=shorts.content,
                 image=shorts.image,
+                image_variants=image_variants(shorts.image),
                 music=shorts.music,
                 views=shorts.views,
                 likes=shorts.likes,
                 saves=shorts.saves,
-                comments=comments_response,
+                comments=comments_by_shorts[shorts.no],
             )
-            result_shorts.append(shorts_with_comments)
+            for shorts in shorts_list
+        ]
 
         return NovelDetailResponse(
             no=novel.no,
@@ -365,6 +558,7 @@ def get_novel_detail(db: Session, novel_no: int):
             description=novel.description,
             genres=novel.genres,
             cover_image=novel.cover_image,
+            cover_image_variants=image_variants(novel.cover_image),
             chapters=novel.chapters,
             views=novel.views,
             recommends=novel.recommends,
@@ -380,11 +574,16 @@ def get_novel_detail(db: Session, novel_no: int):
         return {"error": str(e), "msg": "소설 정보를 가져오는 중 오류가 발생했습니다"}
 
 
-def update_shorts_media(
-    db: Session, shorts_no: int, image: Optional[str] = None, music: Optional[str] = None
+async def update_shorts_media(
+    db: AsyncSession, shorts_no: int, image: Optional[str] = None, music: Optional[str] = None
 ) -> NovelShortsResponse:
     try:
-        shorts = db.query(NovelShorts).filter(NovelShorts.no == shorts_no).first()
+        # 바뀌기 전 경로의 참조 수를 줄여야 하므로 행을 잠그고 읽음
+        shorts = (
+            await db.execute(
+                select(NovelShorts.image, NovelShorts.music).where(NovelShorts.no == shorts_no).with_for_update()
+            )
+        ).first()
         if not shorts:
             return NovelShortsResponse(success=False, message="존재하지 않는 숏츠입니다")
 
@@ -395,63 +594,172 @@ def update_shorts_media(
             update_data["music"] = music
 
         if update_data:
-            db.query(NovelShorts).filter(NovelShorts.no == shorts_no).update(update_data)
-            db.commit()
+            await adjust_media_refs(
+                db, added=update_data.values(), removed=[getattr(shorts, column) for column in update_data]
+            )
+            await db.execute(update(NovelShorts).where(NovelShorts.no == shorts_no).values(**update_data))
+            await db.commit()
+            await cache.delete(post_cache_key(shorts_no))
 
         return NovelShortsResponse(success=True, message="미디어가 업데이트되었습니다", shorts_no=shorts_no)
     except Exception as e:
         print(f"Error in update_shorts_media: {str(e)}")
-        db.rollback()
+        await db.rollback()
         return NovelShortsResponse(success=False, message="미디어 업데이트 중 오류가 발생했습니다")
 
 
-def get_novel_shorts_csv(db: Session) -> Tuple[str, List[dict]]:
-    try:
-        # 소설과 숏츠 조인하여 데이터 조회
-        results = (
-            db.query(
-                Novel.no.label("novel_no"),
-                NovelShorts.no.label("novel_short_no"),
-                NovelShorts.content,
-                NovelShorts.views,
-                NovelShorts.likes,
-                NovelShorts.saves,
-            )
-            .join(NovelShorts, Novel.no == NovelShorts.novel_no)
-            .order_by(Novel.no, NovelShorts.no)
-            .all()
-        )
+CSV_EXPORT_COLUMNS = ["novel_no", "novel_short_no", "content", "views", "likes", "saves"]
+EXPORT_BATCH_SIZE = int(os.getenv("EXPORT_BATCH_SIZE", "5000"))  # 서버 사이드 커서에서 한 번에 가져올 행 수
+# 다음 증분 추출 기준 시각을 추출 시작 시각보다 이만큼 앞당김 (추출 중에 커밋된 쓰기 트랜잭션을 놓치지 않도록)
+EXPORT_WATERMARK_LAG = float(os.getenv("EXPORT_WATERMARK_LAG", "60"))  # 초
+
 
-        if not results:
-            return "", []
-
-        # CSV 파일 생성
-        output = StringIO()
-        writer = csv.writer(output)
-        writer.writerow(["novel_no", "novel_short_no", "content", "views", "likes", "saves"])
-
-        data = []
-        for row in results:
-            data_row = {
-                "novel_no": row.novel_no,
-                "novel_short_no": row.novel_short_no,
-                "content": row.content,
-                "views": row.views,
-                "likes": row.likes,
-                "saves": row.saves,
-            }
-            data.append(data_row)
-            writer.writerow(data_row.values())
-
-        return output.getvalue(), data
+def novel_shorts_export_query(with_comments: bool = False, changed_since: Optional[datetime] = None):
+    columns = [
+        Novel.no.label("novel_no"),
+        NovelShorts.no.label("novel_short_no"),
+        NovelShorts.content,
+        NovelShorts.views,
+        NovelShorts.likes,
+        NovelShorts.saves,
+    ]
+    if with_comments:
+        columns.append(NovelShorts.comments)
+    query = select(*columns).join(NovelShorts, Novel.no == NovelShorts.novel_no).order_by(Novel.no, NovelShorts.no)
+    if changed_since is not None:
+        # updated_date 인덱스로 변경된 숏츠만 조회
+        query = query.where(NovelShorts.updated_date >= changed_since)
+    return query
 
+
+async def get_export_watermark(db: AsyncSession) -> datetime:
+    """이번 추출 이후의 증분 추출에 사용할 기준 시각
+
+    updated_date는 쓰기 트랜잭션의 시작 시각이므로, 추출보다 먼저 시작해 나중에 커밋된 변경도 다음 추출에 포함되도록
+    EXPORT_WATERMARK_LAG만큼 앞당긴다. 겹치는 구간의 행은 다시 전달되므로 받는 쪽은 novel_short_no 기준으로 upsert한다.
+    """
+    return await db.scalar(select(func.localtimestamp())) - timedelta(seconds=EXPORT_WATERMARK_LAG)
+
+
+async def has_novel_shorts(db: AsyncSession, changed_since: Optional[datetime] = None) -> bool:
+    """내보낼 숏츠가 하나라도 있는지 확인"""
+    query = select(NovelShorts.no).join(Novel, Novel.no == NovelShorts.novel_no).limit(1)
+    if changed_since is not None:
+        query = query.where(NovelShorts.updated_date >= changed_since)
+    return await db.scalar(query) is not None
+
+
+async def stream_novel_shorts_csv(
+    db: AsyncSession, batch_size: int = EXPORT_BATCH_SIZE, changed_since: Optional[datetime] = None
+) -> AsyncIterator[str]:
+    """소설/숏츠 CSV를 batch_size 행 단위 청크로 생성 (서버 사이드 커서를 사용해 메모리 사용량이 행 수와 무관)"""
+    output = StringIO()
+    writer = csv.writer(output)
+    writer.writerow(CSV_EXPORT_COLUMNS)
+
+    try:
+        query = novel_shorts_export_query(changed_since=changed_since)
+        result = await db.stream(query.execution_options(yield_per=batch_size))
+        async for rows in result.partitions():
+            writer.writerows(rows)
+            yield output.getvalue()
+            output.seek(0)
+            output.truncate()
     except Exception as e:
-        print(f"Error in get_novel_shorts_csv: {str(e)}")
-        return "", []
+        # 응답 헤더가 이미 전송된 뒤이므로 연결을 끊어 클라이언트가 불완전한 파일임을 알 수 있게 함
+        print(f"Error in stream_novel_shorts_csv: {str(e)}")
+        raise
+
+    if output.tell():
+        yield output.getvalue()
+
+
+# 컬럼형 추출 형식별 (Content-Type, 파일 확장자)
+COLUMNAR_EXPORT_FORMATS = {
+    "arrow": ("application/vnd.apache.arrow.stream", "arrows"),
+    "parquet": ("application/vnd.apache.parquet", "parquet"),
+}
+
+
+class _ChunkSink:
+    """pyarrow writer가 쓴 바이트를 모아 두었다가 청크 단위로 꺼내는 쓰기 전용 파일 객체"""
+
+    def __init__(self):
+        self._buffer = bytearray()
+        self._position = 0
+        self.closed = False
+
+    def write(self, data) -> int:
+        self._buffer += data
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def flush(self) -> None:
+        pass
+
+    def close(self) -> None:
+        self.closed = True
+
+    def take(self) -> bytes:
+        data = bytes(self._buffer)
+        self._buffer.clear()
+        return data
+
+
+async def stream_novel_shorts_columnar(
+    db: AsyncSession,
+    file_format: str = "arrow",
+    batch_size: int = EXPORT_BATCH_SIZE,
+    changed_since: Optional[datetime] = None,
+) -> AsyncIterator[bytes]:
+    """소설/숏츠 데이터를 Arrow IPC 스트림 또는 Parquet(배치마다 row group 1개)으로 생성"""
+    # 추출 요청에서만 쓰는 무거운 모듈이므로 필요할 때 import
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    schema = pa.schema(
+        [
+            ("novel_no", pa.int32()),
+            ("novel_short_no", pa.int32()),
+            ("content", pa.string()),
+            ("views", pa.int32()),
+            ("likes", pa.int32()),
+            ("saves", pa.int32()),
+            ("comments", pa.int32()),
+        ]
+    )
+    sink = _ChunkSink()
+    if file_format == "parquet":
+        writer = pq.ParquetWriter(sink, schema, compression="zstd")
+    else:
+        writer = pa.ipc.new_stream(sink, schema, options=pa.ipc.IpcWriteOptions(compression="zstd"))
+
+    try:
+        query = novel_shorts_export_query(with_comments=True, changed_since=changed_since)
+        result = await db.stream(query.execution_options(yield_per=batch_size))
+        async for rows in result.partitions():
+            columns = zip(*rows)
+            batch = pa.record_batch(
+                [pa.array(values, type=field.type) for values, field in zip(columns, schema)], schema=schema
+            )
+            if file_format == "parquet":
+                writer.write_table(pa.Table.from_batches([batch]))
+            else:
+                writer.write_batch(batch)
+            yield sink.take()
+
+        writer.close()
+        yield sink.take()
+    except Exception as e:
+        print(f"Error in stream_novel_shorts_columnar: {str(e)}")
+        raise
 
 
-def update_shorts_media_by_novel_id(
-    db: Session,
+async def update_shorts_media_by_novel_id(
+    db: AsyncSession,
     novel_id: int,
     form_type: Optional[int] = None,
     image_path: Optional[str] = None,
@@ -459,28 +767,37 @@ def update_shorts_media_by_novel_id(
 ) -> NovelShortsResponse:
     try:
         # source_id로 novel_no 찾기
-        novel_no = get_novel_no_by_source_id(db, novel_id)
+        novel_no = await get_novel_no_by_source_id(db, novel_id)
         if not novel_no:
             return NovelShortsResponse(success=False, message="해당하는 소설을 찾을 수 없습니다")
 
         # novel_no로 모든 shorts 찾기
-        shorts_list = db.query(NovelShorts).filter(NovelShorts.novel_no == novel_no).all()
+        shorts_list = (
+            await db.scalars(select(NovelShorts).where(NovelShorts.novel_no == novel_no).with_for_update())
+        ).all()
         if not shorts_list:
             return NovelShortsResponse(success=False, message="해당하는 숏츠가 없습니다")
 
-        # 모든 shorts 업데이트
+        # 모든 shorts 업데이트 (같은 파일을 여러 숏츠가 가리키면 그 수만큼 참조)
+        added, removed = [], []
         for shorts in shorts_list:
             if form_type is not None:
                 shorts.form_type = form_type
             if image_path:
+                added.append(image_path)
+                removed.append(shorts.image)
                 shorts.image = image_path
             if music_path:
+                added.append(music_path)
+                removed.append(shorts.music)
                 shorts.music = music_path
+        await adjust_media_refs(db, added, removed)
 
-        db.commit()
+        await db.commit()
+        await cache.delete(*[post_cache_key(shorts.no) for shorts in shorts_list])
         return NovelShortsResponse(success=True, message="숏츠가 업데이트되었습니다")
 
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         print(f"Error updating shorts media: {str(e)}")
         return NovelShortsResponse(success=False, message="숏츠 업데이트 중 오류가 발생했습니다")
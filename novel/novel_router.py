@@ -2,7 +2,7 @@ from typing import List, Optional
 
 from auth.jwt_bearer import JWTBearer
 from database import get_db
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from novel.novel_query import (
     get_post,
     get_posts,
@@ -16,7 +16,9 @@ from novel.novel_schema import (
     PostResponse,
     SaveResponse,
 )
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+from utils.pagination import decode_cursor, encode_cursor
+from utils.serialization import fast_response
 
 
 app = APIRouter(prefix="/shorts")
@@ -24,60 +26,77 @@ app = APIRouter(prefix="/shorts")
 jwt_bearer = JWTBearer()
 
 
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
 @app.get(path="", response_model=List[PostResponse], description="숏츠 - 목록 조회")
 async def read_posts(
+    response: Response,
     limit: int = Query(default=10, ge=1, le=100),
     offset: int = Query(default=0, ge=0),
+    cursor: Optional[str] = Query(default=None, description="이전 응답의 X-Next-Cursor 값 (지정 시 offset 무시)"),
     current_user: Optional[dict] = Depends(jwt_bearer),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
 ):
     user_no = current_user["user_no"] if current_user else None
-    result = get_posts(db, limit, offset, user_no)
+
+    after_no = None
+    if cursor:
+        try:
+            after_no = int(decode_cursor(cursor)[0])
+        except (ValueError, TypeError):
+            raise HTTPException(status_code=400, detail="올바르지 않은 커서입니다")
+
+    result = await get_posts(db, limit, offset, user_no, after_no=after_no)
     if isinstance(result, dict) and "error" in result:
         raise HTTPException(status_code=400, detail=result["msg"])
-    return result
+
+    # 다음 페이지가 있을 수 있으면 마지막 숏츠 번호를 커서로 전달
+    if len(result) == limit:
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(result[-1].no)
+    return fast_response(result, List[PostResponse], response)
 
 
 @app.get(path="/{post_no}", response_model=PostResponse, description="숏츠 - 상세 조회")
 async def read_post(
     post_no: int,
     current_user: Optional[dict] = Depends(jwt_bearer),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
 ):
     user_no = current_user["user_no"] if current_user else None
-    result = get_post(post_no, user_no, db)
+    result = await get_post(post_no, user_no, db)
     if isinstance(result, dict) and "error" in result:
         raise HTTPException(status_code=400, detail=result["msg"])
     return result
 
 
 @app.post("/{shorts_no}/like", response_model=LikeResponse, description="숏츠 - 좋아요")
-async def like_shorts(shorts_no: int, current_user: dict = Depends(jwt_bearer), db: Session = Depends(get_db)):
-    result = like_novel_shorts(db, current_user["user_no"], shorts_no)
+async def like_shorts(shorts_no: int, current_user: dict = Depends(jwt_bearer), db: AsyncSession = Depends(get_db)):
+    result = await like_novel_shorts(db, current_user["user_no"], shorts_no)
     if not result.success:
         raise HTTPException(status_code=400, detail=result.message)
     return result
 
 
 @app.delete("/{shorts_no}/like", response_model=LikeResponse, description="숏츠 - 좋아요 취소")
-async def unlike_shorts(shorts_no: int, current_user: dict = Depends(jwt_bearer), db: Session = Depends(get_db)):
-    result = unlike_novel_shorts(db, current_user["user_no"], shorts_no)
+async def unlike_shorts(shorts_no: int, current_user: dict = Depends(jwt_bearer), db: AsyncSession = Depends(get_db)):
+    result = await unlike_novel_shorts(db, current_user["user_no"], shorts_no)
     if not result.success:
         raise HTTPException(status_code=400, detail=result.message)
     return result
 
 
 @app.post("/{shorts_no}/save", response_model=SaveResponse, description="숏츠 - 저장")
-async def save_shorts(shorts_no: int, current_user: dict = Depends(jwt_bearer), db: Session = Depends(get_db)):
-    result = save_novel_shorts(db, current_user["user_no"], shorts_no)
+async def save_shorts(shorts_no: int, current_user: dict = Depends(jwt_bearer), db: AsyncSession = Depends(get_db)):
+    result = await save_novel_shorts(db, current_user["user_no"], shorts_no)
     if not result.success:
         raise HTTPException(status_code=400, detail=result.message)
     return result
 
 
 @app.delete("/{shorts_no}/save", response_model=SaveResponse, description="숏츠 - 저장 취소")
-async def unsave_shorts(shorts_no: int, current_user: dict = Depends(jwt_bearer), db: Session = Depends(get_db)):
-    result = unsave_novel_shorts(db, current_user["user_no"], shorts_no)
+async def unsave_shorts(shorts_no: int, current_user: dict = Depends(jwt_bearer), db: AsyncSession = Depends(get_db)):
+    result = await unsave_novel_shorts(db, current_user["user_no"], shorts_no)
     if not result.success:
         raise HTTPException(status_code=400, detail=result.message)
     return result
@@ -1,5 +1,5 @@
 from datetime import datetime
-from typing import List, Optional
+from typing import Dict, List, Optional
 
 from fastapi import UploadFile
 from pydantic import BaseModel
@@ -9,6 +9,8 @@ class PostResponse(BaseModel):
     no: int
     form_type: int
     content: str
+    image: Optional[str] = None
+    image_variants: Optional[Dict[str, str]] = None  # 파생본 경로 (thumb, feed WebP), 업로드 이미지가 아니면 None
     music: Optional[str] = None
     views: int
     likes: int
@@ -25,6 +27,11 @@ class PostResponse(BaseModel):
                 "no": 1,
                 "form_type": 1,
                 "content": "숏츠 내용...",
+                "image": "uploads/images/ab/ab12...ef.png",
+                "image_variants": {
+                    "thumb": "uploads/derived/ab/ab12...ef_320.webp",
+                    "feed": "uploads/derived/ab/ab12...ef_1080.webp",
+                },
                 "music": "uploads/music/example.mp3",
                 "views": 100,
                 "likes": 50,
@@ -51,6 +58,7 @@ class SaveResponse(BaseModel):
 
 
 class NovelCreate(BaseModel):
+    # 필수: (source_platform_type, source_id)가 upsert 키라 NULL이면 ON CONFLICT에 걸리지 않아 중복 INSERT됨
     source_platform_type: int
     source_id: Optional[int] = None
     source_type: int
@@ -100,6 +108,33 @@ class NovelCreateWithAdmin(AdminRequest):
     novel_data: NovelCreate
 
 
+class NovelBulkCreateWithAdmin(AdminRequest):
+    novels: List[NovelCreate]
+
+
+class NovelShortsBulkCreateWithAdmin(AdminRequest):
+    shorts: List[NovelShortsCreate]
+
+
+class BulkRecordResult(BaseModel):
+    index: int  # 요청 목록에서의 위치
+    status: str  # created / updated / duplicate(같은 요청 안의 뒤 레코드로 대체) / novel_not_found
+    novel_no: Optional[int] = None
+    shorts_no: Optional[int] = None
+
+
+class BulkIngestResponse(BaseModel):
+    success: bool
+    message: str
+    total: int
+    created: int = 0
+    updated: int = 0
+    skipped: int = 0
+    elapsed_ms: float = 0
+    rows_per_second: float = 0
+    results: List[BulkRecordResult] = []
+
+
 class NovelShortsCreateWithAdmin(AdminRequest):
     shorts_data: NovelShortsCreate
     music_file: Optional[UploadFile] = None  # 음악 파일은 선택사항
@@ -129,6 +164,7 @@ class NovelShortsWithComments(BaseModel):
     form_type: int
     content: str
     image: str
+    image_variants: Optional[Dict[str, str]] = None
     music: str
     views: int
     likes: int
@@ -144,6 +180,7 @@ class NovelDetailResponse(BaseModel):
     description: str
     genres: List[int]
     cover_image: str
+    cover_image_variants: Optional[Dict[str, str]] = None
     chapters: int
     views: int
     recommends: int
@@ -1,9 +1,11 @@
 import os
 
-from database import Base
+from database import Base, get_db
+from httpx import ASGITransport, AsyncClient
 import pytest
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy import create_engine, event
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.pool import NullPool
 
 
 # 테스트용 데이터베이스 설정
@@ -26,6 +28,14 @@ TEST_DB_PORT = os.getenv("TEST_DB_PORT", "5432")
 TEST_DB_NAME = os.getenv("TEST_DB_NAME", "test_db")
 
 TEST_DB_URL = f"postgresql://{TEST_DB_USER}:{TEST_DB_PASSWORD}@{TEST_DB_HOST}:{TEST_DB_PORT}/{TEST_DB_NAME}"
+TEST_ASYNC_DB_URL = (
+    f"postgresql+asyncpg://{TEST_DB_USER}:{TEST_DB_PASSWORD}@{TEST_DB_HOST}:{TEST_DB_PORT}/{TEST_DB_NAME}"
+)
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
 
 
 @pytest.fixture(scope="session")
@@ -41,13 +51,50 @@ def tables(engine):
 
 
 @pytest.fixture
-def db_session(engine, tables):
-    connection = engine.connect()
-    transaction = connection.begin()
-    session = sessionmaker(bind=connection)()
+async def async_engine(tables):
+    # 테스트마다 이벤트 루프가 바뀌므로 커넥션을 풀에 남기지 않음
+    engine = create_async_engine(TEST_ASYNC_DB_URL, poolclass=NullPool)
+    yield engine
+    await engine.dispose()
+
+
+@pytest.fixture
+async def db_session(async_engine):
+    async with async_engine.connect() as connection:
+        transaction = await connection.begin()
+        # 테스트/앱 코드의 commit은 SAVEPOINT로 처리하고, 테스트가 끝나면 전체 롤백
+        session = AsyncSession(bind=connection, expire_on_commit=False, join_transaction_mode="create_savepoint")
+
+        yield session
+
+        await session.close()
+        await transaction.rollback()
+
+
+@pytest.fixture
+async def client(db_session):
+    from main import app
+
+    async def override_get_db():
+        yield db_session
+
+    app.dependency_overrides[get_db] = override_get_db
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        yield client
+    app.dependency_overrides.clear()
+
+
+@pytest.fixture
+async def query_counter(db_session):
+    """db_session 커넥션에서 실행된 SQL 문 목록 (N+1 회귀 검사용)"""
+    statements = []
 
-    yield session
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        # 테스트 격리용 SAVEPOINT는 제외
+        if "SAVEPOINT" not in statement:
+            statements.append(statement)
 
-    session.close()
-    transaction.rollback()
-    connection.close()
+    connection = (await db_session.connection()).sync_connection
+    event.listen(connection, "before_cursor_execute", before_cursor_execute)
+    yield statements
+    event.remove(connection, "before_cursor_execute", before_cursor_execute)
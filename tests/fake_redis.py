@@ -0,0 +1,144 @@
+import asyncio
+import time
+from typing import Dict, List, Optional, Set, Tuple
+
+
+class FakeRedisServer:
+    """테스트용 최소 RESP2 서버 (RedisCacheBackend가 쓰는 명령만 지원)
+
+    GET/MGET/SET(PX, EX)/DEL/PUBLISH/SUBSCRIBE/UNSUBSCRIBE/PING/CLIENT/SELECT
+    """
+
+    def __init__(self):
+        self.data: Dict[bytes, Tuple[bytes, Optional[float]]] = {}
+        self.subscribers: Dict[bytes, Set[asyncio.StreamWriter]] = {}
+        self.connections: Set[asyncio.StreamWriter] = set()
+        self.server: Optional[asyncio.AbstractServer] = None
+        self.port: Optional[int] = None
+
+    @property
+    def url(self) -> str:
+        return f"redis://127.0.0.1:{self.port}/0"
+
+    async def start(self) -> None:
+        self.server = await asyncio.start_server(self._handle, "127.0.0.1", 0)
+        self.port = self.server.sockets[0].getsockname()[1]
+
+    async def stop(self) -> None:
+        self.drop_connections()
+        self.server.close()
+        await self.server.wait_closed()
+
+    def drop_connections(self) -> None:
+        """서버 재시작/네트워크 단절 상황 재현"""
+        for writer in list(self.connections):
+            writer.close()
+        self.connections.clear()
+        self.subscribers.clear()
+
+    async def _read_command(self, reader: asyncio.StreamReader) -> Optional[List[bytes]]:
+        line = await reader.readline()
+        if not line:
+            return None
+        assert line.startswith(b"*"), line
+        args = []
+        for _ in range(int(line[1:])):
+            size = int((await reader.readline())[1:])
+            args.append((await reader.readexactly(size + 2))[:-2])
+        return args
+
+    @staticmethod
+    def _encode(value) -> bytes:
+        if value is None:
+            return b"$-1\r\n"
+        if isinstance(value, int):
+            return b":%d\r\n" % value
+        if isinstance(value, str):
+            return b"+" + value.encode() + b"\r\n"
+        if isinstance(value, list):
+            return b"*%d\r\n" % len(value) + b"".join(FakeRedisServer._encode(item) for item in value)
+        return b"$%d\r\n" % len(value) + value + b"\r\n"
+
+    def _get(self, key: bytes) -> Optional[bytes]:
+        entry = self.data.get(key)
+        if entry is None:
+            return None
+        value, expires_at = entry
+        if expires_at is not None and expires_at <= time.monotonic():
+            del self.data[key]
+            return None
+        return value
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self.connections.add(writer)
+        try:
+            while True:
+                args = await self._read_command(reader)
+                if args is None:
+                    break
+                writer.write(self._execute(args, writer))
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            self.connections.discard(writer)
+            for writers in self.subscribers.values():
+                writers.discard(writer)
+            writer.close()
+
+    def _execute(self, args: List[bytes], writer: asyncio.StreamWriter) -> bytes:
+        command = args[0].decode().lower()
+        handler = getattr(self, f"_cmd_{command}", None)
+        if handler is None:
+            return b"-ERR unknown command '" + args[0] + b"'\r\n"
+        return handler(args[1:], writer)
+
+    def _cmd_ping(self, args, writer) -> bytes:
+        return self._encode("PONG")
+
+    def _cmd_client(self, args, writer) -> bytes:
+        return self._encode("OK")
+
+    _cmd_select = _cmd_client
+
+    def _cmd_get(self, args, writer) -> bytes:
+        return self._encode(self._get(args[0]))
+
+    def _cmd_mget(self, args, writer) -> bytes:
+        return self._encode([self._get(key) for key in args])
+
+    def _cmd_set(self, args, writer) -> bytes:
+        key, value, options = args[0], args[1], [option.upper() for option in args[2:]]
+        expires_at = None
+        if b"PX" in options:
+            expires_at = time.monotonic() + int(options[options.index(b"PX") + 1]) / 1000
+        elif b"EX" in options:
+            expires_at = time.monotonic() + int(options[options.index(b"EX") + 1])
+        self.data[key] = (value, expires_at)
+        return self._encode("OK")
+
+    def _cmd_del(self, args, writer) -> bytes:
+        return self._encode(sum(1 for key in args if self.data.pop(key, None) is not None))
+
+    def _cmd_publish(self, args, writer) -> bytes:
+        channel, message = args
+        receivers = list(self.subscribers.get(channel, ()))
+        for receiver in receivers:
+            receiver.write(self._encode([b"message", channel, message]))
+        return self._encode(len(receivers))
+
+    def _cmd_subscribe(self, args, writer) -> bytes:
+        replies = []
+        for channel in args:
+            self.subscribers.setdefault(channel, set()).add(writer)
+            count = sum(1 for writers in self.subscribers.values() if writer in writers)
+            replies.append(self._encode([b"subscribe", channel, count]))
+        return b"".join(replies)
+
+    def _cmd_unsubscribe(self, args, writer) -> bytes:
+        channels = args or [channel for channel, writers in self.subscribers.items() if writer in writers]
+        replies = []
+        for channel in channels:
+            self.subscribers.get(channel, set()).discard(writer)
+            replies.append(self._encode([b"unsubscribe", channel, 0]))
+        return b"".join(replies) or self._encode([b"unsubscribe", None, 0])
@@ -0,0 +1,77 @@
+from datetime import datetime, timedelta, timezone
+import hashlib
+
+from auth import jwt_bearer
+from fastapi import HTTPException
+from jose import jwt
+import pytest
+from utils.cache import TTLCache
+
+
+class FakeTimer:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def timer(monkeypatch):
+    timer = FakeTimer()
+    monkeypatch.setattr(jwt_bearer, "SECRET_KEY", "test-secret")
+    monkeypatch.setattr(jwt_bearer, "ALGORITHM", "HS256")
+    monkeypatch.setattr(jwt_bearer, "token_cache", TTLCache(maxsize=10, ttl=3600, timer=timer))
+    return timer
+
+
+@pytest.fixture
+def decode_calls(monkeypatch):
+    calls = []
+    decode = jwt.decode
+
+    def counting_decode(*args, **kwargs):
+        calls.append(args[0])
+        return decode(*args, **kwargs)
+
+    monkeypatch.setattr(jwt, "decode", counting_decode)
+    return calls
+
+
+def make_token(expires_in: timedelta, **claims) -> str:
+    payload = {"sub": "testuser", "user_no": 1, "exp": datetime.now(timezone.utc) + expires_in, **claims}
+    return jwt.encode(payload, "test-secret", algorithm="HS256")
+
+
+def test_verify_token_skips_decode_until_exp(timer, decode_calls):
+    token = make_token(timedelta(seconds=60))
+
+    assert jwt_bearer.verify_token(token) == {"user_id": "testuser", "user_no": 1}
+    assert jwt_bearer.verify_token(token) == {"user_id": "testuser", "user_no": 1}
+    assert len(decode_calls) == 1
+
+    # 토큰의 exp가 지나면 캐시 항목도 만료되어 다시 검증
+    timer.now = 61
+    jwt_bearer.verify_token(token)
+    assert len(decode_calls) == 2
+
+
+def test_verify_token_does_not_cache_rejections(timer, decode_calls):
+    expired = make_token(timedelta(seconds=-1))
+    tampered = make_token(timedelta(seconds=60))[:-2] + "xx"
+
+    for token in (expired, expired, tampered):
+        with pytest.raises(HTTPException) as exc_info:
+            jwt_bearer.verify_token(token)
+        assert exc_info.value.status_code == 403
+
+    assert len(decode_calls) == 3
+    assert len(jwt_bearer.token_cache) == 0
+
+
+def test_verify_token_cache_is_keyed_by_digest(timer):
+    token = make_token(timedelta(seconds=60))
+    jwt_bearer.verify_token(token)
+
+    assert jwt_bearer.token_cache.get(hashlib.sha256(token.encode()).digest()) == {"user_id": "testuser", "user_no": 1}
+    assert jwt_bearer.token_cache.get(token) is None
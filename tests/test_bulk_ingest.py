@@ -0,0 +1,109 @@
+from models import Novel, NovelShorts
+from novel.admin_router import ADMIN_CODE
+from novel.novel_query import bulk_create_novel_shorts, bulk_upsert_novels
+from novel.novel_schema import NovelCreate, NovelShortsCreate
+import pytest
+from sqlalchemy import select
+
+
+pytestmark = pytest.mark.anyio
+
+
+def novel_data(source_id, title="일괄 소설", views=0) -> dict:
+    return {
+        "source_platform_type": 1,
+        "source_id": source_id,
+        "source_type": 1,
+        "source_url": f"http://test.com/{source_id}",
+        "title": title,
+        "author": "일괄 작가",
+        "description": "설명",
+        "genres": [1, 2],
+        "views": views,
+    }
+
+
+async def test_bulk_upsert_novels_reports_each_record(db_session, query_counter):
+    db_session.add(Novel(source_platform_type=1, source_id=9101, title="예전 제목", views=1))
+    await db_session.commit()
+    query_counter.clear()
+
+    records = [
+        NovelCreate(**novel_data(9101, title="새 제목", views=10)),
+        NovelCreate(**novel_data(9102)),
+        NovelCreate(**novel_data(9103, views=1)),
+        NovelCreate(**novel_data(9103, views=2)),  # 같은 요청 안의 중복은 마지막 값으로 적재
+        NovelCreate(**novel_data(None)),
+    ]
+    result = await bulk_upsert_novels(db_session, records)
+
+    assert result.success
+    assert [(record.index, record.status) for record in result.results] == [
+        (0, "updated"),
+        (1, "created"),
+        (2, "duplicate"),
+        (3, "created"),
+        (4, "missing_source_id"),
+    ]
+    assert (result.total, result.created, result.updated, result.skipped) == (5, 2, 1, 2)
+    assert result.rows_per_second > 0
+
+    rows = await db_session.scalars(select(Novel).where(Novel.source_id.in_([9101, 9102, 9103])))
+    novels = {novel.source_id: novel for novel in rows}
+    assert result.results[0].novel_no == novels[9101].no
+    assert (novels[9101].title, novels[9101].views) == ("새 제목", 10)
+    assert novels[9103].views == 2
+    assert len([statement for statement in query_counter if statement.startswith("INSERT INTO novel (")]) == 1
+
+
+async def test_bulk_create_shorts_resolves_source_ids_in_one_query(db_session, query_counter):
+    novels = [Novel(source_platform_type=1, source_id=source_id, title="숏츠 소설") for source_id in (9201, 9202)]
+    db_session.add_all(novels)
+    await db_session.commit()
+    query_counter.clear()
+
+    records = [
+        NovelShortsCreate(novel_id=source_id, content=f"내용 {i}")
+        for i, source_id in enumerate([9201] * 3 + [9299, 9202])
+    ]
+    result = await bulk_create_novel_shorts(db_session, records, [None] * len(records))
+
+    assert result.success
+    assert [record.status for record in result.results] == ["created"] * 3 + ["novel_not_found", "created"]
+    assert [record.novel_no for record in result.results] == [novels[0].no] * 3 + [None, novels[1].no]
+
+    created = {record.shorts_no: record.index for record in result.results if record.shorts_no}
+    rows = await db_session.execute(select(NovelShorts.no, NovelShorts.content).where(NovelShorts.no.in_(created)))
+    assert dict(rows.all()) == {no: f"내용 {index}" for no, index in created.items()}
+
+    selects = [statement for statement in query_counter if statement.startswith("SELECT novel.source_id")]
+    assert len(selects) == 1
+    assert len([statement for statement in query_counter if statement.startswith("INSERT INTO novel_shorts")]) == 1
+
+
+async def test_bulk_endpoints(client, db_session):
+    response = await client.post(
+        "/admin/novels/bulk", json={"admin_code": ADMIN_CODE, "novels": [novel_data(9301), novel_data(9302)]}
+    )
+    assert response.status_code == 200
+    assert [record["status"] for record in response.json()["results"]] == ["created", "created"]
+
+    response = await client.post(
+        "/admin/shorts/bulk",
+        json={"admin_code": ADMIN_CODE, "shorts": [{"novel_id": 9301, "content": "내용"}]},
+    )
+    assert response.status_code == 200
+    shorts_no = response.json()["results"][0]["shorts_no"]
+    music = await db_session.scalar(select(NovelShorts.music).where(NovelShorts.no == shorts_no))
+    assert music.endswith("/music/9301.wav")
+
+    # 플랫폼 없는 레코드는 upsert 키가 NULL이라 다시 보낼 때마다 중복 INSERT되므로 요청 단계에서 거절
+    response = await client.post(
+        "/admin/novels/bulk",
+        json={"admin_code": ADMIN_CODE, "novels": [{**novel_data(9303), "source_platform_type": None}]},
+    )
+    assert response.status_code == 422
+    assert await db_session.scalar(select(Novel.no).where(Novel.source_id == 9303)) is None
+
+    response = await client.post("/admin/novels/bulk", json={"admin_code": "wrong", "novels": []})
+    assert response.status_code == 403
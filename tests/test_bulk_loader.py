@@ -0,0 +1,162 @@
+from datetime import datetime
+import json
+
+from loader.copy_loader import LoaderError, copy_value, get_checkpoint, load_file
+from models import BulkLoadCheckpoint, MediaFile, Novel, NovelShorts
+import pytest
+from sqlalchemy import and_, delete, func, or_, select
+
+
+LOADER_PLATFORM = 96  # 테스트 데이터 구분용 source_platform_type
+UNKEYED_TITLE = "플랫폼 없는 적재 소설"  # 플랫폼 없이 들어간 소설 정리용
+
+
+@pytest.fixture
+def loader_engine(engine, tables):
+    """COPY 적재는 배치마다 커밋하므로 테스트가 끝나면 직접 지움"""
+    yield engine
+    novel_nos = select(Novel.no).where(
+        or_(
+            Novel.source_platform_type.in_([LOADER_PLATFORM, LOADER_PLATFORM + 1]),
+            and_(Novel.source_platform_type.is_(None), Novel.title == UNKEYED_TITLE),
+        )
+    )
+    with engine.begin() as connection:
+        connection.execute(delete(NovelShorts).where(NovelShorts.novel_no.in_(novel_nos)))
+        connection.execute(delete(Novel).where(Novel.no.in_(novel_nos)))
+        connection.execute(delete(MediaFile).where(MediaFile.path.like("uploads/music/loader-test%")))
+        connection.execute(delete(BulkLoadCheckpoint))
+
+
+def write_jsonl(path, records):
+    path.write_text("".join(json.dumps(record, ensure_ascii=False) + "\n" for record in records), encoding="utf-8")
+    return path
+
+
+def novel_record(source_id, **values) -> dict:
+    return {"source_platform_type": LOADER_PLATFORM, "source_id": source_id, "title": "적재 소설", **values}
+
+
+def load_quietly(engine, kind, path, **kwargs) -> dict:
+    return load_file(engine, kind, path, report=lambda message: None, **kwargs)
+
+
+def fetch_novels(engine) -> dict:
+    with engine.connect() as connection:
+        rows = connection.execute(select(Novel).where(Novel.source_platform_type == LOADER_PLATFORM)).mappings()
+        return {row["source_id"]: row for row in rows}
+
+
+def test_copy_value_escapes_text_format():
+    assert copy_value(None) == "\\N"
+    assert copy_value("탭\t줄\n역\\") == "탭\\t줄\\n역\\\\"
+    assert copy_value([1, 2]) == '{"1","2"}'
+    assert copy_value(['a"b', None]) == '{"a\\\\"b",NULL}'
+    assert copy_value(True) == "t"
+
+
+def test_load_novels_upserts_last_record_and_keeps_missing_columns(loader_engine, tmp_path):
+    with loader_engine.begin() as connection:
+        connection.execute(
+            Novel.__table__.insert().values(
+                source_platform_type=LOADER_PLATFORM,
+                source_id=1,
+                title="예전 제목",
+                author="작가",
+                created_date=datetime(2024, 1, 1),
+            )
+        )
+
+    path = write_jsonl(
+        tmp_path / "novels.jsonl",
+        [
+            novel_record(1, title="새 제목", views=10, created_date="2025-01-01T00:00:00", source_type=1),
+            novel_record(2, genres=[1, 3], description="첫 줄\n둘째 줄\t탭"),
+            novel_record(3, views=1),
+            novel_record(3, views=2),  # 같은 배치 안의 중복은 파일에서 마지막 레코드로 적재
+            novel_record(None),
+            novel_record(4, source_platform_type=None, title=UNKEYED_TITLE),
+        ],
+    )
+    result = load_quietly(loader_engine, "novels", path)
+
+    assert (result["records"], result["created"], result["updated"], result["skipped"]) == (6, 2, 1, 3)
+    assert result["missing_key"] == 2
+    assert result["rows_per_second"] > 0
+    novels = fetch_novels(loader_engine)
+    assert (novels[1]["title"], novels[1]["views"]) == ("새 제목", 10)
+    assert novels[1]["author"] == "작가"  # 파일에 없는 컬럼은 덮어쓰지 않음
+    assert novels[1]["created_date"] == datetime(2024, 1, 1)
+    assert (novels[2]["genres"], novels[2]["description"]) == ([1, 3], "첫 줄\n둘째 줄\t탭")
+    assert novels[3]["views"] == 2
+
+    # 다시 적재해도 플랫폼 없는 레코드가 중복 INSERT되지 않음
+    load_quietly(loader_engine, "novels", path, restart=True)
+    with loader_engine.connect() as connection:
+        assert connection.scalar(select(func.count()).where(Novel.title == UNKEYED_TITLE)) == 0
+
+
+def test_load_resumes_from_checkpoint_after_failure(loader_engine, tmp_path):
+    records = [novel_record(source_id) for source_id in range(100, 112)]
+    lines = [json.dumps(record) for record in records]
+    path = tmp_path / "novels.jsonl"
+    path.write_text("\n".join(lines[:7] + ["{broken"] + lines[8:]) + "\n")
+
+    with pytest.raises(LoaderError):
+        load_quietly(loader_engine, "novels", path, batch_size=3)
+    with loader_engine.connect() as connection:
+        assert get_checkpoint(connection, "novels:novels.jsonl")["position"] == 6  # 마지막으로 커밋한 배치까지
+    assert set(fetch_novels(loader_engine)) == set(range(100, 106))
+
+    path.write_text("\n".join(lines) + "\n")
+    result = load_quietly(loader_engine, "novels", path, batch_size=3)
+
+    assert (result["records"], result["created"], result["updated"]) == (6, 6, 0)
+    assert set(fetch_novels(loader_engine)) == set(range(100, 112))
+    with loader_engine.connect() as connection:
+        checkpoint = get_checkpoint(connection, "novels:novels.jsonl")
+    assert (checkpoint["position"], checkpoint["created_rows"]) == (12, 12)
+
+    # 다 적재한 파일은 다시 실행해도 적재하지 않고, --restart면 처음부터
+    assert load_quietly(loader_engine, "novels", path)["records"] == 0
+    assert load_quietly(loader_engine, "novels", path, restart=True)["updated"] == 12
+
+
+def test_load_shorts_resolves_source_ids_and_counts_media_refs(loader_engine, tmp_path):
+    with loader_engine.begin() as connection:
+        # 플랫폼 없이 먼저 들어간 같은 source_id의 소설은 (플랫폼, source_id)로 유일하지 않아 연결 대상이 아님
+        connection.execute(Novel.__table__.insert().values(source_id=501, title=UNKEYED_TITLE))
+        first, second, other_platform = [
+            connection.scalar(Novel.__table__.insert().values(title="적재 소설", **values).returning(Novel.no))
+            for values in [
+                {"source_platform_type": LOADER_PLATFORM, "source_id": 500},
+                {"source_platform_type": LOADER_PLATFORM, "source_id": 501},
+                {"source_platform_type": LOADER_PLATFORM + 1, "source_id": 500},
+            ]
+        ]
+        connection.execute(MediaFile.__table__.insert().values(path="uploads/music/loader-test.wav", ref_count=0))
+
+    path = tmp_path / "shorts.csv"
+    path.write_text(
+        "novel_id,source_platform_type,content,music\n"
+        '500,,"쉼표, 포함",uploads/music/loader-test.wav\n'
+        f"500,{LOADER_PLATFORM + 1},다른 플랫폼,uploads/music/loader-test.wav\n"
+        "599,,없는 소설,\n"
+        "501,,,\n",
+        encoding="utf-8",
+    )
+    result = load_quietly(loader_engine, "shorts", path)
+
+    assert (result["created"], result["skipped"]) == (3, 1)
+    with loader_engine.connect() as connection:
+        rows = connection.execute(
+            select(NovelShorts.novel_no, NovelShorts.content, NovelShorts.form_type, NovelShorts.views)
+            .where(NovelShorts.novel_no.in_([first, second, other_platform]))
+            .order_by(NovelShorts.no)
+        ).all()
+        ref_count = connection.scalar(
+            select(MediaFile.ref_count).where(MediaFile.path == "uploads/music/loader-test.wav")
+        )
+    # 파일 순서대로 번호를 받고, 플랫폼이 없으면 먼저 등록된 소설에 연결
+    assert rows == [(first, "쉼표, 포함", 1, 0), (other_platform, "다른 플랫폼", 1, 0), (second, None, 1, 0)]
+    assert ref_count == 2
@@ -0,0 +1,125 @@
+import asyncio
+
+import pytest
+from tests.fake_redis import FakeRedisServer
+from utils.cache import MemoryCacheBackend, RedisCacheBackend, TTLCache
+
+
+pytestmark = pytest.mark.anyio
+
+
+class FakeTimer:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_ttl_cache_evicts_least_recently_used():
+    cache = TTLCache(maxsize=2, ttl=60)
+    cache.set(1, "a")
+    cache.set(2, "b")
+    assert cache.get(1) == "a"  # 1을 최근 사용으로 갱신
+
+    cache.set(3, "c")
+
+    assert cache.get(2) is None
+    assert cache.get_many([1, 2, 3]) == {1: "a", 3: "c"}
+    assert cache.stats()["evictions"] == 1
+
+
+def test_ttl_cache_expires_entries():
+    timer = FakeTimer()
+    cache = TTLCache(maxsize=10, ttl=5, timer=timer)
+    cache.set("key", "value")
+
+    timer.now = 4.9
+    assert cache.get("key") == "value"
+    timer.now = 5.0
+    assert cache.get("key") is None
+
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["expirations"], stats["size"]) == (1, 1, 1, 0)
+
+
+def test_ttl_cache_invalidate():
+    cache = TTLCache(maxsize=10, ttl=60)
+    cache.set(1, "a")
+    cache.set(2, "b")
+
+    cache.invalidate(1, 3)
+
+    assert cache.get(1) is None
+    assert cache.get(2) == "b"
+
+
+@pytest.fixture
+async def redis_server():
+    server = FakeRedisServer()
+    await server.start()
+    yield server
+    await server.stop()
+
+
+@pytest.fixture
+async def workers(redis_server):
+    """같은 Redis를 바라보는 워커 2개"""
+    backends = [RedisCacheBackend(redis_server.url, local_ttl=60, reconnect_delay=0.05) for _ in range(2)]
+    for backend in backends:
+        await backend.start()
+    yield backends
+    for backend in backends:
+        await backend.close()
+
+
+async def wait_until(condition, timeout: float = 1.0):
+    deadline = asyncio.get_running_loop().time() + timeout
+    while not condition():
+        assert asyncio.get_running_loop().time() < deadline, "시간 안에 조건을 만족하지 못했습니다"
+        await asyncio.sleep(0.01)
+
+
+async def test_memory_backend_round_trip():
+    backend = MemoryCacheBackend(maxsize=10)
+    await backend.set_many({"post:1": {"title": "제목"}, "post:2": {"title": "제목2"}}, ttl=60)
+
+    assert await backend.get_many(["post:1", "post:3"]) == {"post:1": {"title": "제목"}}
+
+    await backend.delete("post:1")
+    assert await backend.get("post:1") is None
+    assert backend.stats()["backend"] == "memory"
+
+
+async def test_redis_backend_shares_values_between_workers(workers):
+    first, second = workers
+    await first.set("post:1", {"title": "제목"}, ttl=60)
+
+    assert await second.get("post:1") == {"title": "제목"}
+    assert second.stats()["remote_hits"] == 1
+
+    # 두 번째 조회는 로컬 캐시에서 처리
+    assert await second.get("post:1") == {"title": "제목"}
+    assert second.stats()["hits"] == 1
+
+
+async def test_redis_backend_fans_out_invalidation(workers):
+    first, second = workers
+    await first.set("post:1", {"music": "old.mp3"}, ttl=60)
+    assert await second.get("post:1") == {"music": "old.mp3"}  # 두 번째 워커의 로컬 캐시에 적재
+
+    await first.delete("post:1")
+
+    await wait_until(lambda: second.invalidations_received == 1)
+    assert await second.get("post:1") is None
+
+
+async def test_redis_backend_clears_local_cache_after_reconnect(redis_server, workers):
+    first, second = workers
+    await first.set("post:1", {"music": "old.mp3"}, ttl=60)
+    assert await second.get("post:1") == {"music": "old.mp3"}
+
+    # 구독 연결이 끊긴 동안의 무효화는 전달되지 않으므로 재연결 시 로컬 캐시를 비워야 함
+    redis_server.drop_connections()
+    await wait_until(lambda: second.errors >= 1)
+    assert len(second.local) == 0
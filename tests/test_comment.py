@@ -1,9 +1,19 @@
+from datetime import datetime, timedelta
+
+from comment.comment_query import get_comments, update_comment
+from comment.comment_schema import CommentUpdate
 from models import Comment, Novel, NovelShorts, User
 import pytest
+from user.user_query import get_user_names, update_user_name
+from user.user_schema import UserNameUpdate
+from utils.cache import cache
+
+
+pytestmark = pytest.mark.anyio
 
 
 @pytest.fixture
-def test_comment(db_session, test_shorts, test_user_in_db):
+async def test_comment(db_session, test_shorts, test_user_in_db):
     comment = Comment(
         novel_shorts_no=test_shorts.no,
         user_no=test_user_in_db.no,
@@ -11,12 +21,12 @@ def test_comment(db_session, test_shorts, test_user_in_db):
         like=0,
     )
     db_session.add(comment)
-    db_session.commit()
+    await db_session.commit()
     return comment
 
 
 @pytest.fixture
-def test_user_in_db(db_session):
+async def test_user_in_db(db_session):
     user = User(
         id="testuser",
         password="$2b$12$LQv3c1yqBWVHxkd0LHAkCOYz6TtxMQJqhN8/LewKyNiGR9z6B5Lmy",  # Test1234!
@@ -25,12 +35,12 @@ def test_user_in_db(db_session):
         age=20,
     )
     db_session.add(user)
-    db_session.commit()
+    await db_session.commit()
     return user
 
 
 @pytest.fixture
-def test_novel(db_session):
+async def test_novel(db_session):
     novel = Novel(
         source_platform_type=1,
         source_id=1,
@@ -46,12 +56,12 @@ def test_novel(db_session):
         recommends=50,
     )
     db_session.add(novel)
-    db_session.commit()
+    await db_session.commit()
     return novel
 
 
 @pytest.fixture
-def test_shorts(db_session, test_novel):
+async def test_shorts(db_session, test_novel):
     shorts = NovelShorts(
         novel_no=test_novel.no,
         form_type=1,
@@ -63,21 +73,21 @@ def test_shorts(db_session, test_novel):
         comments=0,
     )
     db_session.add(shorts)
-    db_session.commit()
+    await db_session.commit()
     return shorts
 
 
 @pytest.fixture
-def auth_headers(client):
+async def auth_headers(client):
     # 로그인하여 토큰 얻기
     login_data = {"id": "testuser", "password": "Test1234!"}
-    response = client.post("/user/login", json=login_data)
+    response = await client.post("/user/login", json=login_data)
     token = response.json()["access_token"]
     return {"Authorization": f"Bearer {token}"}
 
 
-def test_get_comments(client, test_comment):
-    response = client.get(f"/shorts/{test_comment.novel_shorts_no}/comments")
+async def test_get_comments(client, test_comment):
+    response = await client.get(f"/shorts/{test_comment.novel_shorts_no}/comments")
     assert response.status_code == 200
     assert response.json()["success"] is True
     comments = response.json()["comments"]
@@ -86,20 +96,20 @@ def test_get_comments(client, test_comment):
     assert comments[0]["user_name"] == "테스트유저"
 
 
-def test_create_comment(client, test_shorts, auth_headers):
+async def test_create_comment(client, test_shorts, auth_headers):
     comment_data = {
         "novel_shorts_no": test_shorts.no,
         "content": "새로운 댓글입니다",
     }
-    response = client.post("/shorts/comment", json=comment_data, headers=auth_headers)
+    response = await client.post("/shorts/comment", json=comment_data, headers=auth_headers)
     assert response.status_code == 200
     assert response.json()["success"] is True
     assert response.json()["message"] == "댓글이 작성되었습니다"
 
 
-def test_update_comment(client, test_comment, auth_headers):
+async def test_update_comment(client, test_comment, auth_headers):
     update_data = {"content": "수정된 댓글입니다"}
-    response = client.put(
+    response = await client.put(
         f"/shorts/comment/{test_comment.no}",
         json=update_data,
         headers=auth_headers,
@@ -109,8 +119,8 @@ def test_update_comment(client, test_comment, auth_headers):
     assert response.json()["message"] == "댓글이 수정되었습니다"
 
 
-def test_delete_comment(client, test_comment, auth_headers):
-    response = client.delete(
+async def test_delete_comment(client, test_comment, auth_headers):
+    response = await client.delete(
         f"/shorts/comment/{test_comment.no}",
         headers=auth_headers,
     )
@@ -119,9 +129,9 @@ def test_delete_comment(client, test_comment, auth_headers):
     assert response.json()["message"] == "댓글이 삭제되었습니다"
 
 
-def test_like_comment(client, test_comment, auth_headers):
+async def test_like_comment(client, test_comment, auth_headers):
     # 좋아요 테스트
-    response = client.post(
+    response = await client.post(
         f"/shorts/comment/{test_comment.no}/like",
         headers=auth_headers,
     )
@@ -130,7 +140,7 @@ def test_like_comment(client, test_comment, auth_headers):
     assert response.json()["message"] == "댓글에 좋아요를 눌렀습니다"
 
     # 중복 좋아요 테스트
-    response = client.post(
+    response = await client.post(
         f"/shorts/comment/{test_comment.no}/like",
         headers=auth_headers,
     )
@@ -138,12 +148,12 @@ def test_like_comment(client, test_comment, auth_headers):
     assert response.json()["detail"] == "이미 좋아요를 눌렀습니다"
 
 
-def test_unlike_comment(client, test_comment, auth_headers):
+async def test_unlike_comment(client, test_comment, auth_headers):
     # 먼저 좋아요를 누름
-    client.post(f"/shorts/comment/{test_comment.no}/like", headers=auth_headers)
+    await client.post(f"/shorts/comment/{test_comment.no}/like", headers=auth_headers)
 
     # 좋아요 취소 테스트
-    response = client.delete(
+    response = await client.delete(
         f"/shorts/comment/{test_comment.no}/like",
         headers=auth_headers,
     )
@@ -152,9 +162,117 @@ def test_unlike_comment(client, test_comment, auth_headers):
     assert response.json()["message"] == "댓글 좋아요를 취소했습니다"
 
     # 이미 취소된 좋아요 다시 취소 테스트
-    response = client.delete(
+    response = await client.delete(
         f"/shorts/comment/{test_comment.no}/like",
         headers=auth_headers,
     )
     assert response.status_code == 400
     assert response.json()["detail"] == "좋아요 기록이 없습니다"
+
+
+async def test_get_comments_cache_is_invalidated_on_update(db_session):
+    cache.local.clear()
+    user = User(id="cacheuser", password="hashed", name="캐시")
+    novel = Novel(title="테스트 소설", author="테스트 작가", source_url="http://test.com")
+    db_session.add_all([user, novel])
+    await db_session.commit()
+    shorts = NovelShorts(novel_no=novel.no, form_type=1, content="테스트 내용")
+    db_session.add(shorts)
+    await db_session.commit()
+    comment = Comment(novel_shorts_no=shorts.no, user_no=user.no, content="처음 댓글", like=0)
+    db_session.add(comment)
+    await db_session.commit()
+
+    first = await get_comments(db_session, shorts.no)
+    hits = cache.local.hits
+    cached = await get_comments(db_session, shorts.no)
+    assert cache.local.hits == hits + 2  # 댓글 페이지 + 작성자 이름
+    assert cached.comments == first.comments
+
+    await update_comment(db_session, comment.no, user.no, CommentUpdate(content="수정된 댓글"))
+    updated = await get_comments(db_session, shorts.no)
+    assert [c.content for c in updated.comments] == ["수정된 댓글"]
+    cache.local.clear()
+
+
+async def test_get_comments_pages_threads_with_reply_previews(client, db_session, query_counter, test_shorts):
+    cache.local.clear()
+    user = User(id="threaduser", password="hashed", name="스레드")
+    db_session.add(user)
+    await db_session.commit()
+
+    base = datetime(2024, 1, 1)
+
+    def make(minutes: int, parent: Comment = None, content: str = "댓글") -> Comment:
+        return Comment(
+            novel_shorts_no=test_shorts.no,
+            user_no=user.no,
+            parent_no=parent.no if parent else None,
+            content=content,
+            like=0,
+            created_date=base + timedelta(minutes=minutes),
+        )
+
+    roots = [make(i, content=f"댓글 {i}") for i in range(3)]
+    db_session.add_all(roots)
+    await db_session.commit()
+    replies = [make(10 + i, roots[0], f"답글 {i}") for i in range(5)]
+    db_session.add_all(replies)
+    await db_session.commit()
+    db_session.add(make(30, replies[0], "대댓글"))
+    await db_session.commit()
+
+    query_counter.clear()
+    first = await get_comments(db_session, test_shorts.no, limit=2)
+    assert len(query_counter) == 3  # 최상위 댓글 페이지 + 답글 미리보기 + 작성자 이름
+    assert [c.content for c in first.comments] == ["댓글 0", "댓글 1"]
+    thread = first.comments[0]
+    assert thread.reply_count == 5
+    assert [r.content for r in thread.replies] == ["답글 0", "답글 1", "답글 2"]
+    assert thread.replies[0].reply_count == 1
+    assert first.comments[1].reply_count == 0 and first.comments[1].next_reply_cursor is None
+
+    response = await client.get(f"/shorts/{test_shorts.no}/comments", params={"limit": 2})
+    next_page = await client.get(
+        f"/shorts/{test_shorts.no}/comments", params={"limit": 2, "cursor": response.headers["X-Next-Cursor"]}
+    )
+    assert [c["content"] for c in next_page.json()["comments"]] == ["댓글 2"]
+    assert "X-Next-Cursor" not in next_page.headers
+
+    rest = await client.get(f"/shorts/comment/{thread.no}/replies", params={"cursor": thread.next_reply_cursor})
+    assert [c["content"] for c in rest.json()["comments"]] == ["답글 3", "답글 4"]
+
+    invalid = await client.get(f"/shorts/{test_shorts.no}/comments", params={"cursor": "잘못된커서"})
+    assert invalid.status_code == 400
+    cache.local.clear()
+
+
+async def test_get_comments_reads_author_names_from_cache(db_session, query_counter, test_comment, test_user_in_db):
+    cache.local.clear()
+    await get_comments(db_session, test_comment.novel_shorts_no)
+
+    # 댓글 페이지 캐시가 비어도 작성자 이름은 캐시에서 가져오고, 댓글 조회에는 user 조인이 없음
+    await cache.delete(f"comments:{test_comment.novel_shorts_no}")
+    query_counter.clear()
+    await get_comments(db_session, test_comment.novel_shorts_no)
+    assert len(query_counter) == 1
+    assert " JOIN " not in query_counter[0]
+
+    await update_user_name(db_session, test_user_in_db.no, UserNameUpdate(name="새이름"))
+    result = await get_comments(db_session, test_comment.novel_shorts_no)
+    assert [comment.user_name for comment in result.comments] == ["새이름"]
+    cache.local.clear()
+
+
+async def test_user_names_cache_users_without_name(db_session, query_counter):
+    cache.local.clear()
+    user = User(id="noname", password="hashed", name=None)
+    db_session.add(user)
+    await db_session.commit()
+
+    assert await get_user_names(db_session, [user.no]) == {user.no: None}
+    query_counter.clear()
+    # 이름이 NULL인 사용자도 캐시에서 찾아 다시 조회하지 않음
+    assert await get_user_names(db_session, [user.no]) == {user.no: None}
+    assert query_counter == []
+    cache.local.clear()
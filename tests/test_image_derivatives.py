@@ -0,0 +1,147 @@
+import asyncio
+import hashlib
+from io import BytesIO
+import os
+import time
+
+from models import Novel, NovelShorts
+from novel import media_store
+from novel.image_derivatives import IMAGE_VARIANTS, ImageDerivativePool, image_variants
+from novel.novel_query import get_posts
+from PIL import Image
+import pytest
+from utils.image_processing import render_variants
+
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+def media_root(tmp_path, monkeypatch):
+    monkeypatch.setattr(media_store, "MEDIA_ROOT", tmp_path)
+    monkeypatch.setattr(media_store, "UPLOAD_DIR", tmp_path / "uploads")
+    return tmp_path
+
+
+@pytest.fixture
+def pool():
+    pool = ImageDerivativePool(workers=1)
+    yield pool
+    pool.shutdown()
+
+
+def encode_image(size, mode="RGB", image_format="PNG", color="#3366cc") -> bytes:
+    buffer = BytesIO()
+    Image.new(mode, size, color).save(buffer, image_format)
+    return buffer.getvalue()
+
+
+def store_image(media_root, data: bytes, extension: str = ".png") -> str:
+    path = media_store.media_path("image", hashlib.sha256(data).hexdigest(), extension)
+    (media_root / path).parent.mkdir(parents=True, exist_ok=True)
+    (media_root / path).write_bytes(data)
+    return path
+
+
+def test_render_variants_resizes_by_width_without_upscaling(tmp_path):
+    source = tmp_path / "source.png"
+    source.write_bytes(encode_image((2000, 1000), mode="RGBA", color=(51, 102, 204, 128)))
+    outputs = [
+        (320, str(tmp_path / "thumb.webp")),
+        (1080, str(tmp_path / "feed.webp")),
+        (4000, str(tmp_path / "x.webp")),
+    ]
+
+    sizes = render_variants(str(source), outputs, quality=80)
+
+    assert set(sizes) == {path for _, path in outputs}
+    for (width, path), expected in zip(outputs, [(320, 160), (1080, 540), (2000, 1000)]):
+        with Image.open(path) as image:
+            assert (image.format, image.size, image.mode) == ("WEBP", expected, "RGBA")
+
+
+def test_render_variants_keeps_existing_files(tmp_path):
+    source = tmp_path / "source.jpg"
+    source.write_bytes(encode_image((800, 600), image_format="JPEG"))
+    existing = tmp_path / "thumb.webp"
+    existing.write_bytes(b"done")
+
+    render_variants(str(source), [(320, str(existing))], quality=80)
+
+    assert existing.read_bytes() == b"done"
+
+
+def test_image_variants_point_at_derived_paths_for_uploaded_images():
+    digest = "ab" + "0" * 62
+    variants = image_variants(f"uploads/images/ab/{digest}.png")
+
+    assert variants == {name: f"uploads/derived/ab/{digest}_{width}.webp" for name, width in IMAGE_VARIANTS.items()}
+    assert image_variants(f"uploads/music/ab/{digest}.wav") is None
+    assert image_variants("uploads/images/2f1c-legacy.png") is None
+    assert image_variants("https://example.com/cover.jpg") is None
+    assert image_variants(None) is None
+
+
+async def test_pool_renders_each_source_once(media_root, pool):
+    path = store_image(media_root, encode_image((1600, 900)))
+
+    # 같은 원본을 동시에 요청하면 한 번만 생성
+    first, second = await asyncio.gather(pool.ensure(path), pool.ensure(path))
+
+    assert first == second
+    assert pool.stats()["completed"] == 1
+    for variant in image_variants(path).values():
+        assert (media_root / variant).exists()
+
+
+async def test_missing_derivative_is_generated_on_request(client, media_root, monkeypatch, pool):
+    from novel import media_router
+
+    monkeypatch.setattr(media_router, "image_derivatives", pool)
+    path = store_image(media_root, encode_image((1600, 900), image_format="JPEG"), ".jpg")
+    thumb = image_variants(path)["thumb"]
+
+    response = await client.get(f"/{thumb}")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "image/webp"
+    assert "immutable" in response.headers["cache-control"]
+    with Image.open(BytesIO(response.content)) as image:
+        assert image.width == IMAGE_VARIANTS["thumb"]
+
+    # 설정에 없는 크기나 원본이 없는 해시는 생성하지 않음
+    unknown_width = thumb.replace(f"_{IMAGE_VARIANTS['thumb']}.", "_77.")
+    assert (await client.get(f"/{unknown_width}")).status_code == 404
+    assert (await client.get(f"/uploads/derived/cd/{'cd' + '0' * 62}_320.webp")).status_code == 404
+    assert pool.stats()["completed"] == 1
+
+
+async def test_feed_response_includes_image_variants(db_session):
+    digest = hashlib.sha256(b"feed image").hexdigest()
+    image = f"uploads/images/{digest[:2]}/{digest}.png"
+    novel = Novel(title="이미지 소설", author="테스트 작가", source_url="http://test.com")
+    db_session.add(novel)
+    await db_session.flush()
+    shorts = NovelShorts(novel_no=novel.no, form_type=1, content="이미지 숏츠", image=image)
+    db_session.add(shorts)
+    await db_session.commit()
+
+    posts = await get_posts(db_session, 10, 0)
+
+    post = next(post for post in posts if post.no == shorts.no)
+    assert post.image == image
+    assert post.image_variants == image_variants(image)
+
+
+def test_garbage_collector_sweeps_derivatives_of_removed_sources(media_root):
+    kept = store_image(media_root, encode_image((10, 10)))
+    kept_thumb = media_root / image_variants(kept)["thumb"]
+    orphan_thumb = media_root / media_store.derivative_path("cd" + "0" * 62, 320)
+    partial = media_root / f"{image_variants(kept)['feed']}.123.tmp"
+    for file in [kept_thumb, orphan_thumb, partial]:
+        file.parent.mkdir(parents=True, exist_ok=True)
+        file.write_bytes(b"webp")
+        os.utime(file, (time.time() - 10, time.time() - 10))
+
+    assert media_store._remove_orphan_derivatives(grace=1) == 2
+    assert kept_thumb.exists() and not orphan_thumb.exists() and not partial.exists()
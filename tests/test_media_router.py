@@ -0,0 +1,110 @@
+import hashlib
+
+from novel import media_router, media_store
+import pytest
+
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+def media_root(tmp_path, monkeypatch):
+    monkeypatch.setattr(media_store, "MEDIA_ROOT", tmp_path)
+    monkeypatch.setattr(media_store, "UPLOAD_DIR", tmp_path / "uploads")
+    return tmp_path
+
+
+@pytest.fixture
+def stored_music(media_root):
+    data = bytes(range(256)) * 400
+    digest = hashlib.sha256(data).hexdigest()
+    path = media_store.media_path("music", digest, ".wav")
+    (media_root / path).parent.mkdir(parents=True)
+    (media_root / path).write_bytes(data)
+    return path, digest, data
+
+
+async def test_serves_content_addressed_file_with_strong_etag(client, stored_music):
+    path, digest, data = stored_music
+
+    response = await client.get(f"/{path}")
+
+    assert response.status_code == 200
+    assert response.content == data
+    assert response.headers["etag"] == f'"{digest}"'
+    assert response.headers["accept-ranges"] == "bytes"
+    assert "immutable" in response.headers["cache-control"]
+    assert response.headers["content-type"].startswith("audio/")
+
+    head = await client.head(f"/{path}")
+    assert (head.status_code, head.content) == (200, b"")
+    assert head.headers["content-length"] == str(len(data))
+
+
+async def test_range_request_returns_partial_content(client, stored_music):
+    path, digest, data = stored_music
+
+    response = await client.get(f"/{path}", headers={"Range": "bytes=1000-1999"})
+    assert response.status_code == 206
+    assert response.content == data[1000:2000]
+    assert response.headers["content-range"] == f"bytes 1000-1999/{len(data)}"
+
+    # 탐색 위치부터 끝까지
+    response = await client.get(f"/{path}", headers={"Range": "bytes=100000-"})
+    assert response.content == data[100000:]
+
+    # If-Range가 현재 ETag와 다르면 전체 응답
+    response = await client.get(f"/{path}", headers={"Range": "bytes=0-9", "If-Range": '"stale"'})
+    assert (response.status_code, response.content) == (200, data)
+
+    response = await client.get(f"/{path}", headers={"Range": f"bytes={len(data)}-"})
+    assert response.status_code == 416
+
+
+async def test_if_none_match_returns_not_modified(client, stored_music):
+    path, digest, _ = stored_music
+
+    response = await client.get(f"/{path}", headers={"If-None-Match": f'"other", W/"{digest}"'})
+
+    assert response.status_code == 304
+    assert response.content == b""
+    assert response.headers["etag"] == f'"{digest}"'
+
+    response = await client.get(f"/{path}", headers={"If-None-Match": '"other"'})
+    assert response.status_code == 200
+
+
+async def test_legacy_file_is_revalidated_by_mtime_and_size(client, media_root):
+    legacy = media_root / "uploads" / "images" / "cover.png"
+    legacy.parent.mkdir(parents=True)
+    legacy.write_bytes(b"png")
+
+    response = await client.get("/uploads/images/cover.png")
+    assert response.headers["cache-control"] == "public, no-cache"
+
+    etag = response.headers["etag"]
+    assert (await client.get("/uploads/images/cover.png", headers={"If-None-Match": etag})).status_code == 304
+
+    legacy.write_bytes(b"png, changed")
+    assert (await client.get("/uploads/images/cover.png", headers={"If-None-Match": etag})).status_code == 200
+
+
+async def test_rejects_paths_outside_served_files(client, media_root):
+    (media_root / "secret.txt").write_text("secret")
+    (media_root / "uploads" / "tmp").mkdir(parents=True)
+    (media_root / "uploads" / "tmp" / "partial.wav").write_bytes(b"partial")
+
+    for path in ["/uploads/..%2Fsecret.txt", "/uploads/tmp/partial.wav", "/uploads/", "/uploads/missing.wav"]:
+        assert (await client.get(path)).status_code == 404, path
+
+
+async def test_accel_redirect_hands_body_to_proxy(client, stored_music, monkeypatch):
+    path, digest, _ = stored_music
+    monkeypatch.setattr(media_router, "MEDIA_ACCEL_REDIRECT", "/_media/")
+
+    response = await client.get(f"/{path}")
+
+    assert response.status_code == 200
+    assert response.content == b""
+    assert response.headers["x-accel-redirect"] == "/_media/" + path.removeprefix("uploads/")
+    assert response.headers["etag"] == f'"{digest}"'
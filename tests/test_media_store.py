@@ -0,0 +1,114 @@
+import hashlib
+from io import BytesIO
+
+from models import MediaFile, Novel, NovelShorts
+from novel import media_store
+from novel.media_store import MediaGarbageCollector, UploadTooLarge, copy_upload, store_media
+from novel.novel_query import update_shorts_media, update_shorts_media_by_novel_id
+import pytest
+from sqlalchemy import delete, select
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+def media_root(tmp_path, monkeypatch):
+    monkeypatch.setattr(media_store, "MEDIA_ROOT", tmp_path)
+    monkeypatch.setattr(media_store, "UPLOAD_DIR", tmp_path / "uploads")
+    return tmp_path
+
+
+@pytest.fixture
+async def committed_novel(async_engine):
+    """GC는 별도 커넥션에서 실행되므로 롤백 대신 커밋 후 직접 정리"""
+    session_factory = async_sessionmaker(async_engine, expire_on_commit=False)
+    async with session_factory() as db:
+        novel = Novel(title="미디어 소설", author="테스트 작가", source_url="http://test.com", source_id=9021)
+        db.add(novel)
+        await db.commit()
+        shorts = [NovelShorts(novel_no=novel.no, form_type=1, content=f"미디어 {i}") for i in range(2)]
+        db.add_all(shorts)
+        await db.commit()
+
+    yield session_factory, [shorts.no for shorts in shorts]
+
+    async with session_factory() as db:
+        await db.execute(delete(NovelShorts).where(NovelShorts.novel_no == novel.no))
+        await db.execute(delete(Novel).where(Novel.no == novel.no))
+        await db.execute(delete(MediaFile))
+        await db.commit()
+
+
+async def get_ref_counts(db) -> dict:
+    return dict((await db.execute(select(MediaFile.path, MediaFile.ref_count))).all())
+
+
+def stored_files(root) -> list:
+    return sorted(path.relative_to(root).as_posix() for path in (root / "uploads").rglob("*") if path.is_file())
+
+
+def test_copy_upload_hashes_while_streaming_in_chunks(tmp_path):
+    data = bytes(range(256)) * 100
+    destination = tmp_path / "music" / "a.wav"
+
+    size, sha256 = copy_upload(BytesIO(data), destination, max_size=len(data), chunk_size=1000)
+
+    assert (size, sha256) == (len(data), hashlib.sha256(data).hexdigest())
+    assert destination.read_bytes() == data
+
+    # 제한을 넘으면 중간까지 쓴 파일을 남기지 않음
+    with pytest.raises(UploadTooLarge):
+        copy_upload(BytesIO(data), tmp_path / "big.wav", max_size=len(data) - 1, chunk_size=1000)
+    assert not (tmp_path / "big.wav").exists()
+
+
+async def test_store_media_deduplicates_and_counts_shorts_references(media_root, committed_novel):
+    session_factory, shorts_nos = committed_novel
+    digest = hashlib.sha256(b"cover").hexdigest()
+
+    async with session_factory() as db:
+        first = await store_media(db, BytesIO(b"cover"), "image", ".png", max_size=1000)
+        second = await store_media(db, BytesIO(b"cover"), "image", ".png", max_size=1000)
+
+        assert first.path == second.path == f"uploads/images/{digest[:2]}/{digest}.png"
+        assert (first.deduplicated, second.deduplicated) == (False, True)
+        assert stored_files(media_root) == [first.path]
+        assert await get_ref_counts(db) == {first.path: 0}
+
+        # 소설의 모든 숏츠가 같은 파일을 가리키면 숏츠 수만큼 참조
+        await update_shorts_media_by_novel_id(db, 9021, image_path=first.path)
+        assert await get_ref_counts(db) == {first.path: 2}
+
+        other = await store_media(db, BytesIO(b"other"), "image", ".png", max_size=1000)
+        await update_shorts_media(db, shorts_nos[0], image=other.path)
+        assert await get_ref_counts(db) == {first.path: 1, other.path: 1}
+
+
+async def test_garbage_collector_removes_unreferenced_and_untracked_files(media_root, committed_novel, async_engine):
+    session_factory, shorts_nos = committed_novel
+    async with session_factory() as db:
+        kept = await store_media(db, BytesIO(b"kept"), "music", ".wav", max_size=1000)
+        dropped = await store_media(db, BytesIO(b"dropped"), "music", ".wav", max_size=1000)
+        await update_shorts_media(db, shorts_nos[0], music=kept.path)
+        await update_shorts_media(db, shorts_nos[1], music=dropped.path)
+        await update_shorts_media(db, shorts_nos[1], music=kept.path)  # dropped는 참조 0
+
+    # DB 기록 없이 디스크에만 남은 파일 (예전 uuid 파일명, 실패한 업로드 등)
+    orphan = media_root / "uploads" / "images" / "legacy.png"
+    orphan.parent.mkdir(parents=True, exist_ok=True)
+    orphan.write_bytes(b"legacy")
+
+    collector = MediaGarbageCollector(engine=async_engine, grace=3600)
+    assert await collector.collect()
+    # 유예 시간 안에서는 아무것도 지우지 않음
+    assert stored_files(media_root) == sorted([kept.path, dropped.path, "uploads/images/legacy.png"])
+
+    collector.grace = 0
+    assert await collector.collect()
+    assert stored_files(media_root) == [kept.path]
+    async with session_factory() as db:
+        assert await get_ref_counts(db) == {kept.path: 2}
+    assert collector.stats()["removed_records"] == 1
+    assert collector.stats()["removed_files"] == 2
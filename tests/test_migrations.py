@@ -0,0 +1,106 @@
+from database import Base
+from migrations.runner import get_current_version, get_pending_migrations, load_migrations, upgrade
+import models  # noqa: F401
+import pytest
+from sqlalchemy import create_engine, inspect, text
+from tests.conftest import TEST_DB_URL
+
+
+MIGRATION_SCHEMA = "migration_test"
+
+
+@pytest.fixture
+def migration_engine():
+    """빈 스키마를 search_path로 쓰는 엔진 (테스트용 테이블과 분리)"""
+    engine = create_engine(TEST_DB_URL, connect_args={"options": f"-csearch_path={MIGRATION_SCHEMA}"})
+    with engine.begin() as connection:
+        connection.execute(text(f"DROP SCHEMA IF EXISTS {MIGRATION_SCHEMA} CASCADE"))
+        connection.execute(text(f"CREATE SCHEMA {MIGRATION_SCHEMA}"))
+    yield engine
+    with engine.begin() as connection:
+        connection.execute(text(f"DROP SCHEMA {MIGRATION_SCHEMA} CASCADE"))
+    engine.dispose()
+
+
+def describe_models(engine) -> dict:
+    dialect = engine.dialect
+    schema = {}
+    for table in Base.metadata.sorted_tables:
+        schema[table.name] = {
+            "columns": {column.name: (str(column.type.compile(dialect)), column.nullable) for column in table.columns},
+            "indexes": {index.name: [column.name for column in index.columns] for index in table.indexes},
+            "unique": {
+                constraint.name: [column.name for column in constraint.columns]
+                for constraint in table.constraints
+                if constraint.__class__.__name__ == "UniqueConstraint"
+            },
+        }
+    return schema
+
+
+def describe_database(engine) -> dict:
+    dialect, inspector = engine.dialect, inspect(engine)
+    schema = {}
+    for table in inspector.get_table_names():
+        unique = {c["name"]: c["column_names"] for c in inspector.get_unique_constraints(table)}
+        schema[table] = {
+            "columns": {
+                column["name"]: (str(column["type"].compile(dialect)), column["nullable"])
+                for column in inspector.get_columns(table)
+            },
+            "indexes": {
+                index["name"]: index["column_names"]
+                for index in inspector.get_indexes(table)
+                if index["name"] not in unique
+            },
+            "unique": unique,
+        }
+    return schema
+
+
+def test_migrations_build_the_schema_declared_by_models(migration_engine):
+    applied = upgrade(migration_engine)
+
+    assert [migration.version for migration in applied] == [m.version for m in load_migrations()]
+    assert get_current_version(migration_engine) == applied[-1].version
+    database = describe_database(migration_engine)
+    assert database.pop("schema_migrations")
+    assert database == describe_models(migration_engine)
+
+    # 다시 실행하면 적용할 것이 없음
+    assert upgrade(migration_engine) == []
+    assert get_pending_migrations(migration_engine) == []
+
+
+def test_upgrade_deduplicates_likes_before_unique_constraint(migration_engine):
+    # 유니크 제약이 없던 시절(초기 스키마)의 DB에 중복 기록이 쌓인 상황
+    upgrade(migration_engine, target=1)
+    with migration_engine.begin() as connection:
+        user_no = connection.execute(
+            text("""INSERT INTO "user" (id, name, gender, age, created_date)
+                VALUES ('miguser', 'mig', 'X', 0, now()) RETURNING no""")
+        ).scalar()
+        # 중복 좋아요로 카운터가 부푼 숏츠와, 중복 없이 카운터만 있는 숏츠
+        shorts_no, other_shorts_no = connection.execute(
+            text("INSERT INTO novel_shorts (content, likes) VALUES ('mig', 2), ('other', 5) RETURNING no")
+        ).scalars()
+        # 취소된 기록 + 활성 기록 2건 (활성 기록 중 먼저 만들어진 것만 남아야 함)
+        kept = (
+            connection.execute(
+                text("""INSERT INTO user_like (user_no, novel_shorts_no, is_del)
+                    VALUES (:u, :s, true), (:u, :s, false), (:u, :s, false) RETURNING no"""),
+                {"u": user_no, "s": shorts_no},
+            )
+            .scalars()
+            .all()[1]
+        )
+
+    upgrade(migration_engine)
+
+    with migration_engine.connect() as connection:
+        assert connection.execute(text("SELECT no FROM user_like")).scalars().all() == [kept]
+        likes = dict(connection.execute(text("SELECT no, likes FROM novel_shorts")).all())
+        assert likes == {shorts_no: 1, other_shorts_no: 5}  # 중복이 있던 숏츠만 활성 기록 수로 맞춤
+        # 기존 숏츠에도 변경 추적 컬럼이 채워짐
+        assert connection.execute(text("SELECT updated_date FROM novel_shorts")).scalar() is not None
+    assert "uq_user_like_user_no_novel_shorts_no" in describe_database(migration_engine)["user_like"]["unique"]
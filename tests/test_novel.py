@@ -1,9 +1,16 @@
+import hashlib
+
 from models import Novel, NovelShorts
+from novel import admin_router, media_store
+from novel.admin_router import ADMIN_CODE
 import pytest
 
 
+pytestmark = pytest.mark.anyio
+
+
 @pytest.fixture
-def test_novel(db_session):
+async def test_novel(db_session):
     novel = Novel(
         source_platform_type=1,
         source_id=1,
@@ -18,12 +25,12 @@ def test_novel(db_session):
         recommends=50,
     )
     db_session.add(novel)
-    db_session.commit()
+    await db_session.commit()
     return novel
 
 
 @pytest.fixture
-def test_shorts(db_session, test_novel):
+async def test_shorts(db_session, test_novel):
     shorts = NovelShorts(
         novel_no=test_novel.no,
         form_type=1,
@@ -35,73 +42,119 @@ def test_shorts(db_session, test_novel):
         comments=0,
     )
     db_session.add(shorts)
-    db_session.commit()
+    await db_session.commit()
     return shorts
 
 
-def test_read_posts(client, test_shorts):
-    response = client.get("/shorts")
+async def test_read_posts(client, test_shorts):
+    response = await client.get("/shorts")
     assert response.status_code == 200
     assert len(response.json()) > 0
     assert response.json()[0]["title"] == "테스트 소설"
 
 
-def test_read_post(client, test_shorts):
-    response = client.get(f"/shorts/{test_shorts.no}")
+async def test_read_post(client, test_shorts):
+    response = await client.get(f"/shorts/{test_shorts.no}")
     assert response.status_code == 200
     assert response.json()["title"] == "테스트 소설"
     assert response.json()["content"] == "테스트 내용"
 
 
-def test_like_shorts_unauthorized(client, test_shorts):
-    response = client.post(f"/shorts/{test_shorts.no}/like")
+async def test_like_shorts_unauthorized(client, test_shorts):
+    response = await client.post(f"/shorts/{test_shorts.no}/like")
     assert response.status_code == 401
     assert response.json()["detail"] == "로그인이 필요한 서비스입니다"
 
 
-def test_like_shorts(client, test_shorts, test_user):
+async def test_like_shorts(client, test_shorts, test_user):
     # 로그인
-    client.post("/user/signup", json=test_user)
-    login_response = client.post("/user/login", json={"id": test_user["id"], "password": test_user["password"]})
+    await client.post("/user/signup", json=test_user)
+    login_response = await client.post("/user/login", json={"id": test_user["id"], "password": test_user["password"]})
     cookies = login_response.cookies
 
     # 좋아요 테스트
-    response = client.post(f"/shorts/{test_shorts.no}/like", cookies=cookies)
+    response = await client.post(f"/shorts/{test_shorts.no}/like", cookies=cookies)
     assert response.status_code == 200
     assert response.json()["success"] is True
     assert response.json()["likes"] == 1
 
     # 좋아요 취소 테스트
-    response = client.delete(f"/shorts/{test_shorts.no}/like", cookies=cookies)
+    response = await client.delete(f"/shorts/{test_shorts.no}/like", cookies=cookies)
     assert response.status_code == 200
     assert response.json()["success"] is True
     assert response.json()["likes"] == 0
 
 
-def test_save_shorts(client, test_shorts, test_user):
+async def test_save_shorts(client, test_shorts, test_user):
     # 로그인
-    client.post("/user/signup", json=test_user)
-    login_response = client.post("/user/login", json={"id": test_user["id"], "password": test_user["password"]})
+    await client.post("/user/signup", json=test_user)
+    login_response = await client.post("/user/login", json={"id": test_user["id"], "password": test_user["password"]})
     cookies = login_response.cookies
 
     # 저장 테스트
-    response = client.post(f"/shorts/{test_shorts.no}/save", cookies=cookies)
+    response = await client.post(f"/shorts/{test_shorts.no}/save", cookies=cookies)
     assert response.status_code == 200
     assert response.json()["success"] is True
     assert response.json()["saves"] == 1
 
     # 중복 저장 테스트
-    response = client.post(f"/shorts/{test_shorts.no}/save", cookies=cookies)
+    response = await client.post(f"/shorts/{test_shorts.no}/save", cookies=cookies)
     assert response.status_code == 400
     assert response.json()["detail"] == "이미 저장된 게시물입니다"
 
     # 저장 취소 테스트
-    response = client.delete(f"/shorts/{test_shorts.no}/save", cookies=cookies)
+    response = await client.delete(f"/shorts/{test_shorts.no}/save", cookies=cookies)
     assert response.status_code == 200
     assert response.json()["success"] is True
     assert response.json()["saves"] == 0
 
     # 이미 취소된 저장 다시 취소 테스트
-    response = client.delete(f"/shorts/{test_shorts.no}/save", cookies=cookies)
+    response = await client.delete(f"/shorts/{test_shorts.no}/save", cookies=cookies)
     assert response.status_code == 400
     assert response.json()["detail"] == "저장되지 않은 게시물입니다"
+
+
+@pytest.fixture
+def media_root(tmp_path, monkeypatch):
+    monkeypatch.setattr(media_store, "MEDIA_ROOT", tmp_path)
+    monkeypatch.setattr(media_store, "UPLOAD_DIR", tmp_path / "uploads")
+    return tmp_path
+
+
+async def test_upload_shorts_media(client, db_session, test_shorts, media_root):
+    image, music = b"\x89PNG" + b"0" * 5000, b"RIFF" + b"1" * 300_000
+
+    response = await client.put(
+        f"/admin/shorts/{test_shorts.no}/media",
+        data={"admin_code": ADMIN_CODE},
+        files={"image_file": ("cover.png", image, "image/png"), "music_file": ("bgm.wav", music, "audio/wav")},
+    )
+
+    assert response.status_code == 200
+    await db_session.refresh(test_shorts)
+    image_hash, music_hash = hashlib.sha256(image).hexdigest(), hashlib.sha256(music).hexdigest()
+    assert test_shorts.image == f"uploads/images/{image_hash[:2]}/{image_hash}.png"
+    assert test_shorts.music == f"uploads/music/{music_hash[:2]}/{music_hash}.wav"
+    assert (media_root / test_shorts.image).read_bytes() == image
+    assert (media_root / test_shorts.music).read_bytes() == music
+
+
+async def test_upload_shorts_media_rejects_oversized_file(client, db_session, test_shorts, media_root, monkeypatch):
+    monkeypatch.setitem(admin_router.MAX_UPLOAD_SIZE, "music", 100_000)
+
+    response = await client.put(
+        f"/admin/shorts/{test_shorts.no}/media",
+        data={"admin_code": ADMIN_CODE},
+        files={
+            "image_file": ("cover.png", b"png", "image/png"),
+            "music_file": ("bgm.wav", b"1" * 200_000, "audio/wav"),
+        },
+    )
+
+    assert response.status_code == 413
+    # 제한을 넘은 음악은 남지 않고, 먼저 저장된 이미지는 참조 없이 남아 GC 대상이 됨
+    image_hash = hashlib.sha256(b"png").hexdigest()
+    files = [path.relative_to(media_root).as_posix() for path in media_root.rglob("*") if path.is_file()]
+    assert files == [f"uploads/images/{image_hash[:2]}/{image_hash}.png"]
+    await db_session.refresh(test_shorts)
+    assert (test_shorts.image, test_shorts.music) == ("test.jpg", "test.mp3")
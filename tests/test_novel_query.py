@@ -1,12 +1,54 @@
+import asyncio
+import csv
 from datetime import datetime
+import random
 
-from models import GenreType, Novel, NovelShorts, SourcePlatformType, SourceType
-from novel.novel_query import get_post
+from models import (
+    Comment,
+    GenreType,
+    Novel,
+    NovelShorts,
+    SourcePlatformType,
+    SourceType,
+    User,
+    UserLike,
+    UserSave,
+)
+from novel.admin_router import ADMIN_CODE
+import novel.novel_query
+from novel.novel_query import (
+    get_export_watermark,
+    get_novel_detail,
+    get_post,
+    get_posts,
+    like_novel_shorts,
+    save_novel_shorts,
+    stream_novel_shorts_columnar,
+    stream_novel_shorts_csv,
+    unlike_novel_shorts,
+    unsave_novel_shorts,
+    update_shorts_media,
+)
 from novel.novel_schema import PostResponse
-from sqlalchemy.orm import Session
+import pytest
+from sqlalchemy import delete, func, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from utils.cache import cache
+from utils.pagination import decode_cursor, encode_cursor
 
 
-def test_get_post_success(db_session: Session):
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture(autouse=True)
+def clear_post_cache():
+    # 테스트 간에 캐시된 숏츠 정보가 섞이지 않도록 초기화
+    cache.local.clear()
+    yield
+    cache.local.clear()
+
+
+async def test_get_post_success(db_session: AsyncSession):
     # 테스트 데이터 준비
     novel = Novel(
         title="테스트 소설",
@@ -30,10 +72,10 @@ def test_get_post_success(db_session: Session):
 
     db_session.add(novel)
     db_session.add(novel_shorts)
-    db_session.commit()
+    await db_session.commit()
 
     # 함수 실행
-    result = get_post(post_no=1, db=db_session)
+    result = await get_post(post_no=1, db=db_session)
 
     # 디버깅을 위한 print 문
     print("\n")  # 가독성을 위한 빈 줄
@@ -52,20 +94,20 @@ def test_get_post_success(db_session: Session):
     assert result.content == "테스트 내용"
 
 
-def test_get_post_not_found(db_session: Session):
+async def test_get_post_not_found(db_session: AsyncSession):
     # 존재하지 않는 게시물 조회
-    result = get_post(post_no=999, db=db_session)
+    result = await get_post(post_no=999, db=db_session)
 
     assert isinstance(result, dict)
     assert "error" in result
     assert result["msg"] == "존재하지 않는 번호입니다."
 
 
-def test_get_post_db_error(db_session: Session):
+async def test_get_post_db_error(db_session: AsyncSession):
     # DB 세션을 닫아서 에러 발생시키기
-    db_session.close()
+    await db_session.close()
 
-    result = get_post(post_no=1, db=db_session)
+    result = await get_post(post_no=1, db=db_session)
 
     print("\n=== DB 에러 테스트 결과 ===")
     print(f"결과: {result}")
@@ -74,3 +116,310 @@ def test_get_post_db_error(db_session: Session):
     assert isinstance(result, dict)
     assert "error" in result
     assert result["msg"] == "존재하지 않는 번호입니다."
+
+
+async def test_get_posts_cursor_matches_offset(db_session: AsyncSession):
+    novel = Novel(title="테스트 소설", author="테스트 작가", source_url="http://test.com")
+    db_session.add(novel)
+    await db_session.commit()
+
+    for i in range(5):
+        db_session.add(NovelShorts(novel_no=novel.no, form_type=1, content=f"숏츠 {i}", music="test.mp3"))
+    await db_session.commit()
+
+    offset_pages = [await get_posts(db_session, limit=2, offset=offset) for offset in (0, 2, 4)]
+
+    cursor_pages = []
+    after_no = None
+    for _ in range(3):
+        page = await get_posts(db_session, limit=2, offset=0, after_no=after_no)
+        cursor_pages.append(page)
+        after_no = page[-1].no
+
+    assert [[post.no for post in page] for page in cursor_pages] == [
+        [post.no for post in page] for page in offset_pages
+    ]
+    assert cursor_pages == offset_pages
+
+
+def test_cursor_round_trip():
+    assert decode_cursor(encode_cursor(123)) == [123]
+
+    with pytest.raises(ValueError):
+        decode_cursor("not-a-cursor")
+
+
+async def test_get_posts_is_like_only_for_liked_shorts(db_session: AsyncSession):
+    user = User(id="likeuser", password="hashed", name="좋아요")
+    novel = Novel(title="테스트 소설", author="테스트 작가", source_url="http://test.com")
+    db_session.add_all([user, novel])
+    await db_session.commit()
+
+    shorts_list = [NovelShorts(novel_no=novel.no, form_type=1, content=f"숏츠 {i}") for i in range(3)]
+    db_session.add_all(shorts_list)
+    await db_session.commit()
+
+    liked, unliked, deleted = shorts_list
+    db_session.add_all(
+        [
+            UserLike(user_no=user.no, novel_no=novel.no, novel_shorts_no=liked.no),
+            UserLike(user_no=user.no, novel_no=novel.no, novel_shorts_no=deleted.no, is_del=True),
+        ]
+    )
+    await db_session.commit()
+
+    posts = {post.no: post.is_like for post in await get_posts(db_session, limit=10, offset=0, user_no=user.no)}
+    assert posts[liked.no] is True
+    assert posts[unliked.no] is False
+    assert posts[deleted.no] is False
+
+    anonymous = await get_posts(db_session, limit=10, offset=0)
+    assert not any(post.is_like for post in anonymous)
+
+
+@pytest.mark.parametrize("shorts_count", [1, 30])
+async def test_get_novel_detail_query_count_is_constant(db_session: AsyncSession, query_counter, shorts_count):
+    user = User(id="detail", password="hashed", name="상세")
+    novel = Novel(
+        title="테스트 소설",
+        author="테스트 작가",
+        description="테스트 설명",
+        genres=[1],
+        cover_image="test.jpg",
+        chapters=1,
+        views=0,
+        recommends=0,
+        created_date=datetime.now(),
+        source_platform_type=SourcePlatformType.MUNPIA.value,
+        source_url="http://test.com",
+    )
+    db_session.add_all([user, novel])
+    await db_session.commit()
+
+    shorts_list = [
+        NovelShorts(novel_no=novel.no, form_type=1, content=f"숏츠 {i}", image="test.jpg", music="test.mp3")
+        for i in range(shorts_count)
+    ]
+    db_session.add_all(shorts_list)
+    await db_session.commit()
+
+    db_session.add_all(
+        [
+            Comment(novel_shorts_no=shorts.no, user_no=user.no, content="댓글")
+            for shorts in shorts_list
+            for _ in range(2)
+        ]
+    )
+    await db_session.commit()
+
+    novel_no = novel.no
+    query_counter.clear()
+    result = await get_novel_detail(db_session, novel_no)
+
+    assert len(result.shorts_list) == shorts_count
+    assert all(len(shorts.comments) == 2 for shorts in result.shorts_list)
+    # 소설 1 + 숏츠 목록 1 + 댓글 일괄 조회 1
+    assert len(query_counter) == 3
+
+
+@pytest.fixture
+async def committed_shorts(async_engine):
+    """여러 커넥션이 동시에 접근해야 하므로 롤백 대신 커밋 후 직접 정리"""
+    session_factory = async_sessionmaker(async_engine, expire_on_commit=False)
+    async with session_factory() as db:
+        users = [User(id=f"stress{i}", password="hashed", name="동시성") for i in range(10)]
+        novel = Novel(title="테스트 소설", author="테스트 작가", source_url="http://test.com")
+        db.add_all([*users, novel])
+        await db.commit()
+
+        shorts = NovelShorts(novel_no=novel.no, form_type=1, content="동시성", likes=0, saves=0)
+        db.add(shorts)
+        await db.commit()
+
+    yield session_factory, shorts.no, [user.no for user in users]
+
+    async with session_factory() as db:
+        await db.execute(delete(UserLike).where(UserLike.novel_shorts_no == shorts.no))
+        await db.execute(delete(UserSave).where(UserSave.novel_shorts_no == shorts.no))
+        await db.execute(delete(NovelShorts).where(NovelShorts.no == shorts.no))
+        await db.execute(delete(Novel).where(Novel.no == novel.no))
+        await db.execute(delete(User).where(User.no.in_([user.no for user in users])))
+        await db.commit()
+
+
+async def test_like_save_counters_are_exact_under_concurrency(committed_shorts):
+    session_factory, shorts_no, user_nos = committed_shorts
+    toggles = [like_novel_shorts, unlike_novel_shorts, save_novel_shorts, unsave_novel_shorts]
+    rng = random.Random(0)
+    semaphore = asyncio.Semaphore(20)
+
+    async def toggle(func, user_no):
+        async with semaphore:
+            async with session_factory() as db:
+                return await func(db, user_no, shorts_no)
+
+    results = await asyncio.gather(*(toggle(rng.choice(toggles), rng.choice(user_nos)) for _ in range(1000)))
+    assert not any("오류" in result.message for result in results)
+
+    async with session_factory() as db:
+        shorts = await db.get(NovelShorts, shorts_no)
+        active_likes = await db.scalar(
+            select(func.count()).where(UserLike.novel_shorts_no == shorts_no, UserLike.is_del.is_(False))
+        )
+        active_saves = await db.scalar(
+            select(func.count()).where(UserSave.novel_shorts_no == shorts_no, UserSave.is_del.is_(False))
+        )
+
+    assert shorts.likes == active_likes
+    assert shorts.saves == active_saves
+
+
+async def test_post_cache_overlays_counters_and_invalidates_on_media_update(db_session: AsyncSession):
+    user = User(id="cacheuser", password="hashed", name="캐시")
+    novel = Novel(title="테스트 소설", author="테스트 작가", source_url="http://test.com")
+    db_session.add_all([user, novel])
+    await db_session.commit()
+    shorts = NovelShorts(novel_no=novel.no, form_type=1, content="캐시", music="old.mp3", likes=0, saves=0)
+    db_session.add(shorts)
+    await db_session.commit()
+    shorts_no, user_no = shorts.no, user.no
+    hits, misses = cache.local.hits, cache.local.misses
+
+    first = await get_post(post_no=shorts_no, user_no=user_no, db=db_session)
+    assert cache.local.misses == misses + 1
+
+    # 카운터와 is_like는 캐시 히트여도 최신 값이어야 함
+    await like_novel_shorts(db_session, user_no, shorts_no)
+    second = await get_post(post_no=shorts_no, user_no=user_no, db=db_session)
+    assert cache.local.hits == hits + 1
+    assert (first.likes, first.is_like) == (0, False)
+    assert (second.likes, second.is_like) == (1, True)
+    assert second.title == "테스트 소설"
+
+    # 피드 조회도 같은 캐시를 사용
+    [feed_post] = [post for post in await get_posts(db_session, limit=10, offset=0) if post.no == shorts_no]
+    assert feed_post.music == "old.mp3"
+    assert cache.local.hits == hits + 2
+
+    # 관리자 미디어 수정 후에는 캐시가 비워져 새 값이 보여야 함
+    await update_shorts_media(db_session, shorts_no, music="new.mp3")
+    third = await get_post(post_no=shorts_no, user_no=user_no, db=db_session)
+    assert third.music == "new.mp3"
+    assert cache.local.misses == misses + 2
+
+
+async def test_stream_novel_shorts_csv_in_batches(db_session: AsyncSession):
+    novel = Novel(title="테스트 소설", author="테스트 작가", source_url="http://test.com")
+    db_session.add(novel)
+    await db_session.commit()
+    db_session.add_all(
+        [NovelShorts(novel_no=novel.no, form_type=1, content=f"내용, {i}", views=i, likes=0, saves=0) for i in range(5)]
+    )
+    await db_session.commit()
+
+    chunks = [chunk async for chunk in stream_novel_shorts_csv(db_session, batch_size=2)]
+    rows = list(csv.reader("".join(chunks).splitlines()))
+
+    # 헤더 + 5행이 배치 크기(2) 단위 청크 3개로 나뉘어 전송
+    assert len(chunks) == 3
+    assert rows[0] == ["novel_no", "novel_short_no", "content", "views", "likes", "saves"]
+    assert [row[2] for row in rows[1:] if row[0] == str(novel.no)] == [f"내용, {i}" for i in range(5)]
+
+
+async def test_export_csv_endpoint_streams(client, db_session: AsyncSession):
+    novel = Novel(title="테스트 소설", author="테스트 작가", source_url="http://test.com")
+    db_session.add(novel)
+    await db_session.commit()
+    db_session.add(NovelShorts(novel_no=novel.no, form_type=1, content="내용", views=1, likes=2, saves=3))
+    await db_session.commit()
+
+    response = await client.get("/admin/novel/export/csv", params={"admin_code": ADMIN_CODE})
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/csv")
+    assert response.text.splitlines()[-1].endswith(",내용,1,2,3")
+
+
+@pytest.mark.parametrize("file_format", ["arrow", "parquet"])
+async def test_stream_novel_shorts_columnar_round_trip(db_session: AsyncSession, file_format):
+    pa = pytest.importorskip("pyarrow")
+    pq = pytest.importorskip("pyarrow.parquet")
+
+    novel = Novel(title="테스트 소설", author="테스트 작가", source_url="http://test.com")
+    db_session.add(novel)
+    await db_session.commit()
+    db_session.add_all(
+        [
+            NovelShorts(novel_no=novel.no, form_type=1, content=f"내용 {i}", views=i, likes=i, saves=0, comments=i * 2)
+            for i in range(5)
+        ]
+    )
+    await db_session.commit()
+
+    data = b"".join([chunk async for chunk in stream_novel_shorts_columnar(db_session, file_format, batch_size=2)])
+    if file_format == "parquet":
+        parquet_file = pq.ParquetFile(pa.BufferReader(data))
+        assert parquet_file.metadata.num_row_groups == 3  # 배치(2행)마다 row group 1개
+        table = parquet_file.read()
+    else:
+        table = pa.ipc.open_stream(data).read_all()
+
+    assert table.column_names == ["novel_no", "novel_short_no", "content", "views", "likes", "saves", "comments"]
+    assert table.schema.field("views").type == pa.int32()
+    rows = [row for row in table.to_pylist() if row["novel_no"] == novel.no]
+    assert [(row["content"], row["comments"]) for row in rows] == [(f"내용 {i}", i * 2) for i in range(5)]
+
+
+async def test_incremental_export_returns_only_rows_changed_since_watermark(async_engine, monkeypatch):
+    # updated_date는 트랜잭션 시작 시각이므로 각 단계를 별도 트랜잭션으로 커밋
+    monkeypatch.setattr(novel.novel_query, "EXPORT_WATERMARK_LAG", 0)
+    session_factory = async_sessionmaker(async_engine, expire_on_commit=False)
+    async with session_factory() as db:
+        user = User(id="deltauser", password="hashed", name="증분")
+        novel_row = Novel(title="테스트 소설", author="테스트 작가", source_url="http://test.com")
+        db.add_all([user, novel_row])
+        await db.commit()
+        shorts = [NovelShorts(novel_no=novel_row.no, form_type=1, content=f"내용 {i}", likes=0) for i in range(3)]
+        db.add_all(shorts)
+        await db.commit()
+        shorts_nos = [item.no for item in shorts]
+
+    try:
+        async with session_factory() as db:
+            watermark = await get_export_watermark(db)
+        await asyncio.sleep(0.01)
+
+        async with session_factory() as db:
+            await like_novel_shorts(db, user.no, shorts_nos[0])
+        async with session_factory() as db:
+            await update_shorts_media(db, shorts_nos[2], music="new.mp3")
+
+        async with session_factory() as db:
+            chunks = [chunk async for chunk in stream_novel_shorts_csv(db, changed_since=watermark)]
+        changed = [int(row[1]) for row in csv.reader("".join(chunks).splitlines()[1:]) if row[0] == str(novel_row.no)]
+        assert changed == [shorts_nos[0], shorts_nos[2]]
+    finally:
+        async with session_factory() as db:
+            await db.execute(delete(UserLike).where(UserLike.user_no == user.no))
+            await db.execute(delete(NovelShorts).where(NovelShorts.no.in_(shorts_nos)))
+            await db.execute(delete(Novel).where(Novel.no == novel_row.no))
+            await db.execute(delete(User).where(User.no == user.no))
+            await db.commit()
+
+
+async def test_export_endpoint_returns_next_watermark(client, db_session: AsyncSession):
+    novel_row = Novel(title="테스트 소설", author="테스트 작가", source_url="http://test.com")
+    db_session.add(novel_row)
+    await db_session.commit()
+    db_session.add(NovelShorts(novel_no=novel_row.no, form_type=1, content="내용"))
+    await db_session.commit()
+
+    response = await client.get("/admin/novel/export/csv", params={"admin_code": ADMIN_CODE})
+    watermark = response.headers["X-Next-Watermark"]
+
+    delta = await client.get("/admin/novel/export/csv", params={"admin_code": ADMIN_CODE, "since": watermark})
+    assert delta.status_code == 200
+    assert "X-Next-Watermark" in delta.headers
+
+    invalid = await client.get("/admin/novel/export/csv", params={"admin_code": ADMIN_CODE, "since": "잘못된값"})
+    assert invalid.status_code == 400
@@ -0,0 +1,175 @@
+from datetime import datetime
+
+from comment.comment_query import (
+    create_comment,
+    delete_comment,
+    dislike_comment,
+    get_comments,
+    get_replies,
+    like_comment,
+    update_comment,
+)
+from comment.comment_schema import CommentCreate, CommentUpdate
+from novel.novel_query import (
+    create_novel,
+    get_novel_detail,
+    get_novel_no_by_source_id,
+    get_post,
+    get_posts,
+    has_novel_shorts,
+    like_novel_shorts,
+    save_novel_shorts,
+    stream_novel_shorts_csv,
+    unlike_novel_shorts,
+    unsave_novel_shorts,
+    update_shorts_media,
+    update_shorts_media_by_novel_id,
+)
+from novel.novel_schema import NovelCreate
+import pytest
+from sqlalchemy import event, text
+from utils.cache import cache
+
+
+"""
+핫 쿼리 실행 계획 회귀 테스트
+대량 데이터를 넣고 ANALYZE 한 뒤 novel_query/comment_query 함수를 실행하면서 나간 SQL을 모두 모아
+EXPLAIN으로 계획을 확인한다. 어떤 테이블이든 Seq Scan이 나오면 실패 (인덱스 누락/조건식 불일치).
+"""
+
+pytestmark = pytest.mark.anyio
+
+SEED_SQL = [
+    """INSERT INTO "user" (id, name, gender, age, created_date)
+        SELECT 'p' || i, 'plan' || i, 'X', 20, now() FROM generate_series(1, 5000) i""",
+    """INSERT INTO novel (source_platform_type, source_id, source_url, title, author)
+        SELECT i % 3, i, 'http://plan.test', 'plan ' || i, 'author' FROM generate_series(1, 2000) i""",
+    """INSERT INTO novel_shorts (novel_no, form_type, content, views, likes, saves, comments)
+        SELECT (SELECT min(no) FROM novel) + i % 2000, 1, 'content ' || i, 0, 0, 0, 0
+        FROM generate_series(0, 19999) i""",
+    # 최상위 댓글 40k (10%는 삭제), 그중 일부에 답글 10k
+    """INSERT INTO comment (novel_shorts_no, user_no, created_date, is_del, content, "like")
+        SELECT (SELECT min(no) FROM novel_shorts) + i % 20000, (SELECT min(no) FROM "user") + i % 5000,
+            timestamp '2024-01-01' + i * interval '1 second', i % 10 = 0, 'comment ' || i, 0
+        FROM generate_series(0, 39999) i""",
+    """INSERT INTO comment (novel_shorts_no, user_no, parent_no, created_date, is_del, content, "like")
+        SELECT novel_shorts_no, user_no, no, created_date + interval '1 minute', false, 'reply', 0
+        FROM comment WHERE no % 4 = 0 AND NOT is_del""",
+    """INSERT INTO user_like (user_no, novel_shorts_no, is_del)
+        SELECT (SELECT min(no) FROM "user") + i % 5000, (SELECT min(no) FROM novel_shorts) + i, i % 5 = 0
+        FROM generate_series(0, 19999) i""",
+    """INSERT INTO user_like (user_no, comment_no, is_del)
+        SELECT (SELECT min(no) FROM "user") + i % 5000, (SELECT min(no) FROM comment) + i, false
+        FROM generate_series(0, 9999) i""",
+    """INSERT INTO user_save (user_no, novel_shorts_no, is_del)
+        SELECT (SELECT min(no) FROM "user") + i % 5000, (SELECT min(no) FROM novel_shorts) + i, i % 5 = 0
+        FROM generate_series(0, 19999) i""",
+]
+
+SEEDED_TABLES = '"user", novel, novel_shorts, comment, user_like, user_save, user_active_log'
+
+
+@pytest.fixture(scope="module")
+def seeded(engine, tables):
+    with engine.begin() as connection:
+        for statement in SEED_SQL:
+            connection.execute(text(statement))
+        ids = connection.execute(
+            text("""SELECT
+                (SELECT min(no) FROM "user") AS user_no,
+                (SELECT min(no) FROM novel) AS novel_no,
+                (SELECT max(no) FROM novel_shorts) AS last_shorts_no,
+                c.novel_shorts_no AS shorts_no, c.no AS comment_no, c.user_no AS comment_user_no
+                FROM comment c
+                WHERE c.parent_no IS NULL AND NOT c.is_del
+                    AND EXISTS (SELECT 1 FROM comment r WHERE r.parent_no = c.no)
+                ORDER BY c.no LIMIT 1""")
+        ).one()
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as connection:
+        connection.execute(text("ANALYZE"))
+
+    yield ids._asdict()
+
+    with engine.begin() as connection:
+        connection.execute(text(f"TRUNCATE {SEEDED_TABLES} RESTART IDENTITY CASCADE"))
+
+
+async def novel_scenario(db, ids):
+    await get_post(ids["shorts_no"], ids["user_no"], db)
+    await get_posts(db, 10, 100, ids["user_no"])
+    await get_posts(db, 10, 0, ids["user_no"], after_no=ids["last_shorts_no"] - 100)
+    await like_novel_shorts(db, ids["user_no"], ids["shorts_no"])
+    await unlike_novel_shorts(db, ids["user_no"], ids["shorts_no"])
+    await save_novel_shorts(db, ids["user_no"], ids["shorts_no"])
+    await unsave_novel_shorts(db, ids["user_no"], ids["shorts_no"])
+    await get_novel_detail(db, ids["novel_no"])
+
+
+async def novel_admin_scenario(db, ids):
+    duplicate = NovelCreate(
+        source_platform_type=1,
+        source_id=1,
+        source_type=0,
+        source_url="http://plan.test",
+        title="plan",
+        author="author",
+        description="",
+        genres=[],
+    )
+    assert not (await create_novel(db, duplicate)).success
+    await get_novel_no_by_source_id(db, 5)
+    await update_shorts_media(db, ids["shorts_no"], music="plan.mp3")
+    await update_shorts_media_by_novel_id(db, 5, music_path="plan.mp3")
+
+    # 증분 추출은 updated_date 인덱스로 변경분만 읽어야 함 (전체 추출은 원래 전체 스캔)
+    changed_since = datetime.now()
+    await has_novel_shorts(db, changed_since)
+    [chunk async for chunk in stream_novel_shorts_csv(db, changed_since=changed_since)]
+
+
+async def comment_scenario(db, ids):
+    first = await get_comments(db, ids["shorts_no"], limit=2)
+    last = first.comments[-1]
+    await get_comments(db, ids["shorts_no"], limit=2, after=(last.created_date, last.no))
+    await get_replies(db, ids["comment_no"])
+    await create_comment(
+        db, CommentCreate(novel_shorts_no=ids["shorts_no"], parent_no=ids["comment_no"], content="plan", user_no=1)
+    )
+    await like_comment(db, ids["user_no"], ids["comment_no"])
+    await dislike_comment(db, ids["user_no"], ids["comment_no"])
+    await update_comment(db, ids["comment_no"], ids["comment_user_no"], CommentUpdate(content="plan"))
+    await delete_comment(db, ids["comment_no"], ids["comment_user_no"])
+
+
+def seq_scans(plan: dict) -> list:
+    found = [plan["Relation Name"]] if plan["Node Type"] == "Seq Scan" else []
+    for child in plan.get("Plans", []):
+        found.extend(seq_scans(child))
+    return found
+
+
+@pytest.mark.parametrize("scenario", [novel_scenario, novel_admin_scenario, comment_scenario])
+async def test_hot_queries_do_not_seq_scan(db_session, seeded, scenario):
+    cache.local.clear()  # 캐시 적중으로 DB 조회가 빠지지 않도록
+    executed = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().split(None, 1)[0].upper() in ("SELECT", "WITH", "INSERT", "UPDATE", "DELETE"):
+            executed.append((statement, parameters[0] if executemany else parameters))
+
+    connection = await db_session.connection()
+    event.listen(connection.sync_connection, "before_cursor_execute", before_cursor_execute)
+    try:
+        await scenario(db_session, seeded)
+    finally:
+        event.remove(connection.sync_connection, "before_cursor_execute", before_cursor_execute)
+        cache.local.clear()
+
+    assert executed
+    failures = []
+    for statement, parameters in executed:
+        plan = (await connection.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {statement}", parameters)).scalar()
+        scanned = seq_scans(plan[0]["Plan"])
+        if scanned:
+            failures.append(f"Seq Scan on {', '.join(scanned)}:\n{statement}")
+    assert not failures, "\n\n".join(failures)
@@ -0,0 +1,94 @@
+from datetime import datetime
+from typing import List
+
+from comment.comment_schema import CommentListResponse, CommentResponse
+from fastapi import Response
+from models import Comment, Novel, NovelShorts, User
+from novel.novel_query import get_post, get_posts
+from novel.novel_schema import PostResponse
+import orjson
+from pydantic import TypeAdapter, ValidationError
+import pytest
+from utils import serialization
+from utils.cache import cache
+from utils.serialization import fast_response
+
+
+def make_comment(no: int, **overrides) -> CommentResponse:
+    values = {
+        "no": no,
+        "novel_shorts_no": 1,
+        "user_no": 1,
+        "user_name": "작성자",
+        "parent_no": None,
+        "content": f"댓글 {no}",
+        "like": 0,
+        "created_date": datetime(2024, 2, 9, 12, 0, 0, 123456),
+        "is_del": False,
+        "reply_count": 0,
+        "replies": [],
+        "next_reply_cursor": None,
+    }
+    values.update(overrides)
+    return CommentResponse.model_construct(**values)
+
+
+def test_fast_response_matches_pydantic_serialization():
+    reply = make_comment(2, parent_no=1)
+    result = CommentListResponse.model_construct(
+        success=True, message="ok", comments=[make_comment(1, reply_count=1, replies=[reply])]
+    )
+    response = Response()
+    response.headers["X-Next-Cursor"] = "abc"
+
+    fast = fast_response(result, CommentListResponse, response)
+
+    assert fast.headers["X-Next-Cursor"] == "abc"
+    assert fast.media_type == "application/json"
+    expected = TypeAdapter(CommentListResponse).dump_json(result)
+    assert orjson.loads(fast.body) == orjson.loads(expected)
+
+
+def test_fast_response_validates_schema_in_debug_mode():
+    # 검증 없이 만든 모델이 스키마와 다르면 RESPONSE_VALIDATION 모드(테스트)에서 바로 드러남
+    broken = [make_comment(1, user_name=None)]
+    with pytest.raises(ValidationError):
+        fast_response(broken, List[CommentResponse])
+
+
+@pytest.fixture
+async def null_columns_shorts(db_session, monkeypatch):
+    """NULL 허용 컬럼이 모두 NULL인 숏츠/댓글 (운영처럼 응답 검증을 끈 상태)"""
+    monkeypatch.setattr(serialization, "RESPONSE_VALIDATION", False)
+    cache.local.clear()
+    novel = Novel(title=None, author=None, source_url=None)
+    user = User(id="nulluser", password="hashed", name=None)
+    db_session.add_all([novel, user])
+    await db_session.flush()
+    shorts = NovelShorts(novel_no=novel.no, form_type=None, content=None, views=None, likes=None)
+    db_session.add(shorts)
+    await db_session.flush()
+    db_session.add(Comment(novel_shorts_no=shorts.no, user_no=user.no, content=None, like=None))
+    await db_session.commit()
+    yield shorts
+    cache.local.clear()
+
+
+@pytest.mark.anyio
+async def test_posts_with_null_columns_keep_response_contract(db_session, null_columns_shorts):
+    posts = await get_posts(db_session, 10, 0)
+    post = await get_post(null_columns_shorts.no, None, db_session)
+
+    feed = TypeAdapter(List[PostResponse]).validate_json(fast_response(posts, List[PostResponse]).body)
+    detail = PostResponse.model_validate_json(fast_response(post, PostResponse).body)
+    assert next(item for item in feed if item.no == null_columns_shorts.no) == detail
+    assert (detail.form_type, detail.content, detail.title, detail.views) == (0, "", "", 0)
+
+
+@pytest.mark.anyio
+async def test_comments_with_null_columns_keep_response_contract(client, null_columns_shorts):
+    response = await client.get(f"/shorts/{null_columns_shorts.no}/comments")
+
+    assert response.status_code == 200
+    comments = TypeAdapter(CommentListResponse).validate_json(response.content).comments
+    assert [(c.user_name, c.content, c.like) for c in comments] == [("", "", 0)]
@@ -0,0 +1,96 @@
+import json
+import os
+from pathlib import Path
+import socket
+import subprocess
+import sys
+import time
+from urllib.error import URLError
+from urllib.request import urlopen
+
+import pytest
+
+
+"""
+워커 시작 시간 테스트
+- 무거운 모듈(암호화 백엔드 등)을 import 하지 않고 작업 디렉토리에 로그 파일을 만들지 않는지 항상 확인한다.
+- uvicorn main:app 을 실제로 띄워 /health_check 첫 200 응답까지의 시간이 예산 안인지는
+  실행 환경 부하에 따라 흔들리므로 STARTUP_BUDGET_MS 를 지정했을 때만 확인한다.
+
+    STARTUP_BUDGET_MS=2500 python -m pytest tests/test_startup.py
+"""
+
+REPO_DIR = Path(__file__).resolve().parent.parent
+# 워커 spawn → 첫 응답 예산 (측정 환경 기준 p50 약 1.4초)
+STARTUP_BUDGET_MS = os.getenv("STARTUP_BUDGET_MS")
+READY_TIMEOUT = 30.0
+POLL_INTERVAL = 0.005
+LAZY_MODULES = ["jose", "cryptography", "passlib", "bcrypt", "pyarrow", "redis", "PIL"]
+
+
+def app_env() -> dict:
+    # 띄운 앱이 테스트 DB를 보도록 DB_* 를 덮어씀
+    return {
+        **os.environ,
+        "PYTHONPATH": str(REPO_DIR),
+        "DB_USER": os.getenv("TEST_DB_USER", "postgres"),
+        "DB_PASSWORD": os.getenv("TEST_DB_PASSWORD", "postgres"),
+        "DB_HOST": os.getenv("TEST_DB_HOST", "localhost"),
+        "DB_PORT": os.getenv("TEST_DB_PORT", "5432"),
+        "DB_NAME": os.getenv("TEST_DB_NAME", "test_db"),
+    }
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def measure_ready() -> float:
+    """uvicorn main:app 프로세스를 띄운 시점부터 /health_check 첫 200 응답까지의 시간 (ms)"""
+    port = free_port()
+    url = f"http://127.0.0.1:{port}/health_check"
+    start = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--port", str(port), "--log-level", "warning"],
+        cwd=REPO_DIR,
+        env=app_env(),
+    )
+    try:
+        while time.perf_counter() - start < READY_TIMEOUT:
+            if process.poll() is not None:
+                raise RuntimeError(f"앱 프로세스가 종료되었습니다 (exit {process.returncode})")
+            try:
+                with urlopen(url, timeout=1) as response:
+                    if response.status == 200:
+                        return (time.perf_counter() - start) * 1000
+            except (URLError, ConnectionError):
+                time.sleep(POLL_INTERVAL)
+        raise RuntimeError(f"{READY_TIMEOUT}초 안에 응답하지 않았습니다")
+    finally:
+        process.terminate()
+        process.wait()
+
+
+@pytest.mark.skipif(STARTUP_BUDGET_MS is None, reason="STARTUP_BUDGET_MS 를 지정했을 때만 시작 시간 예산 확인")
+def test_worker_becomes_ready_within_budget():
+    budget = float(STARTUP_BUDGET_MS)
+    measure_ready()  # 바이트코드 캐시 생성용 워밍업
+    elapsed = min(measure_ready() for _ in range(3))
+
+    assert elapsed < budget, f"spawn → first 200: {elapsed:.0f} ms (budget {budget:.0f} ms)"
+
+
+def test_import_main_defers_heavy_modules_and_file_side_effects(tmp_path):
+    # 빈 작업 디렉토리에서 import 해 logs/ 등이 생기는지 확인
+    script = (
+        "import json, sys; import main; "
+        f"print(json.dumps([name for name in {LAZY_MODULES!r} if name in sys.modules]))"
+    )
+    output = subprocess.run(
+        [sys.executable, "-c", script], cwd=tmp_path, env=app_env(), check=True, capture_output=True, text=True
+    ).stdout
+
+    assert json.loads(output.strip().splitlines()[-1]) == []
+    assert list(tmp_path.iterdir()) == []
@@ -1,21 +1,18 @@
+import asyncio
+from contextlib import nullcontext
 import json
 
-from database import get_db
-from fastapi.testclient import TestClient
-from main import app
+from models import ActiveType, Novel, NovelShorts, User, UserActiveLog
 import pytest
+from sqlalchemy import func, select
+from user import active_log_buffer as active_log_buffer_module
+from user.active_log_buffer import ActiveLogBuffer
+from user.password_hasher import PasswordHasher, PasswordHasherBusy
+from user.user_query import build_active_log_row, create_active_log_batch
+from user.user_schema import UserActiveCreate
 
 
-@pytest.fixture
-def client(db_session):
-    def override_get_db():
-        try:
-            yield db_session
-        finally:
-            pass
-
-    app.dependency_overrides[get_db] = override_get_db
-    return TestClient(app)
+pytestmark = pytest.mark.anyio
 
 
 @pytest.fixture
@@ -29,10 +26,10 @@ def test_user():
     }
 
 
-def test_signup(client, test_user):
+async def test_signup(client, test_user):
     # 회원가입 테스트
     print("\nTest user data:", json.dumps(test_user, ensure_ascii=False))  # 실제 JSON 데이터 확인
-    response = client.post("/user/signup", json=test_user, headers={"Content-Type": "application/json"})
+    response = await client.post("/user/signup", json=test_user, headers={"Content-Type": "application/json"})
     print("Response status:", response.status_code)
     print("Response body:", response.json())
 
@@ -40,40 +37,203 @@ def test_signup(client, test_user):
     assert response.json() == {"message": "회원가입이 완료되었습니다"}
 
     # 중복 회원가입 테스트
-    response = client.post("/user/signup", json=test_user)
+    response = await client.post("/user/signup", json=test_user)
     assert response.status_code == 409
     assert response.json()["detail"] == "이미 존재하는 아이디입니다"
 
 
-def test_login(client, test_user):
+async def test_login(client, test_user):
     # 회원가입
-    client.post("/user/signup", json=test_user)
+    await client.post("/user/signup", json=test_user)
 
     # 올바른 로그인 테스트
     login_data = {"id": test_user["id"], "password": test_user["password"]}
-    response = client.post("/user/login", json=login_data)
+    response = await client.post("/user/login", json=login_data)
     assert response.status_code == 200
     assert "access_token" in response.json()
     assert response.cookies.get("access_token") is not None
 
     # 잘못된 비밀번호 테스트
     wrong_login = {"id": test_user["id"], "password": "wrongpassword"}
-    response = client.post("/user/login", json=wrong_login)
+    response = await client.post("/user/login", json=wrong_login)
     assert response.status_code == 401
     assert response.json()["detail"] == "아이디 또는 비밀번호가 일치하지 않습니다"
 
 
-def test_logout(client, test_user):
+async def test_logout(client, test_user):
     # 로그아웃 테스트 (로그인하지 않은 상태)
-    response = client.post("/user/logout")
+    response = await client.post("/user/logout")
     assert response.status_code == 401
     assert response.json()["detail"] == "이미 로그아웃된 상태입니다"
 
     # 로그인 후 로그아웃 테스트
-    client.post("/user/signup", json=test_user)
-    login_response = client.post("/user/login", json={"id": test_user["id"], "password": test_user["password"]})
+    await client.post("/user/signup", json=test_user)
+    login_response = await client.post("/user/login", json={"id": test_user["id"], "password": test_user["password"]})
 
     cookies = login_response.cookies
-    response = client.post("/user/logout", cookies=cookies)
+    response = await client.post("/user/logout", cookies=cookies)
     assert response.status_code == 200
     assert response.json() == {"message": "로그아웃되었습니다"}
+
+
+@pytest.fixture
+async def active_user(db_session):
+    user = User(id="activeuser", password="hashed", name="활동")
+    db_session.add(user)
+    await db_session.commit()
+    return user
+
+
+async def test_active_log_buffer_flushes_batches(db_session, active_user):
+    buffer = ActiveLogBuffer(session_factory=lambda: nullcontext(db_session), batch_size=3, flush_interval=0.05)
+    await buffer.start()
+
+    for _ in range(7):
+        assert await buffer.submit(active_user.no, UserActiveCreate(active_type=ActiveType.VIEW_START.value))
+    await buffer.stop()
+
+    count = await db_session.scalar(select(func.count()).where(UserActiveLog.user_no == active_user.no))
+    assert count == 7
+    assert buffer.stats()["flushed"] == 7
+    assert buffer.stats()["batches"] >= 3
+
+
+async def test_active_log_buffer_drops_only_rows_with_missing_references(db_session, active_user):
+    buffer = ActiveLogBuffer(session_factory=lambda: nullcontext(db_session), batch_size=10, flush_interval=0.05)
+    await buffer.start()
+
+    events = [UserActiveCreate(active_type=ActiveType.VIEW_START.value) for _ in range(4)]
+    events.insert(2, UserActiveCreate(active_type=ActiveType.VIEW_START.value, novel_shorts_no=987654321))
+    for event in events:
+        assert await buffer.submit(active_user.no, event)
+    await buffer.stop()
+
+    count = await db_session.scalar(select(func.count()).where(UserActiveLog.user_no == active_user.no))
+    assert count == 4
+    assert (buffer.stats()["flushed"], buffer.stats()["dropped"], buffer.stats()["failed"]) == (4, 1, 0)
+
+
+async def test_active_log_buffer_bisects_batch_on_fk_violation(db_session, active_user, monkeypatch):
+    # 참조 검사 뒤 대상이 지워진 경우 (검사를 통과시켜 INSERT에서 FK 위반이 나게 함)
+    async def skip_check(db, rows):
+        return rows, []
+
+    monkeypatch.setattr(active_log_buffer_module, "filter_referenced_rows", skip_check)
+    buffer = ActiveLogBuffer(session_factory=lambda: nullcontext(db_session))
+    user_no = active_user.no  # 롤백 뒤에는 active_user 속성이 만료됨
+    rows = [build_active_log_row(user_no, UserActiveCreate(active_type=ActiveType.VIEW_END.value))] * 5
+    rows[3] = build_active_log_row(
+        user_no, UserActiveCreate(active_type=ActiveType.VIEW_END.value, comment_no=987654321)
+    )
+
+    await buffer._flush(rows)
+
+    count = await db_session.scalar(select(func.count()).where(UserActiveLog.user_no == user_no))
+    assert count == 4
+    assert (buffer.stats()["flushed"], buffer.stats()["dropped"], buffer.stats()["failed"]) == (4, 1, 0)
+
+
+async def test_active_log_buffer_rejects_when_full(db_session, active_user):
+    # 저장 태스크를 띄우지 않아 큐가 비워지지 않는 상황
+    buffer = ActiveLogBuffer(session_factory=lambda: nullcontext(db_session), max_queue_size=2, put_timeout=0.01)
+    event = UserActiveCreate(active_type=ActiveType.VIEW_END.value)
+
+    assert await buffer.submit(active_user.no, event)
+    assert await buffer.submit(active_user.no, event)
+    assert not await buffer.submit(active_user.no, event)
+    assert buffer.stats()["rejected"] == 1
+
+    # 종료 시 남은 로그는 저장
+    await buffer.stop()
+    count = await db_session.scalar(select(func.count()).where(UserActiveLog.user_no == active_user.no))
+    assert count == 2
+
+
+async def test_active_log_batch_reports_per_item_results(db_session, active_user, query_counter):
+    novel = Novel(title="테스트 소설", author="테스트 작가", source_url="http://test.com")
+    db_session.add(novel)
+    await db_session.commit()
+    shorts = NovelShorts(novel_no=novel.no, form_type=1, content="배치")
+    db_session.add(shorts)
+    await db_session.commit()
+    shorts_no, user_no = shorts.no, active_user.no
+    query_counter.clear()
+
+    events = [
+        {"novel_shorts_no": shorts_no, "active_type": ActiveType.VIEW_START.value},
+        {"novel_shorts_no": shorts_no, "active_type": "시청"},  # 형식 오류
+        {"novel_shorts_no": shorts_no, "active_type": 999},  # 알 수 없는 유형
+        {"novel_shorts_no": shorts_no + 1000, "active_type": ActiveType.VIEW_END.value},  # 없는 숏츠
+        "not-an-object",
+    ] + [{"novel_shorts_no": shorts_no, "active_type": ActiveType.VIEW_END.value}] * 100
+
+    result = await create_active_log_batch(db_session, user_no, events)
+
+    assert result.success
+    assert result.accepted == 101
+    assert result.rejected == 4
+    assert [item.index for item in result.results] == list(range(len(events)))
+    assert [item.accepted for item in result.results[:5]] == [True, False, False, False, False]
+    assert result.results[1].reason.startswith("active_type")
+    assert result.results[3].reason == "존재하지 않는 대상입니다"
+
+    # 참조 확인 2회 (사용자, 숏츠. novel_no/comment_no는 비어 있어 생략) + INSERT 1회
+    assert len([stmt for stmt in query_counter if stmt.lstrip().upper().startswith("INSERT")]) == 1
+    assert len(query_counter) == 3
+
+    count = await db_session.scalar(select(func.count()).where(UserActiveLog.user_no == user_no))
+    assert count == 101
+
+
+async def test_password_hasher_round_trip_off_event_loop():
+    hasher = PasswordHasher(workers=1, max_pending=4, rounds=10)
+    ticks = 0
+
+    async def ticker():
+        nonlocal ticks
+        while True:
+            ticks += 1
+            await asyncio.sleep(0.001)
+
+    task = asyncio.create_task(ticker())
+    hashed = await hasher.hash("Test1234!")
+    assert await hasher.verify("Test1234!", hashed)
+    assert not await hasher.verify("Wrong1234!", hashed)
+    task.cancel()
+    hasher.shutdown()
+
+    # bcrypt가 도는 동안에도 이벤트 루프가 다른 작업을 처리해야 함
+    assert ticks > 10
+    assert hashed.startswith("$2b$10$")
+    assert hasher.stats()["completed"] == 3
+
+
+async def test_password_hasher_rejects_when_pool_is_full():
+    hasher = PasswordHasher(workers=1, max_pending=2, rounds=10)
+    hashed = hasher.context.hash("Test1234!")
+
+    results = await asyncio.gather(
+        *[hasher.verify("Test1234!", hashed) for _ in range(3)],
+        return_exceptions=True,
+    )
+    hasher.shutdown()
+
+    assert results[:2] == [True, True]
+    assert isinstance(results[2], PasswordHasherBusy)
+    assert hasher.stats()["rejected"] == 1
+    assert hasher.stats()["max_pending_seen"] == 2
+
+
+async def test_active_log_batch_rejects_items_of_deleted_user(db_session, active_user):
+    # 토큰은 아직 유효하지만 사용자가 지워진 경우 FK 위반(500) 대신 항목별로 거절
+    user_no = active_user.no
+    await db_session.delete(active_user)
+    await db_session.commit()
+
+    events = [{"active_type": ActiveType.VIEW_START.value}, {"active_type": "시청"}]
+    result = await create_active_log_batch(db_session, user_no, events)
+
+    assert result.success
+    assert (result.accepted, result.rejected) == (0, 2)
+    assert result.results[0].reason == "존재하지 않는 대상입니다"
+    assert result.results[1].reason.startswith("active_type")
@@ -0,0 +1,172 @@
+import asyncio
+import os
+import time
+from typing import Dict, List, Optional
+
+from database import AsyncSessionLocal
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from user.user_query import build_active_log_row, create_active_logs, filter_referenced_rows
+from user.user_schema import UserActiveCreate
+from utils.logger import configure_logging, logger
+
+
+"""
+활동 로그 write-behind 버퍼
+- 요청은 큐에 넣고 바로 응답, 백그라운드 태스크가 batch_size 또는 flush_interval 기준으로 모아서 다중 행 INSERT
+- 큐는 max_queue_size로 제한되며, 가득 차면 put_timeout 동안 기다린 뒤 거절(backpressure)
+- 앱 종료 시 stop()에서 남은 로그를 모두 저장
+- 참조 대상(사용자/소설/숏츠/댓글)이 없는 로그는 INSERT 전에 걸러 버리고(dropped), 나머지 로그는 그대로 저장
+  검사 뒤 대상이 지워져 FK 위반이 나면 배치를 반씩 나눠 다시 시도해 위반한 로그만 버림
+"""
+
+ACTIVE_LOG_BATCH_SIZE = int(os.getenv("ACTIVE_LOG_BATCH_SIZE", "500"))
+ACTIVE_LOG_FLUSH_INTERVAL = float(os.getenv("ACTIVE_LOG_FLUSH_INTERVAL", "1.0"))  # 초
+ACTIVE_LOG_QUEUE_SIZE = int(os.getenv("ACTIVE_LOG_QUEUE_SIZE", "10000"))
+ACTIVE_LOG_PUT_TIMEOUT = float(os.getenv("ACTIVE_LOG_PUT_TIMEOUT", "0.5"))  # 초
+
+
+class ActiveLogBuffer:
+    def __init__(
+        self,
+        session_factory=AsyncSessionLocal,
+        batch_size: int = ACTIVE_LOG_BATCH_SIZE,
+        flush_interval: float = ACTIVE_LOG_FLUSH_INTERVAL,
+        max_queue_size: int = ACTIVE_LOG_QUEUE_SIZE,
+        put_timeout: float = ACTIVE_LOG_PUT_TIMEOUT,
+    ):
+        self.session_factory = session_factory
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_queue_size = max_queue_size
+        self.put_timeout = put_timeout
+
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+        self._flushing: Optional[asyncio.Future] = None
+        self.accepted = 0
+        self.rejected = 0
+        self.flushed = 0
+        self.failed = 0
+        self.dropped = 0
+        self.batches = 0
+
+    @property
+    def queue(self) -> asyncio.Queue:
+        # 이벤트 루프가 뜬 뒤에 생성되도록 지연 생성
+        if self._queue is None:
+            self._queue = asyncio.Queue(maxsize=self.max_queue_size)
+        return self._queue
+
+    async def start(self):
+        if self._task is None:
+            configure_logging()
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """백그라운드 태스크를 멈추고 큐에 남은 로그를 모두 저장"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+        if self._flushing is not None:
+            await self._flushing
+            self._flushing = None
+
+        while not self.queue.empty():
+            await self._flush(self._drain(self.batch_size))
+
+    async def submit(self, user_no: int, active_data: UserActiveCreate) -> bool:
+        """로그를 큐에 넣음. 큐가 put_timeout 동안 계속 가득 차 있으면 False"""
+        row = build_active_log_row(user_no, active_data)
+        try:
+            self.queue.put_nowait(row)
+        except asyncio.QueueFull:
+            try:
+                await asyncio.wait_for(self.queue.put(row), timeout=self.put_timeout)
+            except asyncio.TimeoutError:
+                self.rejected += 1
+                return False
+
+        self.accepted += 1
+        return True
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "queued": self.queue.qsize(),
+            "accepted": self.accepted,
+            "rejected": self.rejected,
+            "flushed": self.flushed,
+            "failed": self.failed,
+            "dropped": self.dropped,
+            "batches": self.batches,
+        }
+
+    def _drain(self, limit: int) -> List[dict]:
+        rows = []
+        while len(rows) < limit and not self.queue.empty():
+            rows.append(self.queue.get_nowait())
+        return rows
+
+    async def _run(self):
+        while True:
+            rows = []
+            try:
+                # 첫 로그를 기다린 뒤, batch_size가 찰 때까지 최대 flush_interval 동안 모음
+                rows.append(await self.queue.get())
+                deadline = time.monotonic() + self.flush_interval
+                while len(rows) < self.batch_size:
+                    rows.extend(self._drain(self.batch_size - len(rows)))
+                    remaining = deadline - time.monotonic()
+                    if len(rows) >= self.batch_size or remaining <= 0:
+                        break
+                    try:
+                        rows.append(await asyncio.wait_for(self.queue.get(), timeout=remaining))
+                    except asyncio.TimeoutError:
+                        break
+            except asyncio.CancelledError:
+                # 종료 중이면 모으던 로그까지 저장
+                await self._flush(rows)
+                raise
+
+            # 저장 도중 취소되더라도 INSERT는 끝까지 수행
+            self._flushing = asyncio.ensure_future(self._flush(rows))
+            await asyncio.shield(self._flushing)
+
+    async def _flush(self, rows: List[dict]):
+        if not rows:
+            return
+
+        try:
+            async with self.session_factory() as db:
+                kept, dropped = await filter_referenced_rows(db, rows)
+                saved = await self._insert(db, kept)
+            self.flushed += saved
+            self.dropped += len(dropped) + len(kept) - saved
+            self.batches += 1
+            if dropped:
+                logger.warning(f"ActiveLogBuffer 참조 대상이 없는 로그 {len(dropped)}건 제외 (예: {dropped[0]})")
+        except Exception as e:
+            self.failed += len(rows)
+            logger.error(f"ActiveLogBuffer flush 실패 ({len(rows)} rows): {str(e)}")
+
+    async def _insert(self, db: AsyncSession, rows: List[dict]) -> int:
+        """INSERT 후 저장한 행 수 반환. FK 위반이면 반씩 나눠 다시 시도해 위반한 행만 버림"""
+        if not rows:
+            return 0
+        try:
+            return await create_active_logs(db, rows)
+        except IntegrityError as e:
+            await db.rollback()
+            if len(rows) == 1:
+                logger.warning(f"ActiveLogBuffer 참조 대상이 없는 로그 제외: {rows[0]} ({e.orig})")
+                return 0
+            middle = len(rows) // 2
+            return await self._insert(db, rows[:middle]) + await self._insert(db, rows[middle:])
+
+
+active_log_buffer = ActiveLogBuffer()
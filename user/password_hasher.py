@@ -0,0 +1,110 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+import os
+import threading
+from typing import Optional
+
+
+"""
+비밀번호 해시/검증 전용 워커 풀
+- bcrypt는 요청당 수십~수백 ms의 CPU를 쓰므로 이벤트 루프 밖의 전용 스레드에서 실행 (bcrypt는 실행 중 GIL을 놓음)
+- 대기 + 실행 중인 작업 수가 max_pending을 넘으면 바로 PasswordHasherBusy로 거절(admission control)
+- 워커 스레드는 nice 값을 높여 CPU가 부족할 때 피드 등 다른 요청 처리가 먼저 스케줄되도록 함
+"""
+
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", "12"))  # bcrypt cost factor
+PASSWORD_WORKERS = int(os.getenv("PASSWORD_WORKERS", str(max(1, (os.cpu_count() or 2) - 1))))
+PASSWORD_MAX_PENDING = int(os.getenv("PASSWORD_MAX_PENDING", str(PASSWORD_WORKERS * 4)))  # 최대 대기 ≈ 4회 해시 시간
+PASSWORD_WORKER_NICE = int(os.getenv("PASSWORD_WORKER_NICE", "10"))
+
+
+class PasswordHasherBusy(Exception):
+    """비밀번호 작업 대기열이 가득 차 요청을 받을 수 없음"""
+
+
+class PasswordHasher:
+    def __init__(
+        self,
+        workers: int = PASSWORD_WORKERS,
+        max_pending: int = PASSWORD_MAX_PENDING,
+        rounds: int = BCRYPT_ROUNDS,
+        worker_nice: int = PASSWORD_WORKER_NICE,
+    ):
+        self.workers = workers
+        self.max_pending = max_pending
+        self.worker_nice = worker_nice
+        self.rounds = rounds
+        self._context = None
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+        self.pending = 0  # 대기 + 실행 중 (이벤트 루프에서만 변경)
+        self.max_pending_seen = 0
+        self.completed = 0
+        self.rejected = 0
+
+    @property
+    def context(self):
+        # passlib/bcrypt 백엔드는 import 비용이 커서 실제로 비밀번호 작업이 있을 때 로드
+        if self._context is None:
+            from passlib.context import CryptContext
+
+            self._context = CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=self.rounds)
+        return self._context
+
+    @property
+    def executor(self) -> ThreadPoolExecutor:
+        # 실제로 비밀번호 작업이 있을 때 스레드 생성
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.workers, thread_name_prefix="password", initializer=self._init_worker
+            )
+        return self._executor
+
+    def _init_worker(self) -> None:
+        if self.worker_nice <= 0:
+            return
+        try:
+            # Linux에서는 스레드 단위로 nice 값이 적용됨
+            os.setpriority(os.PRIO_PROCESS, threading.get_native_id(), self.worker_nice)
+        except (AttributeError, OSError):
+            pass
+
+    async def _submit(self, func, *args):
+        if self.pending >= self.max_pending:
+            self.rejected += 1
+            raise PasswordHasherBusy()
+
+        self.pending += 1
+        self.max_pending_seen = max(self.max_pending_seen, self.pending)
+        try:
+            result = await asyncio.get_running_loop().run_in_executor(self.executor, func, *args)
+            self.completed += 1
+            return result
+        finally:
+            self.pending -= 1
+
+    async def hash(self, password: str) -> str:
+        return await self._submit(self.context.hash, password)
+
+    async def verify(self, plain_password: str, hashed_password: str) -> bool:
+        return await self._submit(self.context.verify, plain_password, hashed_password)
+
+    def stats(self) -> dict:
+        return {
+            "workers": self.workers,
+            "max_pending": self.max_pending,
+            "pending": self.pending,
+            "running": min(self.pending, self.workers),
+            "queued": max(0, self.pending - self.workers),
+            "max_pending_seen": self.max_pending_seen,
+            "completed": self.completed,
+            "rejected": self.rejected,
+        }
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+
+password_hasher = PasswordHasher()
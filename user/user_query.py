@@ -1,54 +1,193 @@
 from datetime import datetime
+import os
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
 
-from models import User, UserActiveLog
-from passlib.context import CryptContext
-from sqlalchemy.orm import Session
-from user.user_schema import NewUserForm, UserActiveCreate, UserActiveResponse
+from models import ActiveType, Comment, Novel, NovelShorts, User, UserActiveLog
+from pydantic import ValidationError
+from sqlalchemy import insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from user.password_hasher import password_hasher
+from user.user_schema import (
+    NewUserForm,
+    UserActiveBatchResponse,
+    UserActiveCreate,
+    UserActiveItemResult,
+    UserActiveResponse,
+    UserNameUpdate,
+)
+from utils.cache import cache
 
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+async def verify_password(plain_password, hashed_password):
+    # bcrypt 검증은 전용 워커 풀에서 실행 (대기열이 가득 차면 PasswordHasherBusy)
+    return await password_hasher.verify(plain_password, hashed_password)
 
 
-def verify_password(plain_password, hashed_password):
-    return pwd_context.verify(plain_password, hashed_password)
-
-
-def get_user(db: Session, id: str, provider: str = None):
+async def get_user(db: AsyncSession, id: str, provider: str = None):
     if provider:
-        return db.query(User).filter(User.id == id, User.provider == provider).first()
+        return await db.scalar(select(User).where(User.id == id, User.provider == provider))
     else:
-        return db.query(User).filter(User.id == id).first()
+        return await db.scalar(select(User).where(User.id == id))
 
 
-def create_user(new_user: NewUserForm, db: Session):
+async def create_user(new_user: NewUserForm, db: AsyncSession):
     user = User(
         id=new_user.id,
-        password=pwd_context.hash(new_user.password),
+        password=await password_hasher.hash(new_user.password),
         name=new_user.name,
         gender=new_user.gender,
         age=new_user.age,
     )
     db.add(user)
-    db.commit()
+    await db.commit()
 
 
-def create_active_log(db: Session, user_no: int, active_data: UserActiveCreate) -> UserActiveResponse:
-    try:
-        log = UserActiveLog(
-            user_no=user_no,
-            novel_no=active_data.novel_no,
-            novel_shorts_no=active_data.novel_shorts_no,
-            comment_no=active_data.comment_no,
-            active_type=active_data.active_type,
-            acted_date=active_data.acted_date,
-            created_date=datetime.now(),
-        )
+# 댓글 작성자 표시용 사용자 이름 캐시 (이름 변경 시 무효화)
+USER_NAME_CACHE_TTL = float(os.getenv("USER_NAME_CACHE_TTL", "3600"))  # 초
+
+
+def user_name_cache_key(user_no: int) -> str:
+    return f"user_name:v2:{user_no}"
+
+
+async def get_user_names(db: AsyncSession, user_nos: Iterable[int]) -> Dict[int, Optional[str]]:
+    """사용자 번호별 이름 조회 (캐시에 없는 번호만 IN 쿼리 한 번으로 가져와 캐시에 채움)"""
+    keys = {user_no: user_name_cache_key(user_no) for user_no in set(user_nos)}
+    cached = await cache.get_many(list(keys.values()))
+    # 캐시는 None을 없는 값으로 보므로 이름이 NULL인 사용자도 캐시되도록 [이름]으로 감싸 저장
+    names = {user_no: cached[key][0] for user_no, key in keys.items() if key in cached}
+
+    missing = [user_no for user_no in keys if user_no not in names]
+    if missing:
+        loaded = dict((await db.execute(select(User.no, User.name).where(User.no.in_(missing)))).all())
+        await cache.set_many({keys[user_no]: [name] for user_no, name in loaded.items()}, USER_NAME_CACHE_TTL)
+        names.update(loaded)
+    return names
 
-        db.add(log)
-        db.commit()
+
+async def update_user_name(db: AsyncSession, user_no: int, name_form: UserNameUpdate) -> bool:
+    updated = await db.scalar(update(User).where(User.no == user_no).values(name=name_form.name).returning(User.no))
+    await db.commit()
+    await cache.delete(user_name_cache_key(user_no))
+    return updated is not None
+
+
+def build_active_log_row(user_no: int, active_data: UserActiveCreate) -> dict:
+    """활동 로그 1건을 user_active_log INSERT용 dict로 변환"""
+    return {
+        "user_no": user_no,
+        "novel_no": active_data.novel_no,
+        "novel_shorts_no": active_data.novel_shorts_no,
+        "comment_no": active_data.comment_no,
+        "active_type": active_data.active_type,
+        "acted_date": active_data.acted_date,
+        "created_date": datetime.now(),
+    }
+
+
+async def create_active_logs(db: AsyncSession, rows: List[dict]) -> int:
+    """활동 로그 여러 건을 다중 행 INSERT 후 한 번에 commit"""
+    if not rows:
+        return 0
+
+    await db.execute(insert(UserActiveLog), rows)
+    await db.commit()
+    return len(rows)
+
+
+async def create_active_log(db: AsyncSession, user_no: int, active_data: UserActiveCreate) -> UserActiveResponse:
+    try:
+        await create_active_logs(db, [build_active_log_row(user_no, active_data)])
 
         return UserActiveResponse(success=True, message="활동 로그가 저장되었습니다")
     except Exception as e:
         print(f"Error in create_active_log: {str(e)}")
-        db.rollback()
+        await db.rollback()
         return UserActiveResponse(success=False, message="활동 로그 저장 중 오류가 발생했습니다")
+
+
+ACTIVE_TYPE_VALUES = {active_type.value for active_type in ActiveType}
+
+# 배치 로그가 참조하는 대상 (UserActiveCreate 필드, 모델)
+ACTIVE_LOG_REFERENCES = (
+    ("novel_no", Novel),
+    ("novel_shorts_no", NovelShorts),
+    ("comment_no", Comment),
+)
+
+
+async def get_existing_nos(db: AsyncSession, model, nos: Set[int]) -> Set[int]:
+    """주어진 no 중 실제로 존재하는 것만 한 번의 IN 쿼리로 조회"""
+    if not nos:
+        return set()
+    return set(await db.scalars(select(model.no).where(model.no.in_(nos))))
+
+
+async def filter_referenced_rows(db: AsyncSession, rows: List[dict]) -> Tuple[List[dict], List[dict]]:
+    """활동 로그 INSERT용 행을 참조 대상(사용자 포함)이 모두 있는 행과 없는 행으로 나눔 (대상 테이블별 IN 쿼리 한 번)"""
+    kept, dropped = rows, []
+    for field, model in (("user_no", User), *ACTIVE_LOG_REFERENCES):
+        existing = await get_existing_nos(db, model, {row[field] for row in kept if row[field] is not None})
+        missing = [row for row in kept if row[field] is not None and row[field] not in existing]
+        if missing:
+            kept = [row for row in kept if row[field] is None or row[field] in existing]
+            dropped.extend(missing)
+    return kept, dropped
+
+
+async def create_active_log_batch(db: AsyncSession, user_no: int, events: List[Any]) -> UserActiveBatchResponse:
+    """활동 로그 배치를 항목별로 검증한 뒤, 통과한 항목만 한 번의 INSERT로 저장"""
+    results: List[UserActiveItemResult] = []
+    valid: Dict[int, UserActiveCreate] = {}
+
+    # 1. 항목별 형식 검증 (잘못된 항목 하나가 배치 전체를 실패시키지 않도록 개별 처리)
+    for index, event in enumerate(events):
+        try:
+            active_data = UserActiveCreate.model_validate(event)
+        except ValidationError as e:
+            error = e.errors()[0]
+            field = ".".join(str(loc) for loc in error["loc"])
+            reason = f"{field}: {error['msg']}" if field else error["msg"]
+            results.append(UserActiveItemResult(index=index, accepted=False, reason=reason))
+            continue
+
+        if active_data.active_type not in ACTIVE_TYPE_VALUES:
+            results.append(UserActiveItemResult(index=index, accepted=False, reason="알 수 없는 활동 유형입니다"))
+            continue
+        valid[index] = active_data
+
+    try:
+        # 2. 참조 대상(사용자 포함) 존재 여부를 버퍼와 같은 검사로 확인 (FK 위반으로 INSERT 전체가 실패하지 않도록)
+        rows = {index: build_active_log_row(user_no, data) for index, data in valid.items()}
+        kept, dropped = await filter_referenced_rows(db, list(rows.values()))
+        dropped_rows = {id(row) for row in dropped}
+        for index, row in rows.items():
+            if id(row) in dropped_rows:
+                results.append(UserActiveItemResult(index=index, accepted=False, reason="존재하지 않는 대상입니다"))
+                del valid[index]
+
+        # 3. 통과한 항목만 다중 행 INSERT 한 번으로 저장
+        await create_active_logs(db, kept)
+    except Exception as e:
+        print(f"Error in create_active_log_batch: {str(e)}")
+        await db.rollback()
+        return UserActiveBatchResponse(
+            success=False,
+            message="활동 로그 저장 중 오류가 발생했습니다",
+            accepted=0,
+            rejected=len(events),
+            results=[
+                UserActiveItemResult(index=index, accepted=False, reason="저장 중 오류가 발생했습니다")
+                for index in range(len(events))
+            ],
+        )
+
+    results.extend(UserActiveItemResult(index=index, accepted=True) for index in valid)
+    results.sort(key=lambda result: result.index)
+    return UserActiveBatchResponse(
+        success=True,
+        message=f"활동 로그 {len(valid)}건이 저장되었습니다",
+        accepted=len(valid),
+        rejected=len(events) - len(valid),
+        results=results,
+    )
@@ -6,13 +6,13 @@ from auth.jwt_bearer import JWTBearer
 from database import get_db
 from dotenv import load_dotenv
 from fastapi import APIRouter, Depends, HTTPException, status
-from jose import jwt
 from pydantic import ValidationError
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from starlette.responses import JSONResponse
 from user import user_query, user_schema
-from user.user_query import create_active_log
-from user.user_schema import UserActiveCreate, UserActiveResponse
+from user.active_log_buffer import active_log_buffer
+from user.password_hasher import PasswordHasherBusy
+from user.user_schema import UserActiveBatchCreate, UserActiveBatchResponse, UserActiveCreate, UserActiveResponse
 
 
 load_dotenv()
@@ -31,6 +31,9 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     else:
         expire = datetime.now() + timedelta(minutes=15)
     to_encode.update({"exp": expire})
+    # jose(cryptography)는 import 비용이 커서 처음 토큰을 발급할 때 import
+    from jose import jwt
+
     encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
     return encoded_jwt
 
@@ -39,18 +42,26 @@ jwt_bearer = JWTBearer()
 
 
 @app.post(path="/signup")
-async def signup(new_user: user_schema.NewUserForm, db: Session = Depends(get_db)):
+async def signup(new_user: user_schema.NewUserForm, db: AsyncSession = Depends(get_db)):
     try:
         # 회원 존재 여부 확인
-        user = user_query.get_user(db, new_user.id)
+        user = await user_query.get_user(db, new_user.id)
         if user:
             raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="이미 존재하는 아이디입니다")
 
         # 회원 가입
-        user_query.create_user(new_user, db)
+        await user_query.create_user(new_user, db)
         return JSONResponse(status_code=status.HTTP_200_OK, content={"message": "회원가입이 완료되었습니다"})
     except ValidationError as e:
         raise HTTPException(status_code=422, detail=str(e))
+    except HTTPException:
+        raise
+    except PasswordHasherBusy:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="요청이 많아 처리하지 못했습니다. 잠시 후 다시 시도해주세요",
+            headers={"Retry-After": "1"},
+        )
     except Exception as e:
         print(f"Signup error: {str(e)}")  # 에러 로깅
         raise HTTPException(
@@ -65,18 +76,18 @@ async def signup(new_user: user_schema.NewUserForm, db: Session = Depends(get_db
 )
 async def login(
     login_form: user_schema.LoginForm,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
 ):
     try:
         # 회원 존재 여부 확인
-        user = user_query.get_user(db, login_form.id)
+        user = await user_query.get_user(db, login_form.id)
         if not user:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED, detail="아이디 또는 비밀번호가 일치하지 않습니다"
             )
 
         # 비밀번호 검증
-        if not user_query.verify_password(login_form.password, user.password):
+        if not await user_query.verify_password(login_form.password, user.password):
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED, detail="아이디 또는 비밀번호가 일치하지 않습니다"
             )
@@ -91,6 +102,14 @@ async def login(
     except ValidationError as e:
         print(f"Validation error: {str(e)}")
         raise HTTPException(status_code=422, detail=str(e))
+    except HTTPException:
+        raise
+    except PasswordHasherBusy:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="요청이 많아 처리하지 못했습니다. 잠시 후 다시 시도해주세요",
+            headers={"Retry-After": "1"},
+        )
     except Exception as e:
         print(f"Login error: {str(e)}")
         raise HTTPException(
@@ -98,6 +117,26 @@ async def login(
         )
 
 
+@app.put(path="/name", description="이름 변경")
+async def update_name(
+    name_form: user_schema.UserNameUpdate,
+    current_user: dict = Depends(jwt_bearer),
+    db: AsyncSession = Depends(get_db),
+):
+    try:
+        if not await user_query.update_user_name(db, current_user["user_no"], name_form):
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="존재하지 않는 회원입니다")
+        return JSONResponse(status_code=status.HTTP_200_OK, content={"message": "이름이 변경되었습니다"})
+    except HTTPException:
+        raise
+    except Exception as e:
+        print(f"Update name error: {str(e)}")
+        await db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="이름 변경 처리 중 오류가 발생했습니다"
+        )
+
+
 @app.post(path="/logout")
 async def logout(current_user: dict = Depends(jwt_bearer)):
     try:
@@ -109,10 +148,23 @@ async def logout(current_user: dict = Depends(jwt_bearer)):
 
 
 @active_router.post("/log", response_model=UserActiveResponse)
-async def log_user_activity(
-    active_data: UserActiveCreate, current_user: dict = Depends(jwt_bearer), db: Session = Depends(get_db)
+async def log_user_activity(active_data: UserActiveCreate, current_user: dict = Depends(jwt_bearer)):
+    # DB에 바로 쓰지 않고 버퍼에 넣은 뒤 백그라운드에서 모아서 저장
+    accepted = await active_log_buffer.submit(current_user["user_no"], active_data)
+    if not accepted:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="요청이 많아 활동 로그를 저장하지 못했습니다. 잠시 후 다시 시도해주세요",
+        )
+    return UserActiveResponse(success=True, message="활동 로그가 접수되었습니다")
+
+
+@active_router.post("/log/batch", response_model=UserActiveBatchResponse)
+async def log_user_activity_batch(
+    batch: UserActiveBatchCreate, current_user: dict = Depends(jwt_bearer), db: AsyncSession = Depends(get_db)
 ):
-    result = create_active_log(db, current_user["user_no"], active_data)
+    # 오프라인 동안 쌓인 이벤트 등을 한 번에 받아 항목별 수락/거절 결과를 반환
+    result = await user_query.create_active_log_batch(db, current_user["user_no"], batch.events)
     if not result.success:
-        raise HTTPException(status_code=400, detail=result.message)
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=result.message)
     return result
@@ -1,5 +1,5 @@
 from datetime import datetime
-from typing import Literal, Optional
+from typing import Any, List, Literal, Optional
 
 from pydantic import BaseModel, Field, field_validator
 
@@ -32,6 +32,16 @@ class NewUserForm(BaseModel):
     }
 
 
+class UserNameUpdate(BaseModel):
+    name: str = Field(..., min_length=1, max_length=10)
+
+    @field_validator("name")
+    def check_empty(cls, v: str) -> str:
+        if v.isspace():
+            raise ValueError("필수 항목을 입력해주세요")
+        return v
+
+
 class LoginForm(BaseModel):
     id: str = Field(..., description="사용자 아이디")
     password: str = Field(..., description="비밀번호")
@@ -56,10 +66,42 @@ class UserActiveCreate(BaseModel):
     novel_shorts_no: Optional[int] = None
     comment_no: Optional[int] = None
     active_type: int
-    acted_date: datetime = datetime.now()
+    acted_date: datetime = Field(default_factory=datetime.now)
 
 
 class UserActiveResponse(BaseModel):
     success: bool
     message: str
     active_no: Optional[int] = None
+
+
+ACTIVE_LOG_BATCH_MAX = 5000  # 배치 요청 1건당 최대 이벤트 수
+
+
+class UserActiveBatchCreate(BaseModel):
+    # 항목별로 수락/거절 결과를 돌려주기 위해 개별 이벤트 검증은 쿼리 단계에서 수행
+    events: List[Any] = Field(..., min_length=1, max_length=ACTIVE_LOG_BATCH_MAX)
+
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "events": [
+                    {"novel_shorts_no": 1, "active_type": 1, "acted_date": "2024-02-09T12:00:00"},
+                    {"novel_shorts_no": 1, "active_type": 2, "acted_date": "2024-02-09T12:00:30"},
+                ]
+            }
+        }
+
+
+class UserActiveItemResult(BaseModel):
+    index: int
+    accepted: bool
+    reason: Optional[str] = None
+
+
+class UserActiveBatchResponse(BaseModel):
+    success: bool
+    message: str
+    accepted: int
+    rejected: int
+    results: List[UserActiveItemResult]
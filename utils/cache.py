@@ -0,0 +1,288 @@
+from abc import ABC, abstractmethod
+import asyncio
+from collections import OrderedDict
+import json
+import os
+import time
+from typing import Any, Callable, Dict, Hashable, Iterable, List, Optional, Tuple
+
+
+"""
+캐시 백엔드
+- TTLCache: 프로세스 내 LRU + TTL 캐시
+- MemoryCacheBackend: TTLCache 기반, 워커 1개(또는 개발 환경)용
+- RedisCacheBackend: Redis에 값을 공유하고 워커별 로컬 캐시를 앞에 둠
+  삭제 시 pub/sub으로 다른 워커의 로컬 캐시도 무효화
+- CACHE_URL 환경변수가 redis:// 로 시작하면 Redis, 없으면 메모리 백엔드 사용
+"""
+
+CACHE_URL = os.getenv("CACHE_URL", "")
+CACHE_SIZE = int(os.getenv("CACHE_SIZE", "10000"))  # 워커별 로컬 캐시 최대 항목 수
+CACHE_LOCAL_TTL = float(os.getenv("CACHE_LOCAL_TTL", "5"))  # 초, 무효화 메시지를 놓쳐도 이 시간 안에 갱신됨
+CACHE_INVALIDATION_CHANNEL = os.getenv("CACHE_INVALIDATION_CHANNEL", "cache:invalidate")
+
+
+class TTLCache:
+    """크기 제한(LRU)과 만료 시간(TTL)이 있는 프로세스 내 캐시
+
+    이벤트 루프 한 곳에서만 접근하고 내부에 await가 없으므로 별도 락을 두지 않음
+    """
+
+    def __init__(self, maxsize: int, ttl: float, timer: Callable[[], float] = time.monotonic):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._timer = timer
+        self._data: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0  # 용량 초과로 밀려난 항목 수
+        self.expirations = 0  # TTL이 지나 버려진 항목 수
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        entry = self._data.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        expires_at, value = entry
+        if expires_at <= self._timer():
+            del self._data[key]
+            self.expirations += 1
+            self.misses += 1
+            return None
+
+        self._data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def get_many(self, keys: Iterable[Hashable]) -> Dict[Hashable, Any]:
+        """캐시에 있는 키만 모아서 반환 (없는 키는 결과에서 빠짐)"""
+        found = {}
+        for key in keys:
+            value = self.get(key)
+            if value is not None:
+                found[key] = value
+        return found
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        if self.maxsize <= 0:
+            return
+
+        ttl = self.ttl if ttl is None else min(ttl, self.ttl)
+        self._data[key] = (self._timer() + ttl, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+            self.evictions += 1
+
+    def invalidate(self, *keys: Hashable) -> None:
+        for key in keys:
+            self._data.pop(key, None)
+
+    def clear(self) -> None:
+        self._data.clear()
+
+    def stats(self) -> dict:
+        return {
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+        }
+
+
+class CacheBackend(ABC):
+    """novel/comment 쿼리 계층이 사용하는 캐시 인터페이스 (키는 문자열, 값은 JSON으로 표현 가능한 값)"""
+
+    async def start(self) -> None:
+        pass
+
+    async def close(self) -> None:
+        pass
+
+    @abstractmethod
+    async def get_many(self, keys: List[str]) -> Dict[str, Any]:
+        """캐시에 있는 키만 모아서 반환"""
+
+    @abstractmethod
+    async def set_many(self, items: Dict[str, Any], ttl: float) -> None:
+        pass
+
+    @abstractmethod
+    async def delete(self, *keys: str) -> None:
+        """모든 워커에서 키를 무효화"""
+
+    async def get(self, key: str) -> Optional[Any]:
+        return (await self.get_many([key])).get(key)
+
+    async def set(self, key: str, value: Any, ttl: float) -> None:
+        await self.set_many({key: value}, ttl)
+
+    @abstractmethod
+    def stats(self) -> dict:
+        pass
+
+
+class MemoryCacheBackend(CacheBackend):
+    """프로세스 내 캐시. 워커 간 무효화가 전달되지 않으므로 워커가 여러 개면 RedisCacheBackend 사용"""
+
+    def __init__(self, maxsize: int = CACHE_SIZE, ttl: float = float("inf")):
+        self.local = TTLCache(maxsize=maxsize, ttl=ttl)
+
+    async def get_many(self, keys: List[str]) -> Dict[str, Any]:
+        return self.local.get_many(keys)
+
+    async def set_many(self, items: Dict[str, Any], ttl: float) -> None:
+        for key, value in items.items():
+            self.local.set(key, value, ttl)
+
+    async def delete(self, *keys: str) -> None:
+        self.local.invalidate(*keys)
+
+    def clear(self) -> None:
+        self.local.clear()
+
+    def stats(self) -> dict:
+        return {"backend": "memory", **self.local.stats()}
+
+
+class RedisCacheBackend(CacheBackend):
+    """Redis 공유 캐시 + 워커별 로컬 캐시. 삭제는 pub/sub으로 모든 워커에 전파"""
+
+    def __init__(
+        self,
+        url: str,
+        local_size: int = CACHE_SIZE,
+        local_ttl: float = CACHE_LOCAL_TTL,
+        channel: str = CACHE_INVALIDATION_CHANNEL,
+        reconnect_delay: float = 1.0,
+    ):
+        # Redis를 쓰는 배포에서만 필요한 의존성이므로 사용할 때 import
+        from redis import asyncio as aioredis
+
+        self.client = aioredis.Redis.from_url(url, decode_responses=True)
+        self.local = TTLCache(maxsize=local_size, ttl=local_ttl)
+        self.channel = channel
+        self.reconnect_delay = reconnect_delay
+        self._listener: Optional[asyncio.Task] = None
+        self._subscribed = asyncio.Event()
+
+        self.remote_hits = 0
+        self.remote_misses = 0
+        self.invalidations_received = 0
+        self.errors = 0
+
+    async def start(self) -> None:
+        if self._listener is None:
+            self._listener = asyncio.create_task(self._listen())
+            await self._subscribed.wait()
+
+    async def close(self) -> None:
+        if self._listener is not None:
+            self._listener.cancel()
+            try:
+                await self._listener
+            except asyncio.CancelledError:
+                pass
+            self._listener = None
+        await self.client.aclose()
+
+    async def _listen(self) -> None:
+        """무효화 채널을 구독하고, 연결이 끊기면 로컬 캐시를 비운 뒤 다시 구독"""
+        while True:
+            pubsub = self.client.pubsub(ignore_subscribe_messages=True)
+            try:
+                await pubsub.subscribe(self.channel)
+                self._subscribed.set()
+                async for message in pubsub.listen():
+                    if message["type"] == "message":
+                        self.invalidations_received += 1
+                        self.local.invalidate(*json.loads(message["data"]))
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"Error in cache invalidation listener: {str(e)}")
+                self.errors += 1
+                # 끊긴 동안 놓친 무효화가 있을 수 있으므로 로컬 캐시 전체 삭제
+                self.local.clear()
+                self._subscribed.set()  # Redis가 없어도 start()가 멈추지 않도록 함
+                await asyncio.sleep(self.reconnect_delay)
+            finally:
+                await pubsub.aclose()
+
+    async def get_many(self, keys: List[str]) -> Dict[str, Any]:
+        found = self.local.get_many(keys)
+        missing = [key for key in keys if key not in found]
+        if not missing:
+            return found
+
+        try:
+            values = await self.client.mget(missing)
+        except Exception as e:
+            # Redis 장애 시 캐시 미스로 처리하고 DB 조회로 넘어감
+            print(f"Error in RedisCacheBackend.get_many: {str(e)}")
+            self.errors += 1
+            return found
+
+        for key, raw in zip(missing, values):
+            if raw is None:
+                self.remote_misses += 1
+                continue
+            self.remote_hits += 1
+            found[key] = json.loads(raw)
+            self.local.set(key, found[key])
+        return found
+
+    async def set_many(self, items: Dict[str, Any], ttl: float) -> None:
+        if not items:
+            return
+
+        try:
+            async with self.client.pipeline(transaction=False) as pipe:
+                for key, value in items.items():
+                    pipe.set(key, json.dumps(value, default=str), px=int(ttl * 1000))
+                await pipe.execute()
+        except Exception as e:
+            print(f"Error in RedisCacheBackend.set_many: {str(e)}")
+            self.errors += 1
+            return
+
+        for key, value in items.items():
+            self.local.set(key, value, ttl)
+
+    async def delete(self, *keys: str) -> None:
+        if not keys:
+            return
+
+        self.local.invalidate(*keys)
+        try:
+            await self.client.delete(*keys)
+            await self.client.publish(self.channel, json.dumps(list(keys)))
+        except Exception as e:
+            print(f"Error in RedisCacheBackend.delete: {str(e)}")
+            self.errors += 1
+
+    def stats(self) -> dict:
+        return {
+            "backend": "redis",
+            **self.local.stats(),
+            "remote_hits": self.remote_hits,
+            "remote_misses": self.remote_misses,
+            "invalidations_received": self.invalidations_received,
+            "errors": self.errors,
+        }
+
+
+def create_cache_backend(url: str = CACHE_URL) -> CacheBackend:
+    if url.startswith(("redis://", "rediss://", "unix://")):
+        return RedisCacheBackend(url)
+    return MemoryCacheBackend()
+
+
+cache = create_cache_backend()
@@ -0,0 +1,36 @@
+import os
+from typing import Dict, List, Tuple
+
+
+"""
+이미지 파생본 생성 (프로세스 풀 워커에서 실행)
+- 앱 모듈을 import 하지 않아 워커 프로세스 시작이 가볍고, Pillow는 실제 작업 시점에 로드
+- 원본을 한 번만 디코딩해 큰 크기부터 차례로 줄이며 WebP로 저장 (작은 크기는 바로 앞 결과에서 축소)
+"""
+
+
+def render_variants(source: str, outputs: List[Tuple[int, str]], quality: int) -> Dict[str, int]:
+    """source 이미지를 (최대 너비, 저장 경로)별 WebP로 저장하고 경로별 파일 크기 반환 (이미 있는 파일은 그대로 둠)"""
+    from PIL import Image, ImageOps
+
+    with Image.open(source) as image:
+        # JPEG는 디코딩 단계에서 1/2~1/8로 줄여 읽음 (EXIF 회전과 무관하게 결과보다 작아지지 않도록 정사각형 기준)
+        widest = max(width for width, _ in outputs)
+        image.draft("RGB", (widest, widest))
+        image = ImageOps.exif_transpose(image)
+        if image.mode not in ("RGB", "RGBA"):
+            has_alpha = "A" in image.getbands() or "transparency" in image.info
+            image = image.convert("RGBA" if has_alpha else "RGB")
+
+        sizes = {}
+        for width, destination in sorted(outputs, reverse=True):
+            if image.width > width:
+                height = max(1, round(image.height * width / image.width))
+                image = image.resize((width, height), Image.Resampling.LANCZOS, reducing_gap=3.0)
+            if not os.path.exists(destination):
+                os.makedirs(os.path.dirname(destination), exist_ok=True)
+                temp_path = f"{destination}.{os.getpid()}.tmp"
+                image.save(temp_path, "WEBP", quality=quality, method=4)
+                os.replace(temp_path, destination)
+            sizes[destination] = os.path.getsize(destination)
+        return sizes
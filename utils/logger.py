@@ -8,29 +8,41 @@ import traceback
 from typing import Callable
 
 
-# logs 디렉토리 생성
-os.makedirs("logs", exist_ok=True)
-
-# 로거 설정
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
-    handlers=[
-        RotatingFileHandler(
-            "logs/comment_api.log",
-            maxBytes=10 * 1024 * 1024,  # 10MB
-            backupCount=5,
-        ),
-        logging.StreamHandler(),
-    ],
-)
+LOG_DIR = "logs"
 
 logger = logging.getLogger("comment_api")
+_configured = False
+
+
+def configure_logging() -> None:
+    """처음 로그를 남길 때 한 번만 logs 디렉토리와 파일 핸들러를 만듦 (import 시 파일을 열지 않음)"""
+    global _configured
+    if _configured:
+        return
+
+    # logs 디렉토리 생성
+    os.makedirs(LOG_DIR, exist_ok=True)
+
+    # 로거 설정
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+        handlers=[
+            RotatingFileHandler(
+                f"{LOG_DIR}/comment_api.log",
+                maxBytes=10 * 1024 * 1024,  # 10MB
+                backupCount=5,
+            ),
+            logging.StreamHandler(),
+        ],
+    )
+    _configured = True
 
 
 def log_api_call(func: Callable) -> Callable:
     @wraps(func)
     async def wrapper(*args, **kwargs):
+        configure_logging()
         # 함수 이름과 시작 시간 기록
         start_time = datetime.now()
         func_name = func.__name__
@@ -66,6 +78,7 @@ def log_api_call(func: Callable) -> Callable:
 def log_query(func: Callable) -> Callable:
     @wraps(func)
     def wrapper(*args, **kwargs):
+        configure_logging()
         # 함수 이름과 시작 시간 기록
         start_time = datetime.now()
         func_name = func.__name__
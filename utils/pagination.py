@@ -0,0 +1,22 @@
+import base64
+import json
+from typing import Any, List
+
+
+def encode_cursor(*values: Any) -> str:
+    """키셋 페이지네이션 값을 클라이언트에 전달할 불투명 커서 문자열로 변환"""
+    raw = json.dumps(list(values), separators=(",", ":"), default=str)
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> List[Any]:
+    """encode_cursor로 만든 커서를 원래 값 목록으로 복원 (잘못된 커서는 ValueError)"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()).decode())
+    except Exception:
+        raise ValueError("올바르지 않은 커서입니다")
+
+    if not isinstance(values, list) or not values:
+        raise ValueError("올바르지 않은 커서입니다")
+    return values
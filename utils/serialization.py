@@ -0,0 +1,51 @@
+from functools import lru_cache
+import os
+from typing import Any, Optional
+
+from fastapi import Response
+from fastapi.responses import JSONResponse
+import orjson
+from pydantic import BaseModel, TypeAdapter
+
+
+"""
+목록 API용 빠른 JSON 직렬화
+- 쿼리 함수는 DB 행(이미 타입이 정해진 값)으로 model_construct 해 검증 없이 모델을 만들고
+- 엔드포인트는 ORJSONResponse를 직접 반환해 FastAPI response_model 재검증/직렬화를 건너뜀
+- RESPONSE_VALIDATION=1 (테스트/디버그)이면 만들어진 JSON을 응답 스키마로 다시 검증
+"""
+
+RESPONSE_VALIDATION = os.getenv("RESPONSE_VALIDATION", os.getenv("TESTING", "false")) in ("1", "true")
+
+
+def _default(obj: Any) -> Any:
+    # model_construct로 만든 모델은 필드 값을 그대로 꺼내 직렬화 (중첩 모델은 다시 여기로 옴)
+    if isinstance(obj, BaseModel):
+        return dict(obj)
+    raise TypeError
+
+
+def dumps(content: Any) -> bytes:
+    return orjson.dumps(content, default=_default, option=orjson.OPT_NON_STR_KEYS)
+
+
+@lru_cache(maxsize=None)
+def _adapter(response_type: Any) -> TypeAdapter:
+    return TypeAdapter(response_type)
+
+
+class ORJSONResponse(JSONResponse):
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+def fast_response(content: Any, response_type: Any, response: Optional[Response] = None) -> ORJSONResponse:
+    """content를 orjson으로 바로 직렬화한 응답 (response로 설정한 헤더/상태 코드 유지)"""
+    result = ORJSONResponse(
+        content,
+        status_code=(response.status_code or 200) if response else 200,
+        headers=response.headers if response else None,
+    )
+    if RESPONSE_VALIDATION:
+        _adapter(response_type).validate_json(result.body)
+    return result